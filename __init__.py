@@ -10,13 +10,13 @@ bl_info = {
     "category": "Import-Export",
 }
 
-import bpy
 import os
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
     from . import operators
     from . import panels
+    from . import profiling
     from . import import_utils
     from . import export_utils
 
@@ -24,17 +24,25 @@ classes = []
 
 
 def register():
+    """只注册操作和面板的外壳；解析器、写出器和 numpy 在第一次运行操作时才导入"""
+    import bpy
     from . import operators
     from . import panels
-    from . import import_utils
-    from . import export_utils
+    from . import profiling
+
+    for cls in profiling.classes:
+        bpy.utils.register_class(cls)
 
     for cls in operators.classes:
+        profiling.instrument(cls)
         bpy.utils.register_class(cls)
 
     for cls in panels.classes:
         bpy.utils.register_class(cls)
 
+    for name, handler in operators.handlers:
+        getattr(bpy.app.handlers, name).append(handler)
+
     bpy.types.Scene.lx_skc_path = bpy.props.StringProperty(
         name="SKC文件路径", default="", subtype="FILE_PATH"
     )
@@ -50,6 +58,36 @@ def register():
     bpy.types.Scene.lx_export_path = bpy.props.StringProperty(
         name="导出路径", default="", subtype="DIR_PATH"
     )
+    bpy.types.Scene.lx_export_checksum = bpy.props.BoolProperty(
+        name="生成校验文件",
+        default=False,
+        description="导出时同时生成 .sha256 校验文件",
+    )
+    bpy.types.Scene.lx_stream_path = bpy.props.StringProperty(
+        name="流式关卡", default="", subtype="FILE_PATH"
+    )
+    bpy.types.Scene.lx_stream_cell_size = bpy.props.FloatProperty(
+        name="单元大小", default=100.0, min=1.0, description="流式网格单元的边长"
+    )
+    bpy.types.Scene.lx_stream_radius = bpy.props.FloatProperty(
+        name="加载半径", default=200.0, min=0.0, description="加载此距离内的单元"
+    )
+    bpy.types.Scene.lx_stream_use_view = bpy.props.BoolProperty(
+        name="以视口为中心",
+        default=False,
+        description="以3D视口中心而不是3D游标为加载中心",
+    )
+    bpy.types.Scene.lx_catalog_root = bpy.props.StringProperty(
+        name="资源目录", default="", subtype="DIR_PATH"
+    )
+    bpy.types.Scene.lx_catalog_filter = bpy.props.StringProperty(
+        name="过滤",
+        default="",
+        description="例如: amb frames>300 或 gmb verts>=50000 path~scene",
+    )
+    bpy.types.Scene.lx_catalog_limit = bpy.props.IntProperty(
+        name="最多显示", default=50, min=1, max=1000
+    )
 
     bpy.ops.lx.import_skc
     bpy.ops.lx.import_gmc
@@ -61,8 +99,15 @@ def register():
 
 
 def unregister():
+    import bpy
     from . import operators
     from . import panels
+    from . import profiling
+
+    for name, handler in operators.handlers:
+        handler_list = getattr(bpy.app.handlers, name)
+        if handler in handler_list:
+            handler_list.remove(handler)
 
     for cls in reversed(panels.classes):
         if hasattr(cls, "is_registered"):
@@ -72,6 +117,10 @@ def unregister():
         if hasattr(cls, "is_registered"):
             bpy.utils.unregister_class(cls)
 
+    for cls in reversed(profiling.classes):
+        if hasattr(cls, "is_registered"):
+            bpy.utils.unregister_class(cls)
+
     if hasattr(bpy.types.Scene, "lx_skc_path"):
         del bpy.types.Scene.lx_skc_path
     if hasattr(bpy.types.Scene, "lx_bnc_path"):
@@ -82,3 +131,16 @@ def unregister():
         del bpy.types.Scene.lx_amb_path
     if hasattr(bpy.types.Scene, "lx_export_path"):
         del bpy.types.Scene.lx_export_path
+    if hasattr(bpy.types.Scene, "lx_export_checksum"):
+        del bpy.types.Scene.lx_export_checksum
+    for prop in (
+        "lx_stream_path",
+        "lx_stream_cell_size",
+        "lx_stream_radius",
+        "lx_stream_use_view",
+        "lx_catalog_root",
+        "lx_catalog_filter",
+        "lx_catalog_limit",
+    ):
+        if hasattr(bpy.types.Scene, prop):
+            delattr(bpy.types.Scene, prop)
@@ -0,0 +1,66 @@
+"""GMBWriter 并行编码基准测试
+
+不依赖Blender，用随机网格模拟多对象导出，比较1/4/16个编码线程的耗时:
+
+    python benchmarks/bench_gmb_writer.py --objects 200 --verts 20000
+"""
+
+import argparse
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+export_utils = importlib.import_module(os.path.basename(ROOT) + ".export_utils")
+
+
+class BenchObject:
+    def __init__(self, name, vert_num, rng):
+        self.name = name
+        self.verts = rng.random((vert_num, 3), dtype=np.float32) * 1000.0
+        self.faces = rng.integers(0, vert_num, size=(vert_num * 2, 3), dtype=np.uint32)
+
+
+def run(objects, workers, repeat):
+    path = os.path.join(tempfile.gettempdir(), "lx_bench_gmb_writer.gmb")
+    best = None
+    for _ in range(repeat):
+        writer = export_utils.GMBWriter(path, workers=workers)
+        start = time.perf_counter()
+        writer.write(objects, [{"tex_id": 0}], ["NONE"])
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    size = os.path.getsize(path)
+    os.remove(path)
+    return best, size
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=200)
+    parser.add_argument("--verts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 16])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    objects = [BenchObject(f"obj_{i}", args.verts, rng) for i in range(args.objects)]
+
+    print(f"对象数 {args.objects}, 每对象顶点数 {args.verts}, CPU核心 {os.cpu_count()}")
+    baseline = None
+    for workers in args.workers:
+        elapsed, size = run(objects, workers, args.repeat)
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:>2}  {elapsed:8.3f}s  {size / elapsed / 1e6:8.1f} MB/s  加速 {baseline / elapsed:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""插件注册耗时基准测试（Blender后台模式）
+
+分别启动不加载插件和注册插件的Blender后台进程，比较进程总耗时，并在进程内
+测量导入包和 register() 的耗时以及注册期间新加载的模块:
+
+    python benchmarks/bench_startup.py --blender /path/to/blender --repeat 5
+
+也可以直接在Blender中运行，只输出一次进程内测量结果:
+
+    blender --background --factory-startup --python benchmarks/bench_startup.py
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+# 进程内测量结果所在行的前缀
+MARKER = "LX_STARTUP "
+
+# 注册时不应加载的较重模块
+HEAVY_MODULES = ("numpy", "sqlite3", "cProfile", "pstats", "tracemalloc", "mathutils")
+
+
+def measure():
+    """在Blender进程内导入并注册插件，返回耗时和新加载的模块"""
+    sys.path.insert(0, os.path.dirname(ROOT))
+    before = set(sys.modules)
+
+    start = time.perf_counter()
+    addon = importlib.import_module(PACKAGE)
+    imported = time.perf_counter()
+    addon.register()
+    registered = time.perf_counter()
+    addon.unregister()
+
+    loaded = sorted(set(sys.modules) - before)
+    return {
+        "import": imported - start,
+        "register": registered - imported,
+        "modules": len(loaded),
+        "heavy": sorted({m.split(".")[0] for m in loaded} & set(HEAVY_MODULES)),
+    }
+
+
+def run_blender(blender, args):
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [blender, "--background", "--factory-startup", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    elapsed = time.perf_counter() - start
+    if proc.returncode != 0:
+        raise RuntimeError(f"Blender退出码 {proc.returncode}:\n{proc.stdout}")
+    result = None
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARKER):
+            result = json.loads(line[len(MARKER) :])
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--blender", default="blender", help="Blender可执行文件")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = []
+    total = []
+    inner = []
+    for _ in range(args.repeat):
+        baseline.append(run_blender(args.blender, ["--python-expr", "pass"])[0])
+        elapsed, result = run_blender(
+            args.blender, ["--python-exit-code", "1", "--python", __file__]
+        )
+        if result is None:
+            raise RuntimeError("Blender输出中没有测量结果")
+        total.append(elapsed)
+        inner.append(result)
+
+    base = statistics.median(baseline)
+    with_addon = statistics.median(total)
+    print(f"Blender {args.blender}, 重复 {args.repeat} 次（取中位数）")
+    print(f"不加载插件   {base:8.3f}s")
+    print(f"注册插件     {with_addon:8.3f}s  (+{(with_addon - base) * 1000:.1f}ms)")
+    print(f"导入包       {statistics.median(r['import'] for r in inner) * 1000:8.1f}ms")
+    print(
+        f"register()   {statistics.median(r['register'] for r in inner) * 1000:8.1f}ms"
+    )
+    print(f"新加载模块   {inner[-1]['modules']} 个")
+    heavy = inner[-1]["heavy"]
+    print(f"较重模块     {', '.join(heavy) if heavy else '无'}")
+    return 1 if heavy else 0
+
+
+if __name__ == "__main__":
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        sys.exit(main())
+    print(MARKER + json.dumps(measure()))
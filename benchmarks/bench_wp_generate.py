@@ -0,0 +1,209 @@
+"""路径点自动生成基准测试（Blender后台模式）
+
+在合成的大型关卡（起伏地面加上多层悬空平台）上按自动生成路径点的流程分段计时:
+BVH构造（verts.tolist()/tris.tolist() 和 BVHTree.FromPolygons）、可行走表面采样和体素聚类:
+
+    python benchmarks/bench_wp_generate.py --blender /path/to/blender --size 250 500 1000
+
+也可以直接在Blender中运行，参数写在 -- 之后:
+
+    blender --background --factory-startup --python benchmarks/bench_wp_generate.py -- --size 500
+"""
+
+import argparse
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.basename(ROOT)
+
+# 进程内测量结果所在行的前缀
+MARKER = "LX_WP_GENERATE "
+
+# 地面网格的格子边长，与自动生成操作的默认采样间距相同
+CELL = 50.0
+# 平台之间的层高
+FLOOR_HEIGHT = 400.0
+
+
+def grid_mesh(size: int, origin, z):
+    """size x size 格的网格，z(x, y) 给出各顶点高度，返回 (顶点 (n, 3), 三角形 (m, 3))"""
+    import numpy as np
+
+    coords = np.arange(size + 1) * CELL
+    gx, gy = np.meshgrid(coords + origin[0], coords + origin[1], indexing="ij")
+    verts = np.column_stack([gx.ravel(), gy.ravel(), z(gx, gy).ravel()])
+
+    ids = np.arange((size + 1) ** 2, dtype=np.int32).reshape(size + 1, size + 1)
+    a, b = ids[:-1, :-1].ravel(), ids[1:, :-1].ravel()
+    c, d = ids[1:, 1:].ravel(), ids[:-1, 1:].ravel()
+    tris = np.concatenate([np.column_stack([a, b, c]), np.column_stack([a, c, d])])
+    return verts.astype(np.float32), tris
+
+
+def make_level(size: int, floors: int, seed: int = 0):
+    """合成关卡: size x size 格的起伏地面，上方叠 floors 层覆盖中间四分之一面积的平台"""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    noise = rng.normal(0.0, 3.0, (size + 1, size + 1))
+    parts = [
+        grid_mesh(
+            size,
+            (0.0, 0.0),
+            lambda x, y: 80.0 * np.sin(x / 900.0) * np.cos(y / 700.0) + noise,
+        )
+    ]
+    half = max(1, size // 2)
+    for floor in range(1, floors + 1):
+        height = floor * FLOOR_HEIGHT
+        parts.append(
+            grid_mesh(
+                half,
+                (size * CELL / 4, size * CELL / 4),
+                lambda x, y: np.full_like(x, height),
+            )
+        )
+
+    vert_chunks = []
+    tri_chunks = []
+    offset = 0
+    for verts, tris in parts:
+        vert_chunks.append(verts)
+        tri_chunks.append(tris + offset)
+        offset += len(verts)
+    return np.concatenate(vert_chunks), np.concatenate(tri_chunks)
+
+
+def measure(args):
+    """在Blender进程内对每种关卡规模分段计时，每段取 repeat 次的中位数"""
+    from mathutils.bvhtree import BVHTree
+
+    sys.path.insert(0, os.path.dirname(ROOT))
+    waypoints = importlib.import_module(PACKAGE + ".export_utils.waypoints")
+
+    results = []
+    for size in args.size:
+        verts, tris = make_level(size, args.floors)
+        bounds = (verts.min(axis=0), verts.max(axis=0))
+        timings = {"tolist": [], "bvh": [], "sample": [], "cluster": []}
+        for _ in range(args.repeat):
+            # 与 operators._level_bvh 相同的构造方式，拆开计时
+            start = time.perf_counter()
+            vert_list = verts.tolist()
+            tri_list = tris.tolist()
+            listed = time.perf_counter()
+            bvh = BVHTree.FromPolygons(vert_list, tri_list, all_triangles=True)
+            built = time.perf_counter()
+            samples = waypoints.sample_walkable(
+                bvh,
+                bounds,
+                args.spacing,
+                args.max_slope,
+                args.clearance,
+                args.floors + 1,
+                args.workers,
+            )
+            sampled = time.perf_counter()
+            points = waypoints.cluster_points(samples, args.cluster_size, 100.0)
+            clustered = time.perf_counter()
+
+            timings["tolist"].append(listed - start)
+            timings["bvh"].append(built - listed)
+            timings["sample"].append(sampled - built)
+            timings["cluster"].append(clustered - sampled)
+            del vert_list, tri_list, bvh
+
+        result = {name: statistics.median(values) for name, values in timings.items()}
+        result.update(
+            size=size,
+            verts=len(verts),
+            tris=len(tris),
+            samples=len(samples),
+            points=len(points),
+        )
+        results.append(result)
+    return results
+
+
+def run_blender(blender, args):
+    proc = subprocess.run(
+        [
+            blender,
+            "--background",
+            "--factory-startup",
+            "--python-exit-code",
+            "1",
+            "--python",
+            __file__,
+            "--",
+            *args,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        errors="replace",
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"Blender退出码 {proc.returncode}:\n{proc.stdout}")
+    for line in proc.stdout.splitlines():
+        if line.startswith(MARKER):
+            return json.loads(line[len(MARKER) :])
+    raise RuntimeError(f"Blender输出中没有测量结果:\n{proc.stdout}")
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--blender", default="blender", help="Blender可执行文件")
+    parser.add_argument(
+        "--size", type=int, nargs="+", default=[250, 500, 1000], help="地面每边的格数"
+    )
+    parser.add_argument("--floors", type=int, default=2, help="悬空平台的层数")
+    parser.add_argument("--spacing", type=float, default=CELL, help="采样间距")
+    parser.add_argument("--max-slope", type=float, default=0.698132)
+    parser.add_argument("--clearance", type=float, default=80.0)
+    parser.add_argument("--cluster-size", type=float, default=200.0)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    return parser.parse_args(argv)
+
+
+def main():
+    args = parse_args(sys.argv[1:])
+    forwarded = sys.argv[1:]
+    if "--blender" in forwarded:
+        index = forwarded.index("--blender")
+        del forwarded[index : index + 2]
+    results = run_blender(args.blender, forwarded)
+
+    print(
+        f"Blender {args.blender}, 平台 {args.floors} 层, 采样间距 {args.spacing}, "
+        f"线程数 {args.workers or os.cpu_count()}, 重复 {args.repeat} 次（取中位数）"
+    )
+    print(
+        f"{'格数':>6} {'三角形':>9} {'tolist':>8} {'FromPolygons':>13} "
+        f"{'采样':>8} {'聚类':>8} {'采样点':>9} {'路径点':>7}"
+    )
+    for r in results:
+        print(
+            f"{r['size']:>8} {r['tris']:>12} {r['tolist']:>7.2f}s {r['bvh']:>12.2f}s "
+            f"{r['sample']:>9.2f}s {r['cluster']:>9.2f}s {r['samples']:>11} {r['points']:>10}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        import bpy  # noqa: F401
+    except ImportError:
+        sys.exit(main())
+    argv = sys.argv[sys.argv.index("--") + 1 :] if "--" in sys.argv else []
+    print(MARKER + json.dumps(measure(parse_args(argv))))
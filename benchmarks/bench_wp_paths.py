@@ -0,0 +1,118 @@
+"""路径点寻路表基准测试
+
+不依赖Blender，在随机分布的路径点上按最大距离连线（平均每点约 --degree 条连线），
+比较Floyd-Warshall和逐点Dijkstra生成下一跳表的耗时，并抽样核对路径长度:
+
+    python benchmarks/bench_wp_paths.py --nodes 1000 2000 5000 10000 --workers 8
+"""
+
+import argparse
+import heapq
+import importlib
+import math
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+waypoints = importlib.import_module(os.path.basename(ROOT) + ".export_utils.waypoints")
+
+# 相邻路径点的平均间距
+SPACING = 100.0
+
+
+def make_graph(node_num, degree, rng):
+    side = math.sqrt(node_num) * SPACING
+    positions = rng.random((node_num, 3)) * (side, side, 0.0)
+    radius = SPACING * math.sqrt(degree / math.pi)
+    pairs, dists = waypoints.candidate_links(positions, radius)
+    return positions, pairs, dists
+
+
+def shortest_distances(indptr, indices, weights, source):
+    dist = np.full(len(indptr) - 1, np.inf)
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, u = heapq.heappop(heap)
+        if d > dist[u]:
+            continue
+        for k in range(indptr[u], indptr[u + 1]):
+            nd = d + weights[k]
+            if nd < dist[indices[k]]:
+                dist[indices[k]] = nd
+                heapq.heappush(heap, (nd, indices[k]))
+    return dist
+
+
+def verify(table, graph, samples, rng):
+    """抽样核对按下一跳表走出的路径长度等于最短距离，返回不一致的数量"""
+    indptr, indices, weights = graph
+    indptr, indices, weights = indptr.tolist(), indices.tolist(), weights.tolist()
+    node_num = len(table)
+    lookup = {}
+    for u in range(node_num):
+        for k in range(indptr[u], indptr[u + 1]):
+            lookup[u, indices[k]] = weights[k]
+
+    errors = 0
+    for source in rng.integers(0, node_num, size=samples).tolist():
+        dist = shortest_distances(indptr, indices, weights, source)
+        for target in rng.integers(0, node_num, size=20).tolist():
+            path = waypoints.follow_path(table, indptr, indices, source, target)
+            if not path:
+                errors += not math.isinf(dist[target])
+                continue
+            length = sum(lookup[u, v] for u, v in zip(path, path[1:]))
+            errors += abs(length - dist[target]) > 1e-6 * max(1.0, dist[target])
+    return errors
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1000, 2000, 5000])
+    parser.add_argument("--degree", type=float, default=8.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--floyd-limit", type=int, default=1000)
+    parser.add_argument("--samples", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    path = os.path.join(tempfile.gettempdir(), "lx_bench_wp_paths.wpn")
+    print(f"平均连线数 {args.degree}, 进程数 {args.workers}, CPU核心 {os.cpu_count()}")
+    for node_num in args.nodes:
+        positions, pairs, dists = make_graph(node_num, args.degree, rng)
+        graph = waypoints.link_graph(node_num, pairs, dists)
+        methods = [("DIJKSTRA", 1)]
+        if args.workers > 1:
+            methods.append(("DIJKSTRA", args.workers))
+        if node_num <= args.floyd_limit:
+            methods.insert(0, ("FLOYD", 1))
+
+        for method, workers in methods:
+            start = time.perf_counter()
+            table = waypoints.next_hop_table(
+                node_num, pairs, dists, method=method, workers=workers
+            )
+            elapsed = time.perf_counter() - start
+            errors = verify(table, graph, args.samples, rng)
+            print(
+                f"nodes={node_num:>6} links={len(pairs):>7}  {method:<8} x{workers:<2} "
+                f"{elapsed:8.2f}s  {node_num / elapsed:8.0f} 行/s  错误 {errors}"
+            )
+
+        writer = waypoints.NextHopWriter(path)
+        writer.write(table)
+        print(f"{'':>30}.wpn {writer.bytes_written / 1048576:.1f} MB")
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
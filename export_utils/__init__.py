@@ -1,58 +1,259 @@
 import math
 import struct
 import os
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Dict, Tuple
 
-
-class FMCWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-
-    def write(self, objects: List, frame_count: int, fps: float = 60):
-        with open(self.filepath, "w", encoding="utf-8") as f:
+import numpy as np
+
+from .. import math_utils
+from ..formats import GMB_FACE_DTYPE, GMB_VERTEX_DTYPE
+from .base import LXWriter
+from .cache import GMBExportCache
+from .cob import COBWriter, build_aabb_tree
+from .skin import BNCWriter, SKCWriter, prune_skin_weights
+from . import mesh_opt
+
+
+class FMCWriter(LXWriter):
+    def write(
+        self, objects: List, frame_count: int, fps: float = 60, frame_start: int = 0
+    ):
+        """逐帧采样对象的基础变换 (matrix_basis)，与旋转模式无关"""
+        import bpy
+
+        scene = bpy.context.scene
+        current = scene.frame_current
+        basis = np.empty((frame_count, len(objects), 4, 4), dtype=np.float64)
+        for frame in range(frame_count):
+            scene.frame_set(frame_start + frame)
+            basis[frame] = [obj.matrix_basis for obj in objects]
+        scene.frame_set(current)
+
+        # 去掉缩放后再转换为四元数
+        rot = basis[..., :3, :3]
+        rot = rot / np.maximum(np.linalg.norm(rot, axis=-2, keepdims=True), 1e-12)
+        samples = np.concatenate(
+            [basis[..., :3, 3], math_utils.matrix_to_quat(rot)], axis=-1
+        )
+        self.write_samples(samples, fps)
+
+    def write_samples(self, samples, fps: float = 60):
+        """写出 (帧数, 对象数, 7) 数组: 位置 x y z + 四元数 w x y z"""
+        samples = np.asarray(samples, dtype=np.float64)
+        frame_count, object_num = samples.shape[:2]
+        # 每帧一个格式串，一次格式化整帧
+        block = (
+            "frame %d\n{\n"
+            + "  t %.4f %.4f %.4f q %.4f %.4f %.4f %.4f\n" * object_num
+            + "}\n"
+        )
+        rows = samples.reshape(frame_count, -1).tolist()
+
+        with self._open("w") as f:
             f.write("# GModel Animation File V1.0\n")
             f.write("# Model For Lxres.com Creation Time\n")
-            f.write(f"SceneObjects {len(objects)} DummeyObjects 0\n")
+            f.write(f"SceneObjects {object_num} DummeyObjects 0\n")
             f.write(f"FPS {fps} Frames {frame_count} Mode: RIGID\n")
+            f.write("".join(block % (frame, *row) for frame, row in enumerate(rows)))
 
-            pass
-
-            for frame in range(frame_count):
-                bpy.context.scene.frame_set(frame)
-                f.write(f"frame {frame}\n{{\n")
-
-                for obj in objects:
-                    pos = obj.location
-                    rot = obj.rotation_quaternion
-
-                    if len(rot) < 4:
-                        rot = [1.0, 0.0, 0.0, 0.0]
-
-                    f.write(
-                        f"  t {pos.x:.4f} {pos.y:.4f} {pos.z:.4f} q {rot[0]:.4f} {rot[1]:.4f} {rot[2]:.4f} {rot[3]:.4f}\n"
-                    )
-
-                f.write("}\n")
-
-
-class POSWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
 
+class POSWriter(LXWriter):
     def write(self, frame_count: int):
-        with open(self.filepath, "w", encoding="utf-8") as f:
+        with self._open("w") as f:
             f.write("pose\n{\n")
             f.write(f"  start 0\n")
             f.write(f"  end {frame_count - 1}\n")
             f.write("}\n")
 
 
-class GMBWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
+def _modifier_state(obj) -> bytes:
+    """把对象修改器的类型和可编辑属性序列化，用于缓存键"""
+    state = []
+    for mod in getattr(obj, "modifiers", []):
+        props = []
+        for prop in mod.bl_rna.properties:
+            if prop.is_readonly or prop.identifier == "rna_type":
+                continue
+            value = getattr(mod, prop.identifier, None)
+            if hasattr(value, "name"):
+                value = value.name
+            elif hasattr(value, "__len__") and not isinstance(value, str):
+                value = tuple(value)
+            props.append((prop.identifier, value))
+        state.append((mod.type, props))
+    return repr(state).encode("utf-8")
+
+
+def extract_gmb_object(obj):
+    """提取对象的名称、顶点数组(n,3)和三角面数组(m,3)
+
+    obj 可以是 LXObject 这类带 verts/faces 的数据对象，也可以是Blender网格对象。
+    """
+    if hasattr(obj, "verts"):
+        verts = np.asarray(obj.verts, dtype=np.float32).reshape(-1, 3)
+        faces = obj.faces
+        if isinstance(faces, np.ndarray):
+            faces = faces[:, :3] if faces.ndim == 2 else faces
+        else:
+            faces = [face[:3] for face in faces if len(face) >= 3]
+        faces = np.asarray(faces, dtype=np.uint32).reshape(-1, 3)
+        return obj.name if hasattr(obj, "name") else obj.skin_name, verts, faces
+
+    mesh = obj.data
+    verts = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", verts)
+    mesh.calc_loop_triangles()
+    faces = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("vertices", faces)
+    return obj.name, verts.reshape(-1, 3), faces.astype(np.uint32).reshape(-1, 3)
+
+
+def gmb_object_digest(name: str, verts, faces, modifier_state: bytes = b"") -> bytes:
+    """网格数据和修改器状态的快速摘要"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(name.encode("utf-8"))
+    h.update(struct.pack("<2I", len(verts), len(faces)))
+    h.update(np.ascontiguousarray(verts).tobytes())
+    h.update(np.ascontiguousarray(faces).tobytes())
+    h.update(modifier_state)
+    return h.digest()
+
+
+def encode_gmb_object(name: str, verts, faces) -> bytes:
+    """把单个对象编码为GMB对象字节块"""
+    name_bytes = name.encode("utf-8")
+
+    vdata = np.zeros(len(verts), dtype=GMB_VERTEX_DTYPE)
+    vdata["pos"] = verts
+    vdata["color"] = 0xFFFFFFFF
+
+    fdata = np.zeros(len(faces), dtype=GMB_FACE_DTYPE)
+    fdata["idx"] = faces
+    fdata["normal"] = (0, 0, 1)
+
+    return b"".join(
+        [
+            struct.pack("<I", len(name_bytes)),
+            name_bytes,
+            struct.pack("<2I", len(verts), len(faces)),
+            vdata.tobytes(),
+            fdata.tobytes(),
+        ]
+    )
+
+
+class GMBWriter(LXWriter):
+    def __init__(
+        self,
+        filepath: str,
+        cache: "GMBExportCache" = None,
+        workers: int = 1,
+        checksum: bool = False,
+        optimize: bool = False,
+        change_signal=None,
+    ):
+        super().__init__(filepath, checksum)
+        self.cache = cache
+        # change_signal(obj) 返回对象几何的廉价变化信号（或None表示未知），
+        # 与修改器状态一起作为缓存的第一级键；信号未变的对象不再提取和哈希
+        self.change_signal = change_signal
+        self.workers = max(1, workers)
+        self.optimize = optimize
+        self.reused = 0
+        self.encoded = 0
+        # 本次重新编码对象的三角形数加权ACMR (优化前, 优化后)
+        self.acmr = None
+
+    def _encode_task(self, task):
+        """工作线程: 计算摘要并查询缓存，未命中时编码对象
+
+        只处理已提取的numpy数组，不访问bpy。
+        """
+        name, verts, faces, modifier_state, _, hit = task
+        if hit is not None:
+            return hit[0], hit[1], hit[2], None, None
+        digest = None
+        if self.cache is not None:
+            if self.optimize:
+                modifier_state += b"vcache"
+            digest = gmb_object_digest(name, verts, faces, modifier_state)
+            hit = self.cache.lookup(name, digest)
+            if hit is not None:
+                return hit[0], hit[1], hit[2], digest, None
+        stats = (0.0, 0.0)
+        if self.optimize and len(faces):
+            verts, faces, _, before, after = mesh_opt.optimize_mesh(verts, faces)
+            stats = (before, after)
+        blob = encode_gmb_object(name, verts, faces)
+        return blob, len(verts), len(faces), digest, stats
 
     def write(self, objects: List, materials: List, textures: List):
-        with open(self.filepath, "wb") as f:
+        with self._open("wb") as f:
+            # 第一步: 在主线程提取数组（只有主线程可以访问bpy）
+            # 变化信号与上次校验时一致的对象直接复用缓存，不读取网格数据
+            tasks = []
+            for obj in objects:
+                modifier_state = b""
+                signal = None
+                if self.cache is not None:
+                    modifier_state = _modifier_state(obj)
+                    if self.change_signal is not None and not hasattr(obj, "verts"):
+                        signal = self.change_signal(obj)
+                    if signal is not None:
+                        signal = (signal, modifier_state, self.optimize)
+                        hit = self.cache.lookup_signal(obj.name, signal)
+                        if hit is not None:
+                            tasks.append((obj.name, None, None, b"", signal, hit))
+                            continue
+                name, verts, faces = extract_gmb_object(obj)
+                tasks.append((name, verts, faces, modifier_state, signal, None))
+
+            # 第二步: 并行编码各对象字节块，结果保持原有顺序
+            if self.workers > 1 and len(tasks) > 1:
+                with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                    results = list(pool.map(self._encode_task, tasks))
+            else:
+                results = [self._encode_task(task) for task in tasks]
+
+            blobs = []
+            total_verts = 0
+            total_faces = 0
+            self.reused = 0
+            self.encoded = 0
+            acmr_before = 0.0
+            acmr_after = 0.0
+            acmr_faces = 0
+            for task, (blob, vert_num, face_num, digest, stats) in zip(tasks, results):
+                if stats is None:
+                    self.reused += 1
+                else:
+                    self.encoded += 1
+                    acmr_before += stats[0] * face_num
+                    acmr_after += stats[1] * face_num
+                    acmr_faces += face_num
+                    if self.cache is not None:
+                        self.cache.store(task[0], digest, blob, vert_num, face_num)
+                if task[4] is not None:
+                    self.cache.remember_signal(task[0], task[4])
+                blobs.append(blob)
+                total_verts += vert_num
+                total_faces += face_num
+
+            if self.cache is not None:
+                self.cache.retain(task[0] for task in tasks)
+
+            print(
+                f"[LX] GMB导出: 复用 {self.reused} 个对象, 重新编码 {self.encoded} 个对象, 线程数 {self.workers}"
+            )
+            if self.optimize and acmr_faces:
+                self.acmr = (acmr_before / acmr_faces, acmr_after / acmr_faces)
+                print(
+                    f"[LX] 顶点缓存优化: ACMR {self.acmr[0]:.3f} -> {self.acmr[1]:.3f}"
+                )
+
+            # 第三步: 按顺序写出到缓冲区
             header = b"GMDL V1.00"
             f.write(header)
 
@@ -76,51 +277,16 @@ class GMBWriter:
 
             f.write(struct.pack("<I", len(objects)))
             f.write(struct.pack("<I", 0))
-
-            total_verts = sum(
-                len(obj.verts) if hasattr(obj, "verts") else len(obj.data.vertices)
-                for obj in objects
-            )
-            total_faces = sum(
-                len(obj.faces) if hasattr(obj, "faces") else len(obj.data.polygons)
-                for obj in objects
-            )
             f.write(struct.pack("<I", total_verts))
             f.write(struct.pack("<I", total_faces))
 
-            for obj in objects:
-                name = obj.name.encode("utf-8")
-                f.write(struct.pack("<I", len(name)))
-                f.write(name)
-
-                if hasattr(obj, "verts"):
-                    verts = obj.verts
-                    faces = obj.faces
-                else:
-                    mesh = obj.data
-                    verts = [v.co for v in mesh.vertices]
-                    faces = [p.vertices for p in mesh.polygons]
-
-                f.write(struct.pack("<I", len(verts)))
-                f.write(struct.pack("<I", len(faces)))
+            for blob in blobs:
+                f.write(blob)
 
-                for v in verts:
-                    f.write(struct.pack("<6f", v[0], v[1], v[2], 0, 0, 0))
-                    f.write(b"\xff\xff\xff\xff")
-                    f.write(struct.pack("<2f", 0, 0))
-
-                for face in faces:
-                    if len(face) >= 3:
-                        f.write(struct.pack("<4I", 0, face[0], face[1], face[2]))
-                        f.write(struct.pack("<3f", 0, 0, 1))
-
-
-class DESWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
 
+class DESWriter(LXWriter):
     def write(self, objects: List):
-        with open(self.filepath, "w", encoding="utf-8") as f:
+        with self._open("w") as f:
             f.write("# GModel Geometry File V1.0\n")
             f.write("# Model For Lxres.com Creation Time\n")
             f.write(f"SceneObjects {len(objects)} DummeyObjects 0\n")
@@ -142,12 +308,9 @@ class DESWriter:
                 f.write("}\n")
 
 
-class WPWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
-
+class WPWriter(LXWriter):
     def write(self, waypoints: List):
-        with open(self.filepath, "w", encoding="utf-8") as f:
+        with self._open("w") as f:
             f.write(f"WayPoints {len(waypoints)}\n")
 
             for wp in waypoints:
@@ -160,61 +323,65 @@ class WPWriter:
                     f.write(f"{link['index']} {link['flag']} {link['dist']:.3f}\n")
 
 
-class AMBWriter:
-    def __init__(self, filepath: str):
-        self.filepath = filepath
+def pose_to_amb(skin_matrices, has_bone, rest_local, parents):
+    """把逐帧蒙皮矩阵转换为AMB数据
+
+    skin_matrices: (帧数, 节点数, 4, 4) 节点对应骨骼的 pose @ inv(rest) 矩阵
+    has_bone: (节点数,) 节点是否有对应的Blender骨骼，没有的节点保持静止姿态
+    rest_local: (节点数, 4, 4) BNC静止姿态的局部矩阵
+    parents: (节点数,) BNC父节点索引
+    返回 (rotations (帧数, 节点数, 4), root_positions (帧数, 3))
+    """
+    parents = np.asarray(parents, dtype=np.int64)
+    has_bone = np.asarray(has_bone, dtype=bool)
+    rest_world = math_utils.accumulate_world(rest_local, parents)
+
+    frame_num = len(skin_matrices)
+    world = np.empty((frame_num,) + rest_local.shape, dtype=np.float64)
+    world[:, has_bone] = skin_matrices[:, has_bone] @ rest_world[has_bone]
+
+    # 没有对应骨骼的节点跟随父节点，按层级顺序补齐
+    for level in math_utils.hierarchy_levels(parents):
+        missing = level[~has_bone[level]]
+        roots = missing[parents[missing] < 0]
+        children = missing[parents[missing] >= 0]
+        world[:, roots] = rest_local[roots]
+        world[:, children] = world[:, parents[children]] @ rest_local[children]
+
+    local = math_utils.world_to_local(world, parents)
+    rotations = math_utils.quat_make_continuous(
+        math_utils.matrix_to_quat(local), axis=0
+    )
+    root_positions = local[:, 0, :3, 3]
+    return rotations, root_positions
+
+
+class AMBWriter(LXWriter):
+    """AMB动作写入器
+
+    文件结构与 AMBReader 一致: "BANIM" + 骨骼数 + 虚拟体数 + 帧数(各4字节)，
+    之后每帧依次为根节点位置(3f)和全部节点的旋转四元数(4f, w x y z)。
+    """
+
+    # 每次写入的帧数
+    FRAME_BLOCK = 1024
+
+    def write(self, rotations, root_positions, bones: int, dummies: int):
+        rotations = np.asarray(rotations, dtype=np.float32)
+        root_positions = np.asarray(root_positions, dtype=np.float32)
+        frame_num, node_num = rotations.shape[:2]
+        if node_num != bones + dummies:
+            raise ValueError(
+                f"节点数 {node_num} 与骨骼数 {bones} + 虚拟体数 {dummies} 不一致"
+            )
 
-    def write(self, animations: List, bones: int = 30, dummies: int = 6):
-        with open(self.filepath, "wb") as f:
-            header = b"BANIM"
-            f.write(header)
-            f.write(struct.pack("<I", bones))
-            f.write(struct.pack("<I", dummies))
-            f.write(struct.pack("<I", len(animations)))
-            f.write(struct.pack("<I", 30))
-
-            dummy_names = [
-                b"\x00",
-                b"b13\x00\x00",
-                b"d3\x00\x00\x00",
-                b"b17\x00\x00",
-                b"d5\x00\x00\x00",
-                b"b25\x00\x00",
-            ]
-
-            for i, frame in enumerate(animations):
-                f.write(struct.pack("<I", -1))
-                f.write(struct.pack("<I", i))
-
-                for j in range(bones + dummies):
-                    if j < len(frame):
-                        anim = frame[j]
-                        if j == 0 and "pos" in anim:
-                            f.write(
-                                struct.pack(
-                                    "<3f",
-                                    anim["pos"][0],
-                                    anim["pos"][1],
-                                    anim["pos"][2],
-                                )
-                            )
-                        f.write(
-                            struct.pack(
-                                "<4f",
-                                anim["rot"][0],
-                                anim["rot"][1],
-                                anim["rot"][2],
-                                anim["rot"][3],
-                            )
-                        )
-
-                        if j >= bones and j < bones + dummies:
-                            name = (
-                                dummy_names[j - bones]
-                                if j - bones < len(dummy_names)
-                                else b"\x00"
-                            )
-                            f.write(name)
-                            f.write(struct.pack("<7f", 0, 0, 0, 1, 0, 0, 0))
-                    else:
-                        f.write(struct.pack("<7f", 0, 0, 0, 1, 0, 0, 0))
+        # 每帧一条记录: 根节点位置 + 全部节点旋转
+        records = np.empty((frame_num, 3 + node_num * 4), dtype="<f4")
+        records[:, :3] = root_positions
+        records[:, 3:] = rotations.reshape(frame_num, -1)
+
+        with self._open("wb") as f:
+            f.write(b"BANIM")
+            f.write(struct.pack("<3I", bones, dummies, frame_num))
+            for start in range(0, frame_num, self.FRAME_BLOCK):
+                f.write(records[start : start + self.FRAME_BLOCK].tobytes())
@@ -0,0 +1,90 @@
+import hashlib
+import io
+import os
+import stat
+import time
+from contextlib import contextmanager
+
+
+class LXWriter:
+    """导出器基类: 缓冲写入 + 原子替换
+
+    write() 中通过 self._open() 得到一个内存缓冲区，所有内容先写入缓冲区，
+    结束后一次性写到同目录的临时文件，fsync 后再用 os.replace 原子替换目标文件。
+    导出中途出错时目标文件保持原样，不会留下被截断的文件。
+
+    每次导出后 bytes_written / elapsed 记录写入字节数和耗时，
+    checksum=True 时额外生成 <文件名>.sha256 校验文件。
+    """
+
+    def __init__(self, filepath: str, checksum: bool = False):
+        self.filepath = filepath
+        self.checksum = checksum
+        self.bytes_written = 0
+        self.elapsed = 0.0
+
+    @contextmanager
+    def _open(self, mode: str = "wb"):
+        """打开内存缓冲区，mode 为 "w"(文本, UTF-8) 或 "wb"(二进制)"""
+        start = time.perf_counter()
+        buffer = io.StringIO() if mode == "w" else io.BytesIO()
+        yield buffer
+
+        data = buffer.getvalue()
+        if mode == "w":
+            # 与原先的文本模式 open() 一致，换行符按平台转换
+            if os.linesep != "\n":
+                data = data.replace("\n", os.linesep)
+            data = data.encode("utf-8")
+
+        self._replace(self.filepath, data)
+        if self.checksum:
+            digest = hashlib.sha256(data).hexdigest()
+            line = f"{digest}  {os.path.basename(self.filepath)}\n"
+            self._replace(self.filepath + ".sha256", line.encode("utf-8"))
+
+        self.bytes_written = len(data)
+        self.elapsed = time.perf_counter() - start
+        print(
+            f"[LX] 写入 {os.path.basename(self.filepath)}: {self.bytes_written} 字节, 耗时 {self.elapsed:.3f}s"
+        )
+
+    @staticmethod
+    def _create_temp(filepath: str):
+        """在目标文件同目录创建临时文件，返回 (文件描述符, 路径)
+
+        与 open() 新建文件一样以0o666创建，由内核按umask去掉权限位；
+        不用 mkstemp（固定为0600），也不临时改动进程全局的umask。
+        """
+        directory = os.path.dirname(os.path.abspath(filepath))
+        prefix = "." + os.path.basename(filepath) + "."
+        flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+        for _ in range(100):
+            tmp_path = os.path.join(directory, prefix + os.urandom(6).hex() + ".tmp")
+            try:
+                return os.open(tmp_path, flags, 0o666), tmp_path
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"无法创建临时文件: {filepath}")
+
+    @staticmethod
+    def _replace(filepath: str, data: bytes):
+        """写入临时文件后原子替换目标文件"""
+        fd, tmp_path = LXWriter._create_temp(filepath)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+            # 目标文件已存在时沿用其权限，新文件保持创建时按umask得到的权限
+            try:
+                mode = stat.S_IMODE(os.stat(filepath).st_mode)
+            except FileNotFoundError:
+                mode = None
+            if mode is not None:
+                os.chmod(tmp_path, mode)
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
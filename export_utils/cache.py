@@ -0,0 +1,119 @@
+import os
+import struct
+from typing import Dict, Optional, Tuple
+
+from .base import LXWriter
+
+
+class GMBExportCache:
+    """GMB增量导出缓存
+
+    以对象名为键，保存对象的内容摘要和序列化后的字节块。
+    再次导出时摘要未变的对象直接复用字节块，只重新编码改动过的对象。
+    缓存同时保存在内存和导出文件旁的 .gmbcache 文件中，重启Blender后仍然有效。
+
+    本会话内校验过的对象还记录其廉价变化信号（只在内存中），信号未变时
+    连提取网格和计算摘要都可以跳过。
+    """
+
+    MAGIC = b"LXGC"
+    VERSION = 1
+    SUFFIX = ".gmbcache"
+
+    # 已加载的缓存: 绝对路径 -> GMBExportCache，同一会话内重复导出不再读盘
+    _instances: Dict[str, "GMBExportCache"] = {}
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.cache_path = filepath + self.SUFFIX
+        # 对象名 -> (摘要, 字节块, 顶点数, 面数)
+        self.entries: Dict[str, Tuple[bytes, bytes, int, int]] = {}
+        # 对象名 -> 上次确认缓存有效时的变化信号
+        self.signals: Dict[str, object] = {}
+
+    @classmethod
+    def for_path(cls, filepath: str) -> "GMBExportCache":
+        """获取导出路径对应的缓存，必要时从磁盘加载"""
+        key = os.path.abspath(filepath)
+        cache = cls._instances.get(key)
+        if cache is None:
+            cache = cls(filepath)
+            cache.load()
+            cls._instances[key] = cache
+        return cache
+
+    def lookup(self, name: str, digest: bytes) -> Optional[Tuple[bytes, int, int]]:
+        """摘要一致时返回 (字节块, 顶点数, 面数)，否则返回None"""
+        entry = self.entries.get(name)
+        if entry is None or entry[0] != digest:
+            return None
+        return entry[1], entry[2], entry[3]
+
+    def lookup_signal(self, name: str, signal) -> Optional[Tuple[bytes, int, int]]:
+        """变化信号与上次确认时一致时返回 (字节块, 顶点数, 面数)，否则返回None"""
+        entry = self.entries.get(name)
+        if entry is None or self.signals.get(name) != signal:
+            return None
+        return entry[1], entry[2], entry[3]
+
+    def remember_signal(self, name: str, signal):
+        """记录对象当前的变化信号，此时缓存条目与对象内容一致"""
+        self.signals[name] = signal
+
+    def store(
+        self, name: str, digest: bytes, blob: bytes, vert_num: int, face_num: int
+    ):
+        self.entries[name] = (digest, blob, vert_num, face_num)
+
+    def retain(self, names):
+        """只保留本次导出用到的对象，丢弃已删除对象的缓存"""
+        names = set(names)
+        for name in list(self.entries):
+            if name not in names:
+                del self.entries[name]
+                self.signals.pop(name, None)
+
+    def load(self):
+        self.entries = {}
+        self.signals = {}
+        if not os.path.exists(self.cache_path):
+            return
+        try:
+            with open(self.cache_path, "rb") as f:
+                data = f.read()
+            if data[:4] != self.MAGIC:
+                raise ValueError("缓存文件头不正确")
+            version, count = struct.unpack_from("<2I", data, 4)
+            if version != self.VERSION:
+                raise ValueError(f"缓存版本不匹配: {version}")
+            offset = 12
+            for _ in range(count):
+                name_len = struct.unpack_from("<I", data, offset)[0]
+                offset += 4
+                name = data[offset : offset + name_len].decode("utf-8")
+                offset += name_len
+                digest = data[offset : offset + 16]
+                offset += 16
+                vert_num, face_num, blob_len = struct.unpack_from("<3I", data, offset)
+                offset += 12
+                blob = data[offset : offset + blob_len]
+                offset += blob_len
+                self.entries[name] = (digest, blob, vert_num, face_num)
+            print(f"[LX] 加载GMB导出缓存: {len(self.entries)} 个对象")
+        except Exception as e:
+            print(f"[LX] GMB导出缓存无效，已忽略: {e}")
+            self.entries = {}
+
+    def save(self):
+        chunks = [self.MAGIC, struct.pack("<2I", self.VERSION, len(self.entries))]
+        for name, (digest, blob, vert_num, face_num) in self.entries.items():
+            name_bytes = name.encode("utf-8")
+            chunks.append(struct.pack("<I", len(name_bytes)))
+            chunks.append(name_bytes)
+            chunks.append(digest)
+            chunks.append(struct.pack("<3I", vert_num, face_num, len(blob)))
+            chunks.append(blob)
+        try:
+            LXWriter._replace(self.cache_path, b"".join(chunks))
+        except OSError as e:
+            print(f"[LX] 保存GMB导出缓存失败: {e}")
@@ -0,0 +1,134 @@
+import struct
+from typing import Tuple
+
+import numpy as np
+
+from .base import LXWriter
+
+# 层级节点: 包围盒最小/最大值(6f) + first(long) + count(long)，共32字节
+# count > 0 为叶子节点，三角形为 [first, first + count)
+# count = 0 为内部节点，左右子节点为 first 和 first + 1
+COB_NODE_DTYPE = np.dtype(
+    [("min", "<f4", (3,)), ("max", "<f4", (3,)), ("first", "<u4"), ("count", "<u4")]
+)
+
+
+def _morton_codes(points) -> np.ndarray:
+    """把点坐标量化到 21 位网格后交织为 63 位Morton码"""
+    low = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - low, 1e-9)
+    grid = ((points - low) / extent * ((1 << 21) - 1)).astype(np.uint64)
+
+    def spread(v):
+        v = v & np.uint64(0x1FFFFF)
+        v = (v | v << np.uint64(32)) & np.uint64(0x1F00000000FFFF)
+        v = (v | v << np.uint64(16)) & np.uint64(0x1F0000FF0000FF)
+        v = (v | v << np.uint64(8)) & np.uint64(0x100F00F00F00F00F)
+        v = (v | v << np.uint64(4)) & np.uint64(0x10C30C30C30C30C3)
+        v = (v | v << np.uint64(2)) & np.uint64(0x1249249249249249)
+        return v
+
+    return (
+        spread(grid[:, 0])
+        | spread(grid[:, 1]) << np.uint64(1)
+        | spread(grid[:, 2]) << np.uint64(2)
+    )
+
+
+def build_aabb_tree(verts, tris, leaf_size: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+    """为三角形集合构建AABB层级（线性BVH）
+
+    三角形包围盒一次性向量化计算，按中心点的Morton码排序后每 leaf_size 个
+    相邻三角形组成一个叶子，再自底向上两两合并包围盒，每一层只需几次numpy运算。
+    返回 (节点数组, 按叶子顺序重排后的三角形数组)，节点按从根开始的广度优先顺序存放，
+    共 2 * 叶子数 - 1 个，每个节点只出现一次。
+    """
+    verts = np.asarray(verts, dtype=np.float32).reshape(-1, 3)
+    tris = np.asarray(tris, dtype=np.uint32).reshape(-1, 3)
+    if len(tris) == 0:
+        raise ValueError("没有可导出的碰撞三角形")
+    leaf_size = max(1, leaf_size)
+
+    corners = verts[tris]
+    tri_min = corners.min(axis=1)
+    tri_max = corners.max(axis=1)
+    order = np.argsort(_morton_codes((tri_min + tri_max) * 0.5), kind="stable")
+    tris = tris[order]
+    tri_min = tri_min[order]
+    tri_max = tri_max[order]
+
+    # 叶子节点，按构建顺序编号: 叶子在前，内部节点依次追加，共 2 * 叶子数 - 1 个
+    starts = np.arange(0, len(tris), leaf_size)
+    leaf_num = len(starts)
+    node_num = 2 * leaf_num - 1
+    node_min = np.empty((node_num, 3), dtype=np.float32)
+    node_max = np.empty((node_num, 3), dtype=np.float32)
+    node_min[:leaf_num] = np.minimum.reduceat(tri_min, starts, axis=0)
+    node_max[:leaf_num] = np.maximum.reduceat(tri_max, starts, axis=0)
+    # 内部节点的左右子节点编号，叶子为 -1
+    left_child = np.full(node_num, -1, dtype=np.int64)
+    right_child = np.full(node_num, -1, dtype=np.int64)
+
+    # 自底向上两两合并，奇数个时最后一个节点按编号直接进入下一轮，不复制节点
+    active = np.arange(leaf_num)
+    next_id = leaf_num
+    while len(active) > 1:
+        pair_num = len(active) // 2
+        left = active[0 : 2 * pair_num : 2]
+        right = active[1 : 2 * pair_num : 2]
+        ids = np.arange(next_id, next_id + pair_num)
+        node_min[ids] = np.minimum(node_min[left], node_min[right])
+        node_max[ids] = np.maximum(node_max[left], node_max[right])
+        left_child[ids] = left
+        right_child[ids] = right
+        next_id += pair_num
+        active = np.concatenate([ids, active[2 * pair_num :]])
+
+    # 从根开始逐层广度优先布局，每个内部节点的两个子节点连续存放
+    position = np.empty(node_num, dtype=np.int64)
+    position[active[0]] = 0
+    frontier = active
+    placed = 1
+    while len(frontier):
+        inner = frontier[left_child[frontier] >= 0]
+        children = np.empty(2 * len(inner), dtype=np.int64)
+        children[0::2] = left_child[inner]
+        children[1::2] = right_child[inner]
+        position[children] = placed + np.arange(len(children))
+        placed += len(children)
+        frontier = children
+
+    nodes = np.zeros(node_num, dtype=COB_NODE_DTYPE)
+    nodes["min"][position] = node_min
+    nodes["max"][position] = node_max
+    is_leaf = left_child < 0
+    nodes["first"][position[is_leaf]] = starts
+    nodes["count"][position[is_leaf]] = np.diff(np.append(starts, len(tris)))
+    inner = np.flatnonzero(~is_leaf)
+    nodes["first"][position[inner]] = position[left_child[inner]]
+
+    return nodes, tris
+
+
+class COBWriter(LXWriter):
+    """COB碰撞文件写入器
+
+    文件结构:
+        "COLB V1.00"(10字节)
+        顶点数、三角形数、节点数(各4字节)
+        顶点: 3f
+        三角形: 3个顶点索引(long)，按AABB层级的叶子顺序排列
+        层级节点: 见 COB_NODE_DTYPE，0号节点为根
+    """
+
+    def write(self, verts, tris, leaf_size: int = 8):
+        verts = np.asarray(verts, dtype="<f4").reshape(-1, 3)
+        nodes, tris = build_aabb_tree(verts, tris, leaf_size)
+        self.node_num = len(nodes)
+
+        with self._open("wb") as f:
+            f.write(b"COLB V1.00")
+            f.write(struct.pack("<3I", len(verts), len(tris), len(nodes)))
+            f.write(verts.tobytes())
+            f.write(tris.astype("<u4").tobytes())
+            f.write(nodes.tobytes())
@@ -0,0 +1,264 @@
+"""LOD链生成
+
+基于二次误差度量(QEM)的边折叠简化。每一轮对全部边的折叠代价做一次向量化计算，
+再选出一组互不相邻的低代价边同时折叠，直到三角形数降到目标值。
+UV接缝、材质边界和开放边界上的顶点被锁定，不会被移动或删除。
+"""
+
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def _unique_edges(faces) -> Tuple[np.ndarray, np.ndarray]:
+    """返回排好序的唯一边 (e, 2) 和每条边被多少个三角形使用"""
+    edges = np.sort(faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2), axis=1)
+    # 编码为单个整数后排序，比按行 unique 快得多
+    base = np.int64(edges.max() + 1) if len(edges) else np.int64(1)
+    keys, counts = np.unique(edges[:, 0] * base + edges[:, 1], return_counts=True)
+    return np.stack([keys // base, keys % base], axis=1), counts
+
+
+def locked_vertices(
+    faces, vert_num: int, face_mat=None, corner_uv=None, eps: float = 1e-6
+) -> np.ndarray:
+    """计算简化时必须保留的顶点
+
+    faces: (m, 3) 三角形顶点索引
+    face_mat: (m,) 每个三角形的材质索引，可选
+    corner_uv: (m, 3, 2) 每个三角形角的UV，可选
+    开放边界和非流形边的顶点、相邻三角形材质不同的顶点、
+    在不同三角形中UV不同（位于UV接缝上）的顶点都会被锁定。
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    locked = np.zeros(vert_num, dtype=bool)
+    if len(faces) == 0:
+        return locked
+
+    edges, counts = _unique_edges(faces)
+    locked[edges[counts != 2].ravel()] = True
+
+    corners = faces.ravel()
+    if face_mat is not None:
+        mats = np.repeat(np.asarray(face_mat, dtype=np.int64), 3)
+        low = np.full(vert_num, np.iinfo(np.int64).max)
+        high = np.full(vert_num, np.iinfo(np.int64).min)
+        np.minimum.at(low, corners, mats)
+        np.maximum.at(high, corners, mats)
+        locked |= low != high
+
+    if corner_uv is not None:
+        uv = np.asarray(corner_uv, dtype=np.float64).reshape(-1, 2)
+        ref = np.zeros((vert_num, 2))
+        ref[corners] = uv
+        differs = np.abs(uv - ref[corners]).max(axis=1) > eps
+        locked[corners[differs]] = True
+
+    return locked
+
+
+def _vertex_quadrics(verts, faces) -> np.ndarray:
+    """按面积加权累积每个顶点相邻三角形平面的二次误差矩阵 (n, 4, 4)"""
+    p0, p1, p2 = verts[faces[:, 0]], verts[faces[:, 1]], verts[faces[:, 2]]
+    normal = np.cross(p1 - p0, p2 - p0)
+    length = np.linalg.norm(normal, axis=1)
+    unit = normal / np.maximum(length, 1e-20)[:, None]
+    plane = np.concatenate([unit, -np.sum(unit * p0, axis=1)[:, None]], axis=1)
+    face_q = (plane[:, :, None] * plane[:, None, :]).reshape(-1, 16)
+    face_q *= (length * 0.5)[:, None]
+
+    corners = faces.ravel()
+    quadrics = np.empty((len(verts), 16))
+    for c in range(16):
+        quadrics[:, c] = np.bincount(
+            corners, weights=np.repeat(face_q[:, c], 3), minlength=len(verts)
+        )
+    return quadrics.reshape(-1, 4, 4)
+
+
+def _quadric_cost(q, pos) -> np.ndarray:
+    """批量计算 [pos, 1]^T Q [pos, 1]"""
+    h = np.concatenate([pos, np.ones(pos.shape[:-1] + (1,))], axis=-1)
+    return np.sum(np.matmul(q, h[..., None])[..., 0] * h, axis=-1)
+
+
+def _link_condition(keep, drop, edge_faces, edges, vert_num) -> np.ndarray:
+    """检查折叠后拓扑是否保持流形
+
+    keep 与 drop 的公共邻接顶点数必须等于共享这条边的三角形数，
+    否则折叠会产生重复边或非流形结构。
+    """
+    flat = np.concatenate([edges, edges[:, ::-1]])
+    flat = flat[np.argsort(flat[:, 0], kind="stable")]
+    starts = np.searchsorted(flat[:, 0], np.arange(vert_num + 1))
+    keys = np.sort(edges[:, 0] * vert_num + edges[:, 1])
+
+    degree = starts[drop + 1] - starts[drop]
+    owner = np.repeat(np.arange(len(drop)), degree)
+    offsets = np.arange(degree.sum()) - np.repeat(np.cumsum(degree) - degree, degree)
+    neighbor = flat[np.repeat(starts[drop], degree) + offsets, 1]
+    a = np.minimum(keep[owner], neighbor)
+    b = np.maximum(keep[owner], neighbor)
+    probe = a * vert_num + b
+    pos = np.minimum(np.searchsorted(keys, probe), len(keys) - 1)
+    shared = (keys[pos] == probe) & (neighbor != keep[owner])
+    common = np.bincount(owner, weights=shared, minlength=len(drop))
+    return common == edge_faces
+
+
+def simplify_mesh(
+    verts,
+    faces,
+    target_faces: int,
+    locked: Optional[np.ndarray] = None,
+    max_passes: int = 100,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """把三角网格简化到不超过 target_faces 个三角形（锁定顶点过多时可能达不到）
+
+    返回 (顶点, 三角形, 保留顶点的原索引, 保留三角形的原索引)，
+    后两项用于从原网格取回UV、颜色和材质等属性。
+    """
+    verts = np.array(verts, dtype=np.float64).reshape(-1, 3)
+    faces = np.array(faces, dtype=np.int64).reshape(-1, 3)
+    vert_num = len(verts)
+    face_index = np.arange(len(faces))
+    if locked is None:
+        locked = np.zeros(vert_num, dtype=bool)
+    quadrics = _vertex_quadrics(verts, faces)
+
+    for _ in range(max_passes):
+        excess = len(faces) - target_faces
+        if excess <= 0 or len(faces) == 0:
+            break
+
+        edges, edge_faces = _unique_edges(faces)
+        free = ~(locked[edges[:, 0]] & locked[edges[:, 1]])
+        edges, edge_faces = edges[free], edge_faces[free]
+        if len(edges) == 0:
+            break
+
+        # 锁定顶点必须作为保留端，且位置不变
+        swap = locked[edges[:, 1]]
+        keep = np.where(swap, edges[:, 1], edges[:, 0])
+        drop = np.where(swap, edges[:, 0], edges[:, 1])
+        q = quadrics[keep] + quadrics[drop]
+        candidates = np.stack(
+            [verts[keep], verts[drop], (verts[keep] + verts[drop]) * 0.5]
+        )
+        costs = _quadric_cost(q[None], candidates)
+        costs[1:, locked[keep]] = np.inf
+        best = np.argmin(costs, axis=0)
+        cost = costs[best, np.arange(len(edges))]
+        target = candidates[best, np.arange(len(edges))]
+
+        # 每个顶点只参与它相邻边中代价最低的那次折叠
+        # （按代价从高到低赋值，重复索引时最后写入的就是最低代价）
+        order = np.argsort(cost, kind="stable")[::-1]
+        rank = np.empty(len(edges), dtype=np.int64)
+        rank[order] = np.arange(len(edges))[::-1]
+        lowest = np.full(vert_num, len(edges), dtype=np.int64)
+        ends = np.stack([keep[order], drop[order]], axis=1).ravel()
+        lowest[ends] = np.repeat(rank[order], 2)
+        chosen = np.flatnonzero((lowest[keep] == rank) & (lowest[drop] == rank))
+        chosen = chosen[
+            _link_condition(
+                keep[chosen], drop[chosen], edge_faces[chosen], edges, vert_num
+            )
+        ]
+        if len(chosen) == 0:
+            break
+
+        # 一轮最多折叠一半候选边，让代价更低的边在后续轮次中优先
+        chosen = chosen[np.argsort(cost[chosen], kind="stable")]
+        limit = max(1, min((excess + 1) // 2, (len(chosen) + 1) // 2))
+        chosen = chosen[:limit]
+
+        # 折叠后法线翻转的三角形所涉及的折叠全部撤销，重试直到没有翻转
+        old_normal = np.cross(
+            verts[faces[:, 1]] - verts[faces[:, 0]],
+            verts[faces[:, 2]] - verts[faces[:, 0]],
+        )
+        while len(chosen):
+            remap = np.arange(vert_num)
+            remap[drop[chosen]] = keep[chosen]
+            moved = verts.copy()
+            moved[keep[chosen]] = target[chosen]
+            new_faces = remap[faces]
+            alive = (
+                (new_faces[:, 0] != new_faces[:, 1])
+                & (new_faces[:, 1] != new_faces[:, 2])
+                & (new_faces[:, 2] != new_faces[:, 0])
+            )
+            new_normal = np.cross(
+                moved[new_faces[:, 1]] - moved[new_faces[:, 0]],
+                moved[new_faces[:, 2]] - moved[new_faces[:, 0]],
+            )
+            flipped = alive & (np.sum(old_normal * new_normal, axis=1) <= 0.0)
+            if not flipped.any():
+                break
+            collapse_of = np.full(vert_num, -1, dtype=np.int64)
+            collapse_of[keep[chosen]] = np.arange(len(chosen))
+            collapse_of[drop[chosen]] = np.arange(len(chosen))
+            bad = np.unique(collapse_of[faces[flipped]])
+            reject = np.zeros(len(chosen), dtype=bool)
+            reject[bad[bad >= 0]] = True
+            chosen = chosen[~reject]
+        if len(chosen) == 0:
+            break
+
+        quadrics[keep[chosen]] += quadrics[drop[chosen]]
+        verts = moved
+        faces = new_faces[alive]
+        face_index = face_index[alive]
+
+    used = np.unique(faces)
+    compact = np.zeros(vert_num, dtype=np.int64)
+    compact[used] = np.arange(len(used))
+    return verts[used], compact[faces], used, face_index
+
+
+def build_lod_chain(
+    verts, faces, ratios: List[float], locked: Optional[np.ndarray] = None
+) -> List[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """按三角形比例（如 [0.5, 0.25, 0.1]）生成LOD链
+
+    每一级从上一级的结果继续简化，返回的索引始终相对于原始网格。
+    """
+    verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    face_total = len(faces)
+    if locked is None:
+        locked = np.zeros(len(verts), dtype=bool)
+
+    chain = []
+    vert_index = np.arange(len(verts))
+    face_index = np.arange(face_total)
+    for ratio in ratios:
+        target = int(round(face_total * ratio))
+        verts, faces, used, kept = simplify_mesh(
+            verts, faces, target, locked[vert_index]
+        )
+        vert_index = vert_index[used]
+        face_index = face_index[kept]
+        chain.append((verts, faces, vert_index, face_index))
+    return chain
+
+
+def parse_lod_ratios(text: str) -> List[float]:
+    """解析 "50,25,10" 形式的百分比列表，忽略100%和非法值"""
+    ratios = []
+    for part in text.replace("%", "").replace(" ", "").split(","):
+        try:
+            value = float(part)
+        except ValueError:
+            continue
+        if 0.0 < value < 100.0:
+            ratios.append(value / 100.0)
+    return sorted(set(ratios), reverse=True)
+
+
+def lod_path(filepath: str, level: int) -> str:
+    """第 level 级LOD的文件路径，例如 prop.gmb -> prop_lod1.gmb"""
+    base, ext = os.path.splitext(filepath)
+    return f"{base}_lod{level}{ext}"
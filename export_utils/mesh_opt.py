@@ -0,0 +1,148 @@
+"""顶点缓存与顶点读取顺序优化
+
+GPU在变换顶点后会缓存最近用过的顶点，三角形顺序越集中，重复变换的顶点越少。
+optimize_vertex_cache 按 Forsyth 的线性速度顶点缓存优化算法重排三角形，
+optimize_vertex_fetch 再按首次使用的顺序重新编号顶点，使顶点读取也保持连续。
+用平均缓存未命中率（ACMR，每个三角形需要变换的顶点数）衡量效果。
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+# Forsyth 算法参数
+CACHE_SIZE = 32
+CACHE_DECAY_POWER = 1.5
+LAST_TRI_SCORE = 0.75
+VALENCE_BOOST_SCALE = 2.0
+VALENCE_BOOST_POWER = 0.5
+
+
+def acmr(faces, cache_size: int = 16) -> float:
+    """模拟FIFO顶点缓存，返回平均每个三角形的缓存未命中次数（0.5~3.0，越低越好）"""
+    faces = np.asarray(faces).reshape(-1, 3)
+    if len(faces) == 0:
+        return 0.0
+    stamp = {}  # 顶点 -> 进入缓存时的未命中序号
+    misses = 0
+    for v in faces.ravel().tolist():
+        entered = stamp.get(v)
+        if entered is None or misses - entered >= cache_size:
+            stamp[v] = misses
+            misses += 1
+    return misses / len(faces)
+
+
+def _score_tables(max_valence: int):
+    cache_score = [LAST_TRI_SCORE] * 3 + [
+        (1.0 - (pos - 3) / (CACHE_SIZE - 3)) ** CACHE_DECAY_POWER
+        for pos in range(3, CACHE_SIZE)
+    ]
+    valence_score = [0.0] + [
+        VALENCE_BOOST_SCALE * valence**-VALENCE_BOOST_POWER
+        for valence in range(1, max_valence + 1)
+    ]
+    return cache_score, valence_score
+
+
+def optimize_vertex_cache(faces, vert_num: int) -> np.ndarray:
+    """返回重排后的三角形顺序（原三角形索引数组）
+
+    每一步从缓存中顶点相邻的三角形里选出顶点分数之和最高的一个输出，
+    然后只更新缓存中顶点及其相邻三角形的分数。
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    tri_num = len(faces)
+    if tri_num == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    # 顶点 -> 相邻三角形（CSR）
+    corners = faces.ravel()
+    valence = np.bincount(corners, minlength=vert_num)
+    starts = np.concatenate([[0], np.cumsum(valence)]).tolist()
+    vert_tris = (np.argsort(corners, kind="stable") // 3).tolist()
+
+    cache_score, valence_score = _score_tables(int(valence.max()))
+    remaining = valence.tolist()
+    position = [-1] * vert_num
+    vert_score = [valence_score[r] for r in remaining]
+    tri_verts = faces.tolist()
+    tri_score = [vert_score[a] + vert_score[b] + vert_score[c] for a, b, c in tri_verts]
+    added = bytearray(tri_num)
+
+    order = []
+    cache = []
+    cursor = 0
+    best = max(range(tri_num), key=tri_score.__getitem__)
+    while True:
+        if best < 0:
+            # 缓存中没有可用三角形时，按原顺序取下一个未输出的三角形
+            while cursor < tri_num and added[cursor]:
+                cursor += 1
+            if cursor == tri_num:
+                break
+            best = cursor
+
+        added[best] = 1
+        order.append(best)
+        tri = tri_verts[best]
+        for v in tri:
+            remaining[v] -= 1
+
+        new_cache = tri + [v for v in cache if v not in tri]
+        evicted = new_cache[CACHE_SIZE:]
+        cache = new_cache[:CACHE_SIZE]
+        for v in evicted:
+            position[v] = -1
+            vert_score[v] = valence_score[remaining[v]] if remaining[v] else -1.0
+        for pos, v in enumerate(cache):
+            position[v] = pos
+            if remaining[v]:
+                vert_score[v] = cache_score[pos] + valence_score[remaining[v]]
+            else:
+                vert_score[v] = -1.0
+
+        best = -1
+        best_score = -1.0
+        for v in cache + evicted:
+            for i in range(starts[v], starts[v + 1]):
+                t = vert_tris[i]
+                if added[t]:
+                    continue
+                a, b, c = tri_verts[t]
+                score = vert_score[a] + vert_score[b] + vert_score[c]
+                tri_score[t] = score
+                if score > best_score and position[v] >= 0:
+                    best = t
+                    best_score = score
+
+    return np.asarray(order, dtype=np.int64)
+
+
+def optimize_vertex_fetch(faces, vert_num: int) -> Tuple[np.ndarray, np.ndarray]:
+    """按首次使用顺序重新编号顶点
+
+    返回 (重新编号后的三角形, 新顶点对应的原顶点索引)，未被使用的顶点排在最后。
+    """
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    corners = faces.ravel()
+    first_use = np.full(vert_num, len(corners), dtype=np.int64)
+    # 逆序赋值，重复索引时最后写入的就是最早出现的位置
+    first_use[corners[::-1]] = np.arange(len(corners))[::-1]
+    order = np.argsort(first_use, kind="stable")
+    remap = np.empty(vert_num, dtype=np.int64)
+    remap[order] = np.arange(vert_num)
+    return remap[faces], order
+
+
+def optimize_mesh(verts, faces):
+    """依次进行顶点缓存和顶点读取优化
+
+    返回 (顶点, 三角形, 新顶点对应的原顶点索引, 优化前ACMR, 优化后ACMR)
+    """
+    verts = np.asarray(verts)
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    before = acmr(faces)
+    faces = faces[optimize_vertex_cache(faces, len(verts))]
+    faces, vert_order = optimize_vertex_fetch(faces, len(verts))
+    return verts[vert_order], faces, vert_order, before, acmr(faces)
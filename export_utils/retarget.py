@@ -0,0 +1,99 @@
+"""AMB动作在不同BNC骨骼之间的重定向
+
+按名称对应源骨骼和目标骨骼，把源动作中每个节点相对静止姿态的世界旋转变化
+施加到目标骨骼的静止姿态上:
+
+    W_t = W_s * conj(R_s) * R_t
+
+其中 R_s、R_t 为源/目标节点静止姿态的世界旋转。修正四元数 conj(R_s) * R_t
+只在构造时计算一次，之后对整段 (帧数, 节点数, 4) 数组批量计算。
+目标骨骼中没有对应的节点保持静止姿态的局部旋转。
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .. import math_utils
+from ..import_utils import LXBone, bone_arrays
+
+
+class Retargeter:
+    def __init__(
+        self,
+        source: List[LXBone],
+        target: List[LXBone],
+        bone_map: Dict[str, str] = None,
+        scale_root: bool = True,
+    ):
+        """bone_map: 目标节点名 -> 源节点名，未列出的节点按名称（不区分大小写）对应"""
+        src_pivots, src_quats, self.source_parents = bone_arrays(source)
+        tgt_pivots, tgt_quats, self.target_parents = bone_arrays(target)
+        self.source_num = len(source)
+        self.target_num = len(target)
+
+        exact = {b.bone_name: i for i, b in enumerate(source)}
+        folded = {b.bone_name.lower(): i for i, b in enumerate(source)}
+        bone_map = bone_map or {}
+        self.mapping = np.full(self.target_num, -1, dtype=np.int64)
+        for j, bone in enumerate(target):
+            name = bone_map.get(bone.bone_name, bone.bone_name)
+            self.mapping[j] = exact.get(name, folded.get(name.lower(), -1))
+        self.unmapped = [
+            b.bone_name for b, i in zip(target, self.mapping.tolist()) if i < 0
+        ]
+
+        self.target_rest = math_utils.quat_normalize(tgt_quats)
+        src_rest_world = math_utils.quat_accumulate_world(
+            math_utils.quat_normalize(src_quats), self.source_parents
+        )
+        tgt_rest_world = math_utils.quat_accumulate_world(
+            self.target_rest, self.target_parents
+        )
+        mapped = np.flatnonzero(self.mapping >= 0)
+        self.correction = np.tile([1.0, 0.0, 0.0, 0.0], (self.target_num, 1))
+        self.correction[mapped] = math_utils.quat_multiply(
+            math_utils.quat_conjugate(src_rest_world[self.mapping[mapped]]),
+            tgt_rest_world[mapped],
+        )
+        self.levels = math_utils.hierarchy_levels(self.target_parents)
+
+        # 根节点位移相对静止位置的偏移按根节点高度比例缩放
+        self.source_root = src_pivots[0] if len(src_pivots) else np.zeros(3)
+        self.target_root = tgt_pivots[0] if len(tgt_pivots) else np.zeros(3)
+        self.root_scale = 1.0
+        src_height = np.linalg.norm(self.source_root)
+        tgt_height = np.linalg.norm(self.target_root)
+        if scale_root and src_height > 1e-6 and tgt_height > 1e-6:
+            self.root_scale = tgt_height / src_height
+
+    def retarget(self, rotations, root_positions) -> Tuple[np.ndarray, np.ndarray]:
+        """源动作 (帧数, 源节点数, 4)、(帧数, 3) -> 目标动作"""
+        rotations = math_utils.quat_normalize(rotations)
+        if rotations.shape[1] != self.source_num:
+            raise ValueError(
+                f"AMB节点数 {rotations.shape[1]} 与源BNC节点数 {self.source_num} 不一致"
+            )
+        source_world = math_utils.quat_accumulate_world(rotations, self.source_parents)
+
+        parents = self.target_parents
+        world = np.empty((len(rotations), self.target_num, 4), dtype=np.float64)
+        for level in self.levels:
+            mapped = level[self.mapping[level] >= 0]
+            world[:, mapped] = math_utils.quat_multiply(
+                source_world[:, self.mapping[mapped]], self.correction[mapped]
+            )
+            free = level[self.mapping[level] < 0]
+            roots = free[parents[free] < 0]
+            children = free[parents[free] >= 0]
+            world[:, roots] = self.target_rest[roots]
+            world[:, children] = math_utils.quat_multiply(
+                world[:, parents[children]], self.target_rest[children]
+            )
+
+        local = math_utils.quat_make_continuous(
+            math_utils.quat_world_to_local(world, parents), axis=0
+        )
+        root = np.asarray(root_positions, dtype=np.float64)
+        root = self.target_root + (root - self.source_root) * self.root_scale
+        return local, root
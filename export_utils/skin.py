@@ -0,0 +1,108 @@
+from typing import List
+
+import numpy as np
+
+from ..import_utils.weights import SkinWeights
+from .base import LXWriter
+
+
+def prune_skin_weights(
+    rows, cols, weights, vert_num: int, max_bones: int = 4, min_weight: float = 0.0
+):
+    """把稀疏权重 (顶点, 节点, 权重) 裁剪为每个顶点最多 max_bones 个影响并归一化
+
+    返回 (节点索引 (n, max_bones)，不足处为 -1；权重 (n, max_bones))。
+    """
+    skin = SkinWeights.from_coo(rows, cols, weights, vert_num)
+    return skin.pruned(max_bones, min_weight).to_padded(max_bones)
+
+
+class SKCWriter(LXWriter):
+    """SKC蒙皮模型写入器（文本格式，与 SKCReader 对应）
+
+    Static Skin <名称>
+    Vertices: <顶点数>
+    v x y z vt u v Bones <n> <节点索引> <权重> ...
+    f <材质> 3 <a> <b> <c>
+    """
+
+    def write(self, name: str, verts, uvs, faces, face_mat, bone_ids, bone_weights):
+        verts = np.asarray(verts, dtype=np.float64).reshape(-1, 3)
+        uvs = np.asarray(uvs, dtype=np.float64).reshape(-1, 2)
+        faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+        face_mat = np.asarray(face_mat, dtype=np.int64).reshape(-1)
+        bone_ids = np.asarray(bone_ids, dtype=np.int64)
+        bone_weights = np.asarray(bone_weights, dtype=np.float64)
+        max_bones = bone_ids.shape[1]
+
+        # 每个顶点按影响数选用对应的格式串，一次格式化整行
+        counts = (bone_ids >= 0).sum(axis=1)
+        formats = [
+            "v %.6f %.6f %.6f vt %.6f %.6f Bones %d" + " %d %.6f" * n + "\n"
+            for n in range(max_bones + 1)
+        ]
+        # 有效影响排在前面，交错为 id w id w ...
+        pairs = np.empty((len(verts), max_bones * 2), dtype=object)
+        pairs[:, 0::2] = bone_ids.tolist()
+        pairs[:, 1::2] = bone_weights.tolist()
+        head = np.concatenate([verts, uvs], axis=1).tolist()
+        vert_lines = [
+            formats[n] % tuple(h + [n] + p[: 2 * n])
+            for n, h, p in zip(counts.tolist(), head, pairs.tolist())
+        ]
+        face_lines = [
+            "f %d 3 %d %d %d\n" % tuple(row)
+            for row in np.concatenate([face_mat[:, None], faces], axis=1).tolist()
+        ]
+
+        with self._open("w") as f:
+            f.write("# Skin Model File V1.0\n")
+            f.write(f"Static Skin {name}\n")
+            f.write(f"Vertices: {len(verts)}\n")
+            f.write("".join(vert_lines))
+            f.write(f"Faces: {len(faces)}\n")
+            f.write("".join(face_lines))
+
+
+class BNCWriter(LXWriter):
+    """BNC骨骼文件写入器（与 BNCReader 对应）
+
+    节点按先骨骼后虚拟体的顺序写出，虚拟体的父节点写为 b<索引>/d<索引>。
+    """
+
+    def write(self, names: List[str], types, parents, pivots, quats):
+        types = np.asarray(types, dtype=np.int64)
+        parents = np.asarray(parents, dtype=np.int64)
+        pivots = np.asarray(pivots, dtype=np.float64).reshape(-1, 3)
+        quats = np.asarray(quats, dtype=np.float64).reshape(-1, 4)
+        bone_num = int((types == 1).sum())
+        if (types[:bone_num] != 1).any():
+            raise ValueError("BNC节点必须先列出全部骨骼，再列出虚拟体")
+        children = np.bincount(parents[parents >= 0], minlength=len(names))
+
+        blocks = []
+        for i, name in enumerate(names):
+            parent = parents[i]
+            if parent < 0:
+                parent_name = "NULL"
+            elif types[i] == 1:
+                parent_name = names[parent]
+            elif parent < bone_num:
+                parent_name = f"b{parent}"
+            else:
+                parent_name = f"d{parent - bone_num}"
+            kind = "bone" if types[i] == 1 else "Dummey"
+            px, py, pz = pivots[i]
+            qw, qx, qy, qz = quats[i]
+            blocks.append(
+                f"{kind} {name}\n{{\n"
+                f"  parent {parent_name}\n"
+                f"  pivot {px:.6f} {py:.6f} {pz:.6f}\n"
+                f"  quaternion {qw:.6f} {qx:.6f} {qy:.6f} {qz:.6f}\n"
+                f"  children {children[i]}\n}}\n"
+            )
+
+        with self._open("w") as f:
+            f.write("# Bone File V1.0\n")
+            f.write(f"Bones: {bone_num} Dummeys: {len(names) - bone_num}\n")
+            f.write("".join(blocks))
@@ -0,0 +1,396 @@
+"""WP路径点生成、连线计算和下一跳表
+
+路径点之间的候选连线由numpy按行分块批量计算（可限制最大距离），开启视线检测时
+每条候选连线在关卡几何的BVH树上做一次射线检测，只保留未被遮挡的连线。
+BVH树由调用方构造（Blender中为 mathutils.bvhtree.BVHTree），这里只要求它提供
+ray_cast(origin, direction, distance)。
+
+导出时还可以在连线图上预先计算所有路径点对的最短路径下一跳，写入 .wpn 附属文件，
+游戏中的AI寻路只需逐跳查表。
+
+路径点本身可以由关卡网格自动生成: 按网格向下批量发射射线得到各层地面的采样点，
+剔除过陡和头顶空间不足的点后按体素聚类，每个体素保留一个路径点。
+"""
+
+import heapq
+import multiprocessing
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .base import LXWriter
+
+# 小于此距离的连线标记为0
+NEAR_DISTANCE = 400.0
+
+# 每个线程任务检测的射线数
+RAY_BATCH = 4096
+
+# 计算候选连线时每块距离矩阵的元素数
+PAIR_BLOCK = 1 << 20
+
+# 路径点数不超过此值时用Floyd-Warshall，否则对每个路径点做Dijkstra
+FLOYD_LIMIT = 512
+
+# Dijkstra每次换算为连线序号的行数
+HOP_BLOCK = 256
+
+# 从命中点继续发射射线时沿射线方向的偏移，避免再次命中同一个面
+SURFACE_OFFSET = 0.1
+
+
+def candidate_links(
+    positions, max_distance: float = 0.0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """两两路径点之间的候选连线，返回 (pairs (m, 2) 且 i < j, 距离 (m,))
+
+    max_distance <= 0 时不限制距离。
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    n = len(positions)
+    columns = np.arange(n)
+    block = max(1, PAIR_BLOCK // max(n, 1))
+
+    pair_chunks = [np.empty((0, 2), dtype=np.int64)]
+    dist_chunks = [np.empty(0, dtype=np.float64)]
+    for start in range(0, n, block):
+        rows = columns[start : start + block]
+        delta = positions[None, :, :] - positions[rows, None, :]
+        dist = np.sqrt(np.einsum("ijk,ijk->ij", delta, delta))
+        mask = columns[None, :] > rows[:, None]
+        if max_distance > 0:
+            mask &= dist <= max_distance
+        r, c = np.nonzero(mask)
+        pair_chunks.append(np.stack([rows[r], c], axis=1))
+        dist_chunks.append(dist[r, c])
+    return np.concatenate(pair_chunks), np.concatenate(dist_chunks)
+
+
+def cast_rays(
+    bvh, origins, directions, distances, workers: int = 0
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """批量射线检测，返回 (是否命中 (m,), 命中点 (m, 3), 命中面法线 (m, 3))
+
+    directions 和 distances 可以是单个值，对所有射线广播。
+    射线按 RAY_BATCH 分批，workers > 1 时各批在线程池中检测。
+    """
+    origins = np.asarray(origins, dtype=np.float64).reshape(-1, 3)
+    count = len(origins)
+    directions = np.broadcast_to(np.asarray(directions, dtype=np.float64), (count, 3))
+    distances = np.broadcast_to(np.asarray(distances, dtype=np.float64), (count,))
+    hit = np.zeros(count, dtype=bool)
+    locations = np.zeros((count, 3), dtype=np.float64)
+    normals = np.zeros((count, 3), dtype=np.float64)
+
+    def cast(start):
+        stop = start + RAY_BATCH
+        ray_cast = bvh.ray_cast
+        rays = zip(
+            origins[start:stop].tolist(),
+            directions[start:stop].tolist(),
+            distances[start:stop].tolist(),
+        )
+        for k, (origin, direction, distance) in enumerate(rays, start):
+            location, normal, _, _ = ray_cast(origin, direction, distance)
+            if location is not None:
+                hit[k] = True
+                locations[k] = location
+                normals[k] = normal
+
+    starts = range(0, count, RAY_BATCH)
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(starts) > 1:
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(cast, starts))
+    else:
+        for start in starts:
+            cast(start)
+    return hit, locations, normals
+
+
+def visible_links(
+    bvh, positions, pairs, eye_height: float = 0.0, workers: int = 0
+) -> np.ndarray:
+    """对每条连线在BVH上做射线检测，返回未被遮挡的掩码 (m,)
+
+    射线从两端路径点上方 eye_height 处发出，避免贴地的射线被地面挡住。
+    """
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    if len(pairs) == 0:
+        return np.zeros(0, dtype=bool)
+
+    eye = positions + (0.0, 0.0, eye_height)
+    origins = eye[pairs[:, 0]]
+    delta = eye[pairs[:, 1]] - origins
+    lengths = np.linalg.norm(delta, axis=1)
+    directions = delta / np.maximum(lengths, 1e-9)[:, None]
+    blocked, _, _ = cast_rays(bvh, origins, directions, lengths, workers)
+    return ~blocked
+
+
+def sample_walkable(
+    bvh,
+    bounds,
+    spacing: float,
+    max_slope: float,
+    clearance: float,
+    max_layers: int = 8,
+    workers: int = 0,
+) -> np.ndarray:
+    """在包围盒 (最小值, 最大值) 范围内按 spacing 网格向下发射射线，返回可行走的采样点 (n, 3)
+
+    每列射线命中后从命中点下方继续向下，最多取 max_layers 层表面。
+    法线与竖直方向夹角超过 max_slope（弧度）的点被剔除；法线按绝对值判断，
+    不要求关卡网格的面朝向一致。clearance > 0 时上方 clearance 内有遮挡的点被剔除，
+    这同时会剔除射线穿过楼板后命中的楼板底面。
+    """
+    low, high = (np.asarray(v, dtype=np.float64) for v in bounds)
+    xs = np.arange(low[0] + spacing / 2, high[0] + spacing / 2, spacing)
+    ys = np.arange(low[1] + spacing / 2, high[1] + spacing / 2, spacing)
+    gx, gy = np.meshgrid(xs, ys, indexing="ij")
+    origins = np.column_stack(
+        [gx.ravel(), gy.ravel(), np.full(gx.size, high[2] + SURFACE_OFFSET)]
+    )
+    depth = high[2] - low[2] + 2 * SURFACE_OFFSET
+
+    point_chunks = [np.empty((0, 3))]
+    normal_chunks = [np.empty((0, 3))]
+    for _ in range(max_layers):
+        if len(origins) == 0:
+            break
+        hit, locations, normals = cast_rays(
+            bvh, origins, (0.0, 0.0, -1.0), depth, workers
+        )
+        point_chunks.append(locations[hit])
+        normal_chunks.append(normals[hit])
+        origins = locations[hit] - (0.0, 0.0, SURFACE_OFFSET)
+
+    points = np.concatenate(point_chunks)
+    normals = np.concatenate(normal_chunks)
+    points = points[np.abs(normals[:, 2]) >= np.cos(max_slope)]
+    if clearance > 0 and len(points):
+        blocked, _, _ = cast_rays(
+            bvh,
+            points + (0.0, 0.0, SURFACE_OFFSET),
+            (0.0, 0.0, 1.0),
+            clearance,
+            workers,
+        )
+        points = points[~blocked]
+    return points
+
+
+def cluster_points(points, size: float, height: float = 0.0) -> np.ndarray:
+    """按 size x size x height 的体素聚类（height <= 0 时为立方体素）
+
+    每个体素保留离体素内采样点均值最近的一个采样点，保证结果仍落在地面上。
+    """
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+    if len(points) == 0:
+        return points
+    cell = np.array([size, size, height if height > 0 else size])
+    keys = np.floor(points / cell).astype(np.int64)
+    _, inverse, counts = np.unique(
+        keys, axis=0, return_inverse=True, return_counts=True
+    )
+    inverse = inverse.ravel()
+    centers = (
+        np.stack([np.bincount(inverse, weights=points[:, k]) for k in range(3)], axis=1)
+        / counts[:, None]
+    )
+    delta = points - centers[inverse]
+    order = np.lexsort((np.einsum("ij,ij->i", delta, delta), inverse))
+    first = np.flatnonzero(np.diff(inverse[order], prepend=-1))
+    return points[order[first]]
+
+
+def build_waypoints(positions, pairs, dists, size: int = 40) -> List[Dict]:
+    """把无向连线展开为 WPWriter 使用的路径点列表，每个路径点的连线按索引排序"""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    links = [[] for _ in range(len(positions))]
+    for (i, j), dist in zip(np.asarray(pairs).tolist(), np.asarray(dists).tolist()):
+        flag = 0 if dist < NEAR_DISTANCE else 1
+        links[i].append({"index": j, "flag": flag, "dist": dist})
+        links[j].append({"index": i, "flag": flag, "dist": dist})
+    for wp_links in links:
+        wp_links.sort(key=lambda link: link["index"])
+    return [
+        {"pos": pos, "size": size, "links": wp_links}
+        for pos, wp_links in zip(positions.tolist(), links)
+    ]
+
+
+def link_graph(
+    node_num: int, pairs, dists
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """无向连线 -> CSR邻接表 (indptr (n+1,), 邻居 (2m,), 距离 (2m,))
+
+    每个路径点的邻居按索引排序，与 build_waypoints 写出的连线顺序一致。
+    """
+    pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+    dists = np.asarray(dists, dtype=np.float64)
+    src = np.concatenate([pairs[:, 0], pairs[:, 1]])
+    dst = np.concatenate([pairs[:, 1], pairs[:, 0]])
+    order = np.lexsort((dst, src))
+    indptr = np.zeros(node_num + 1, dtype=np.int64)
+    np.cumsum(np.bincount(src, minlength=node_num), out=indptr[1:])
+    return indptr, dst[order], np.concatenate([dists, dists])[order]
+
+
+def _floyd_warshall(indptr, indices, weights) -> np.ndarray:
+    """稠密矩阵上的Floyd-Warshall，返回下一跳路径点 (n, n)，不可达为-1"""
+    node_num = len(indptr) - 1
+    rows = np.repeat(np.arange(node_num), np.diff(indptr))
+    dist = np.full((node_num, node_num), np.inf)
+    dist[rows, indices] = weights
+    np.fill_diagonal(dist, 0.0)
+    hop = np.full((node_num, node_num), -1, dtype=np.int32)
+    hop[rows, indices] = indices
+
+    # 第k步中第k行和第k列不会变化，可以直接原地更新
+    for k in range(node_num):
+        via = dist[:, k, None] + dist[k]
+        better = via < dist
+        np.copyto(dist, via, where=better)
+        np.copyto(hop, hop[:, k, None], where=better)
+    return hop
+
+
+def _dijkstra_hops(adjacency, sources) -> np.ndarray:
+    """从每个源点做一次Dijkstra，返回下一跳路径点 (len(sources), n)，不可达为-1
+
+    源点的邻居以自身作为第一跳，其余路径点沿最短路径树继承前驱的第一跳。
+    """
+    node_num = len(adjacency)
+    hops = np.empty((len(sources), node_num), dtype=np.int32)
+    inf = float("inf")
+    heappush = heapq.heappush
+    heappop = heapq.heappop
+    for row, source in enumerate(sources):
+        dist = [inf] * node_num
+        first = [-1] * node_num
+        dist[source] = 0.0
+        heap = []
+        for w, v in adjacency[source]:
+            if w < dist[v]:
+                dist[v] = w
+                first[v] = v
+                heappush(heap, (w, v))
+        while heap:
+            d, u = heappop(heap)
+            if d > dist[u]:
+                continue
+            hop = first[u]
+            for w, v in adjacency[u]:
+                nd = d + w
+                if nd < dist[v]:
+                    dist[v] = nd
+                    first[v] = hop
+                    heappush(heap, (nd, v))
+        first[source] = -1
+        hops[row] = first
+    return hops
+
+
+# 进程池中各进程的邻接表
+_adjacency = None
+
+
+def _init_dijkstra(adjacency):
+    global _adjacency
+    _adjacency = adjacency
+
+
+def _dijkstra_block(sources):
+    return _dijkstra_hops(_adjacency, sources)
+
+
+def next_hop_table(
+    node_num: int, pairs, dists, method: str = "AUTO", workers: int = 1
+) -> np.ndarray:
+    """所有路径点对的最短路径下一跳表 (n, n)
+
+    第 i 行第 j 项为从 i 去往 j 时应走的连线在 i 的连线列表中的序号；
+    i == j 或不可达时为该整数类型的最大值。连线数少于255时为uint8，否则为uint16。
+    method: "FLOYD"、"DIJKSTRA" 或 "AUTO"（路径点数不超过 FLOYD_LIMIT 时用Floyd-Warshall）。
+    workers > 1 时Dijkstra按 HOP_BLOCK 行分块在进程池中计算，0表示使用全部CPU核心。
+    """
+    indptr, indices, weights = link_graph(node_num, pairs, dists)
+    degree = np.diff(indptr)
+    max_degree = int(degree.max()) if node_num else 0
+    if max_degree >= 0xFFFF:
+        raise ValueError(f"路径点连线数 {max_degree} 超过下一跳表的上限")
+    dtype = np.uint8 if max_degree < 0xFF else np.uint16
+    none = np.iinfo(dtype).max
+
+    # 下一跳路径点 -> 连线序号: 在按 (路径点, 邻居) 排序的键中二分查找
+    keys = np.repeat(np.arange(node_num, dtype=np.int64), degree) * node_num + indices
+
+    def to_slots(first_row, hops):
+        rows = np.arange(first_row, first_row + len(hops), dtype=np.int64)[:, None]
+        slots = np.searchsorted(keys, rows * node_num + hops) - indptr[rows]
+        return np.where(hops >= 0, slots, none).astype(dtype)
+
+    if method == "AUTO":
+        method = "FLOYD" if node_num <= FLOYD_LIMIT else "DIJKSTRA"
+    if method == "FLOYD":
+        return to_slots(0, _floyd_warshall(indptr, indices, weights))
+
+    adjacency = [
+        list(zip(weights[a:b].tolist(), indices[a:b].tolist()))
+        for a, b in zip(indptr[:-1].tolist(), indptr[1:].tolist())
+    ]
+    table = np.empty((node_num, node_num), dtype=dtype)
+    starts = range(0, node_num, HOP_BLOCK)
+    blocks = [range(start, min(start + HOP_BLOCK, node_num)) for start in starts]
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(blocks) > 1:
+        # 在Blender中fork整个进程不安全，统一用spawn启动子进程
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_dijkstra,
+            initargs=(adjacency,),
+        ) as pool:
+            for start, hops in zip(starts, pool.map(_dijkstra_block, blocks)):
+                table[start : start + HOP_BLOCK] = to_slots(start, hops)
+    else:
+        for start, sources in zip(starts, blocks):
+            table[start : start + HOP_BLOCK] = to_slots(
+                start, _dijkstra_hops(adjacency, sources)
+            )
+    return table
+
+
+def follow_path(table, indptr, indices, source: int, target: int) -> List[int]:
+    """按下一跳表从 source 走到 target，返回经过的路径点，不可达时返回空列表"""
+    none = np.iinfo(table.dtype).max
+    path = [source]
+    node = source
+    while node != target:
+        slot = int(table[node, target])
+        if slot == none or len(path) > len(table):
+            return []
+        node = int(indices[indptr[node] + slot])
+        path.append(node)
+    return path
+
+
+class NextHopWriter(LXWriter):
+    """路径点下一跳表 (.wpn)
+
+    文件头: "WPNH" + 路径点数 + 每项字节数（各4字节），之后按行存储 路径点数 x 路径点数 项
+    （小端 uint8/uint16），含义见 next_hop_table。
+    """
+
+    MAGIC = b"WPNH"
+
+    def write(self, table):
+        table = np.asarray(table)
+        with self._open("wb") as f:
+            f.write(struct.pack("<4sII", self.MAGIC, len(table), table.itemsize))
+            f.write(table.astype(table.dtype.newbyteorder("<"), copy=False).tobytes())
@@ -0,0 +1,17 @@
+"""导入和导出共用的二进制记录格式"""
+
+import numpy as np
+
+# GMB顶点: 位置(3f) + 法线(3f) + 颜色(4字节) + UV(2f)，共36字节
+GMB_VERTEX_DTYPE = np.dtype(
+    [
+        ("pos", "<f4", (3,)),
+        ("normal", "<f4", (3,)),
+        ("color", "<u4"),
+        ("uv", "<f4", (2,)),
+    ]
+)
+# GMB面: 材质ID(long) + 3个顶点索引(long) + 面法线(3f)，共28字节
+GMB_FACE_DTYPE = np.dtype(
+    [("mat", "<u4"), ("idx", "<u4", (3,)), ("normal", "<f4", (3,))]
+)
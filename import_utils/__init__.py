@@ -1,5 +1,7 @@
 import os
-from typing import List, Dict, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .weights import SkinWeights
 
 
 class LXObject:
@@ -10,10 +12,8 @@ class LXObject:
         self.uvs = []
         self.mats = []
         self.face_mat = []
-        # 骨骼权重数据
-        self.bone_v_count = []  # 每个顶点受影响的骨骼数量
-        self.bone_ids = []  # 每个顶点的骨骼ID列表
-        self.weight_array = []  # 每个顶点的权重列表
+        # 骨骼权重数据（CSR形式），没有蒙皮时为None
+        self.skin: Optional[SkinWeights] = None
 
 
 class LXBone:
@@ -147,6 +147,11 @@ class BNCReader:
         dummey_count = sum(1 for b in self.bones if b.bone_type == 2)
         print(f"[BNC] 骨骼数量: {bone_count}, 虚拟体数量: {dummey_count}")
 
+        # 名称 -> 索引，重名时取第一个
+        name_index = {}
+        for idx, b in enumerate(self.bones):
+            name_index.setdefault(b.bone_name, idx)
+
         for bone in self.bones:
             if bone.parent_name and bone.parent_name != "NULL":
                 parent_found = False
@@ -182,15 +187,13 @@ class BNCReader:
                             )
 
                 # 如果不是虚拟体的特殊格式，或特殊格式处理失败，则用名称匹配
-                if not parent_found:
-                    for idx, parent_bone in enumerate(self.bones):
-                        if parent_bone.bone_name == bone.parent_name:
-                            bone.parent_id = idx
-                            parent_found = True
-                            print(
-                                f"[BNC] {bone.bone_name} 的父级是 {bone.parent_name} (名称匹配 ID: {idx})"
-                            )
-                            break
+                if not parent_found and bone.parent_name in name_index:
+                    idx = name_index[bone.parent_name]
+                    bone.parent_id = idx
+                    parent_found = True
+                    print(
+                        f"[BNC] {bone.bone_name} 的父级是 {bone.parent_name} (名称匹配 ID: {idx})"
+                    )
 
                 if not parent_found:
                     # 父骨骼未找到
@@ -208,6 +211,16 @@ def read_bnc(filepath: str) -> Tuple[List[LXBone], int, int]:
     return reader.read_bnc()
 
 
+def bone_arrays(bones: List[LXBone]):
+    """把骨骼列表转换为数组: (pivots (n,3), quats (n,4) w x y z, parents (n,))"""
+    import numpy as np
+
+    pivots = np.array([b.vpos for b in bones], dtype=np.float64).reshape(-1, 3)
+    quats = np.array([b.vrot for b in bones], dtype=np.float64).reshape(-1, 4)
+    parents = np.array([b.parent_id for b in bones], dtype=np.int64)
+    return pivots, quats, parents
+
+
 class SKCReader:
     def __init__(self, filepath: str):
         self.filepath = filepath
@@ -255,6 +268,9 @@ class SKCReader:
 
                     i += 1
 
+                    skin_counts = []
+                    skin_ids = []
+                    skin_weights = []
                     for v in range(num_vert):
                         if i >= len(lines):
                             break
@@ -268,45 +284,47 @@ class SKCReader:
                                     x = float(parts_vtx[1])
                                     y = float(parts_vtx[2])
                                     z = float(parts_vtx[3])
-                                    obj.verts.append([x, y, z])
-                                    obj.uvs.append(
-                                        [float(parts_vtx[5]), float(parts_vtx[6]), 0]
-                                    )
+                                    uv = [float(parts_vtx[5]), float(parts_vtx[6]), 0]
 
-                                    # 解析骨骼权重
+                                    # 解析骨骼权重，直接追加到CSR的展平数组
                                     # 格式: v x y z vt u v Bones N bone_id weight ...
+                                    vert_ids = []
+                                    vert_weights = []
                                     if "Bones" in parts_vtx:
                                         bones_idx = parts_vtx.index("Bones")
                                         if bones_idx + 1 < len(parts_vtx):
-                                            bone_count = int(parts_vtx[bones_idx + 1])
-                                            obj.bone_v_count.append(bone_count)
-
-                                            vert_bone_ids = []
-                                            vert_weights = []
-
-                                            for b in range(bone_count):
-                                                idx = bones_idx + 2 + b * 2
-                                                if idx + 1 < len(parts_vtx):
-                                                    bone_id = int(parts_vtx[idx])
-                                                    weight = float(parts_vtx[idx + 1])
-                                                    vert_bone_ids.append(bone_id)
-                                                    vert_weights.append(weight)
-
-                                            obj.bone_ids.append(vert_bone_ids)
-                                            obj.weight_array.append(vert_weights)
-                                        else:
-                                            obj.bone_v_count.append(0)
-                                            obj.bone_ids.append([])
-                                            obj.weight_array.append([])
-                                    else:
-                                        obj.bone_v_count.append(0)
-                                        obj.bone_ids.append([])
-                                        obj.weight_array.append([])
+                                            pairs = parts_vtx[bones_idx + 2 :]
+                                            count = min(
+                                                int(parts_vtx[bones_idx + 1]),
+                                                len(pairs) // 2,
+                                            )
+                                            vert_ids = [
+                                                int(b) for b in pairs[0 : 2 * count : 2]
+                                            ]
+                                            vert_weights = [
+                                                float(w)
+                                                for w in pairs[1 : 2 * count : 2]
+                                            ]
+
+                                    obj.verts.append([x, y, z])
+                                    obj.uvs.append(uv)
+                                    skin_counts.append(len(vert_ids))
+                                    skin_ids.extend(vert_ids)
+                                    skin_weights.extend(vert_weights)
                                 except:
                                     pass
 
                         i += 1
 
+                    if any(skin_counts):
+                        import numpy as np
+
+                        obj.skin = SkinWeights.from_counts(
+                            skin_counts,
+                            np.array(skin_ids, dtype=np.int64),
+                            np.array(skin_weights, dtype=np.float64),
+                        )
+
                     while i < len(lines):
                         line_f = lines[i].strip()
 
@@ -346,138 +364,117 @@ class GMCReader:
         self.materials = []
         self.textures = []
 
-    def read_gmc(self):
-        try:
-            with open(self.filepath, "r", encoding="utf-8") as f:
-                content = f.read()
-        except:
-            with open(self.filepath, "r", encoding="gbk") as f:
-                content = f.read()
-
-        lines = content.split("\n")
-        i = 0
+    @staticmethod
+    def _lines(f) -> Iterator[str]:
+        """逐行解码（UTF-8，失败时按GBK），不把整个文件读入内存"""
+        for raw in f:
+            try:
+                yield raw.decode("utf-8").strip()
+            except UnicodeDecodeError:
+                yield raw.decode("gbk", errors="ignore").strip()
+
+    @staticmethod
+    def _read_shader(lines) -> dict:
+        shader = {}
+        for line in lines:
+            if line == "}":
+                break
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == "Texture":
+                shader["tex_id"] = int(parts[1])
+                shader["tex_type"] = parts[2] if len(parts) > 2 else "NORMAL"
+            elif parts[0] == "TwoSide":
+                shader["twoside"] = parts[1] if len(parts) > 1 else "0"
+            elif parts[0] == "Blend":
+                shader["blend"] = " ".join(parts[1:])
+            elif parts[0] == "Opaque":
+                shader["opaque"] = float(parts[1]) if len(parts) > 1 else 1.0
+        return shader
+
+    @staticmethod
+    def _read_object(lines, name: str) -> LXObject:
+        """读取 Object 行之后到对应 "}" 为止的顶点和面"""
+        from itertools import islice
+
+        obj = LXObject()
+        obj.skin_name = name
+        for line in lines:
+            if line == "}":
+                break
+            parts = line.split()
+            if not parts or not parts[0].startswith("Vertices"):
+                continue
+            try:
+                num_vert = int(parts[1])
+                num_face = int(parts[3])
+            except (IndexError, ValueError):
+                continue
 
-        while i < len(lines):
-            line = lines[i].strip()
+            for line_v in islice(lines, num_vert):
+                parts_data = line_v.split()
+                if len(parts_data) >= 17:
+                    try:
+                        x, y, z = map(float, parts_data[1:4])
+                        u = float(parts_data[14])
+                        v = float(parts_data[15])
+                    except ValueError:
+                        continue
+                    obj.verts.append([x, y, z])
+                    obj.uvs.append([u, v, 0, 0])
 
-            if not line:
-                i += 1
-                continue
+            for line_f in islice(lines, num_face):
+                parts_f = line_f.split()
+                if len(parts_f) >= 8:
+                    try:
+                        mat_id, v1, v2, v3 = map(int, parts_f[1:5])
+                    except ValueError:
+                        continue
+                    obj.face_mat.append(mat_id)
+                    obj.faces.append([v1, v2, v3])
+        return obj
+
+    def iter_gmc(self) -> Iterator[LXObject]:
+        """逐个读取对象；纹理和材质在产生第一个对象前已读入 self.textures/self.materials
+
+        对象以 "Object 名称" 行识别，不依赖 SceneObjects 中的数量和对象间的行数。
+        """
+        with open(self.filepath, "rb") as f:
+            lines = self._lines(f)
+            in_scene = False
+            for line in lines:
+                parts = line.split()
+                if not parts:
+                    continue
 
-            if line.startswith("Textures"):
-                try:
-                    num_tex = int(line.split()[1])
-                    i += 1
+                if parts[0].startswith("Textures"):
+                    try:
+                        num_tex = int(parts[1])
+                    except (IndexError, ValueError):
+                        continue
                     for _ in range(num_tex):
-                        if i < len(lines):
-                            self.textures.append(lines[i].strip())
-                            i += 1
-                except:
-                    i += 1
-                continue
+                        self.textures.append(next(lines, ""))
 
-            if line.startswith("Shaders"):
-                try:
-                    num_shaders = int(line.split()[1])
-                    i += 1
+                elif parts[0].startswith("Shaders"):
+                    try:
+                        num_shaders = int(parts[1])
+                    except (IndexError, ValueError):
+                        continue
                     for _ in range(num_shaders):
-                        shader = {}
-                        while i < len(lines) and lines[i].strip() != "}":
-                            parts = lines[i].strip().split()
-                            if parts:
-                                if parts[0] == "Texture":
-                                    shader["tex_id"] = int(parts[1])
-                                    shader["tex_type"] = (
-                                        parts[2] if len(parts) > 2 else "NORMAL"
-                                    )
-                                elif parts[0] == "TwoSide":
-                                    shader["twoside"] = (
-                                        parts[1] if len(parts) > 1 else "0"
-                                    )
-                                elif parts[0] == "Blend":
-                                    shader["blend"] = " ".join(parts[1:])
-                                elif parts[0] == "Opaque":
-                                    shader["opaque"] = (
-                                        float(parts[1]) if len(parts) > 1 else 1.0
-                                    )
-                            i += 1
-                        self.materials.append(shader)
-                        i += 1
-                except:
-                    i += 1
-                continue
+                        try:
+                            self.materials.append(self._read_shader(lines))
+                        except (IndexError, ValueError):
+                            self.materials.append({})
 
-            if line.startswith("SceneObjects"):
-                try:
-                    parts = line.split()
-                    if len(parts) >= 2:
-                        num_objects = int(parts[1])
-                        i += 1
-                        for _ in range(num_objects):
-                            if i < len(lines) and lines[i].strip().startswith("Object"):
-                                obj_name = lines[i].strip().split()[1]
-                                i += 1
-                                obj = LXObject()
-                                obj.skin_name = obj_name
-
-                                while i < len(lines) and lines[i].strip() != "}":
-                                    line_inner = lines[i].strip()
-                                    parts_inner = line_inner.split()
-
-                                    if parts_inner and parts_inner[0].startswith(
-                                        "Vertices"
-                                    ):
-                                        try:
-                                            parts_v = line_inner.split()
-                                            num_vert = int(parts_v[1])
-                                            num_face = int(parts_v[3])
-                                            i += 1
-
-                                            for _ in range(num_vert):
-                                                if i < len(lines):
-                                                    parts_data = lines[i].split()
-                                                    if len(parts_data) >= 17:
-                                                        try:
-                                                            x = float(parts_data[1])
-                                                            y = float(parts_data[2])
-                                                            z = float(parts_data[3])
-                                                            u = float(parts_data[14])
-                                                            v = float(parts_data[15])
-                                                            obj.verts.append([x, y, z])
-                                                            obj.uvs.append([u, v, 0, 0])
-                                                        except:
-                                                            pass
-                                                    i += 1
-
-                                            for _ in range(num_face):
-                                                if i < len(lines):
-                                                    parts_f = lines[i].split()
-                                                    if len(parts_f) >= 8:
-                                                        try:
-                                                            mat_id = int(parts_f[1])
-                                                            v1 = int(parts_f[2])
-                                                            v2 = int(parts_f[3])
-                                                            v3 = int(parts_f[4])
-                                                            obj.face_mat.append(mat_id)
-                                                            obj.faces.append(
-                                                                [v1, v2, v3]
-                                                            )
-                                                        except:
-                                                            pass
-                                                    i += 1
-                                        except:
-                                            i += 1
-                                    else:
-                                        i += 1
-
-                                self.objects.append(obj)
-                            else:
-                                i += 1
-                except:
-                    i += 1
-            else:
-                i += 1
+                elif parts[0].startswith("SceneObjects"):
+                    in_scene = True
+
+                elif in_scene and parts[0] == "Object" and len(parts) >= 2:
+                    yield self._read_object(lines, parts[1])
 
+    def read_gmc(self):
+        self.objects.extend(self.iter_gmc())
         return self.objects, self.materials, self.textures
 
 
@@ -488,105 +485,124 @@ class GMBReader:
         self.materials = []
         self.textures = []
 
-    def read_gmb(self):
+    @staticmethod
+    def _read_string(f, max_len=256):
+        """读取字符串，尝试多种编码"""
         import struct
 
-        def read_string(f, max_len=256):
-            """读取字符串，尝试多种编码"""
-            try:
-                data = f.read(4)
-                if len(data) < 4:
-                    return None
-                str_len = struct.unpack("<I", data)[0]
-                if str_len == 0:
-                    return ""
-                if str_len > max_len:
-                    return None
-                data = f.read(str_len)
-                if len(data) < str_len:
-                    return None
-                for encoding in ["utf-8", "gbk", "latin1", "cp1252"]:
-                    try:
-                        return data.decode(encoding).strip("\x00")
-                    except:
-                        continue
-                return data.decode("utf-8", errors="ignore").strip("\x00")
-            except:
+        try:
+            data = f.read(4)
+            if len(data) < 4:
+                return None
+            str_len = struct.unpack("<I", data)[0]
+            if str_len == 0:
+                return ""
+            if str_len > max_len:
+                return None
+            data = f.read(str_len)
+            if len(data) < str_len:
                 return None
+            for encoding in ["utf-8", "gbk", "latin1", "cp1252"]:
+                try:
+                    return data.decode(encoding).strip("\x00")
+                except:
+                    continue
+            return data.decode("utf-8", errors="ignore").strip("\x00")
+        except:
+            return None
+
+    def read_header(self, f) -> int:
+        """读取文件头、纹理和材质，返回对象数量"""
+        import struct
+
+        # 读取文件头
+        header = f.read(10)
+        if header[:4] != b"GMDL":
+            raise ValueError("不是有效的GMB文件")
+
+        # 读取纹理
+        tex_num = struct.unpack("<I", f.read(4))[0]
+        for _ in range(tex_num):
+            tex_name = self._read_string(f)
+            if tex_name:
+                self.textures.append(tex_name)
+
+        # 读取材质
+        shader_num = struct.unpack("<I", f.read(4))[0]
+        for _ in range(shader_num):
+            shader = {}
+            shader["tex_id"] = struct.unpack("<I", f.read(4))[0]
+            shader["tex_type"] = self._read_string(f)
+            shader["twoside"] = f.read(1)[0]
+            shader["blend"] = self._read_string(f)
+            shader["opaque"] = struct.unpack("<f", f.read(4))[0]
+            self.materials.append(shader)
+
+        # 读取对象数量
+        obj_num = struct.unpack("<I", f.read(4))[0]
+        # 跳过辅助数据
+        f.read(4)  # dummy_num
+        f.read(4)  # total_verts
+        f.read(4)  # total_faces
+        return obj_num
+
+    def read_object(self, f, obj_idx: int = 0) -> LXObject:
+        """从当前位置读取一个对象，顶点和面数据整块解码"""
+        import struct
+        import numpy as np
+        from ..formats import GMB_FACE_DTYPE, GMB_VERTEX_DTYPE
+
+        obj = LXObject()
+        obj.skin_name = self._read_string(f) or f"Object_{obj_idx}"
+
+        # 读取顶点和面数量
+        vert_num, face_num = struct.unpack("<2I", f.read(8))
+
+        # 顶点 (36字节每个): 位置 + 法线 + 颜色 + UV
+        vdata = np.frombuffer(
+            f.read(vert_num * GMB_VERTEX_DTYPE.itemsize),
+            dtype=GMB_VERTEX_DTYPE,
+            count=vert_num,
+        )
+        # 面 (28字节每个): 材质ID(long) + 3个顶点索引(long) + 3个法线float
+        fdata = np.frombuffer(
+            f.read(face_num * GMB_FACE_DTYPE.itemsize),
+            dtype=GMB_FACE_DTYPE,
+            count=face_num,
+        )
+
+        uvs = np.zeros((vert_num, 3), dtype=np.float64)
+        uvs[:, :2] = vdata["uv"]
+        obj.verts = vdata["pos"].tolist()
+        obj.uvs = uvs.tolist()
+        obj.face_mat = fdata["mat"].tolist()
+        obj.faces = fdata["idx"].tolist()
+        return obj
+
+    def skip_object(self, f):
+        """跳过当前位置的对象，返回 (名称, 顶点数, 面数)"""
+        import struct
+        from ..formats import GMB_FACE_DTYPE, GMB_VERTEX_DTYPE
+
+        name = self._read_string(f)
+        vert_num, face_num = struct.unpack("<2I", f.read(8))
+        f.seek(
+            vert_num * GMB_VERTEX_DTYPE.itemsize + face_num * GMB_FACE_DTYPE.itemsize,
+            1,
+        )
+        return name, vert_num, face_num
+
+    def iter_gmb(self) -> Iterator[LXObject]:
+        """逐个读取对象；纹理和材质在产生第一个对象前已读入 self.textures/self.materials"""
+        with open(self.filepath, "rb") as f:
+            obj_num = self.read_header(f)
+            for obj_idx in range(obj_num):
+                yield self.read_object(f, obj_idx)
 
+    def read_gmb(self):
         try:
-            with open(self.filepath, "rb") as f:
-                # 读取文件头
-                header = f.read(10)
-                if header[:4] != b"GMDL":
-                    raise ValueError("不是有效的GMB文件")
-
-                # 读取纹理
-                tex_num = struct.unpack("<I", f.read(4))[0]
-                for _ in range(tex_num):
-                    tex_name = read_string(f)
-                    if tex_name:
-                        self.textures.append(tex_name)
-
-                # 读取材质
-                shader_num = struct.unpack("<I", f.read(4))[0]
-                for _ in range(shader_num):
-                    shader = {}
-                    shader["tex_id"] = struct.unpack("<I", f.read(4))[0]
-                    shader["tex_type"] = read_string(f)
-                    shader["twoside"] = f.read(1)[0]
-                    shader["blend"] = read_string(f)
-                    shader["opaque"] = struct.unpack("<f", f.read(4))[0]
-                    self.materials.append(shader)
-
-                # 读取对象数量
-                obj_num = struct.unpack("<I", f.read(4))[0]
-                # 跳过辅助数据
-                f.read(4)  # dummy_num
-                f.read(4)  # total_verts
-                f.read(4)  # total_faces
-
-                for obj_idx in range(obj_num):
-                    obj = LXObject()
-                    obj.skin_name = read_string(f) or f"Object_{obj_idx}"
-
-                    # 读取顶点和面数量
-                    vert_num = struct.unpack("<I", f.read(4))[0]
-                    face_num = struct.unpack("<I", f.read(4))[0]
-
-                    # 读取顶点 (36字节每个)
-                    for _ in range(vert_num):
-                        # 位置 (12字节)
-                        vx = struct.unpack("<f", f.read(4))[0]
-                        vy = struct.unpack("<f", f.read(4))[0]
-                        vz = struct.unpack("<f", f.read(4))[0]
-                        # 法线 (12字节)
-                        f.read(12)
-                        # 颜色 (4字节)
-                        f.read(4)
-                        # UV (8字节)
-                        tu = struct.unpack("<f", f.read(4))[0]
-                        tv = struct.unpack("<f", f.read(4))[0]
-
-                        obj.verts.append([vx, vy, vz])
-                        obj.uvs.append([tu, tv, 0])
-
-                    # 读取面 (28字节每个)
-                    # 格式: 材质ID(long) + 3个顶点索引(long) + 3个法线float
-                    for _ in range(face_num):
-                        mat_id = struct.unpack("<I", f.read(4))[0]
-                        v1 = struct.unpack("<I", f.read(4))[0]
-                        v2 = struct.unpack("<I", f.read(4))[0]
-                        v3 = struct.unpack("<I", f.read(4))[0]
-                        # 跳过面法线 (12字节)
-                        f.read(12)
-
-                        obj.face_mat.append(mat_id)
-                        obj.faces.append([v1, v2, v3])
-
-                    self.objects.append(obj)
-
-                return self.objects, self.materials, self.textures
+            self.objects.extend(self.iter_gmb())
+            return self.objects, self.materials, self.textures
         except Exception as e:
             import traceback
 
@@ -595,6 +611,9 @@ class GMBReader:
 
 
 class AMBReader:
+    # "BANIM" + 骨骼数 + 虚拟体数 + 帧数
+    HEADER_SIZE = 17
+
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.bones = 30
@@ -602,6 +621,16 @@ class AMBReader:
         self.frames = 0
         self.animations = []
 
+    def read_header(self, f) -> Tuple[int, int, int]:
+        """只读取文件头，返回 (骨骼数, 虚拟体数, 帧数)"""
+        import struct
+
+        header = f.read(self.HEADER_SIZE)
+        if len(header) < self.HEADER_SIZE or header[:5] != b"BANIM":
+            raise ValueError("不是有效的AMB文件")
+        self.bones, self.dummies, self.frames = struct.unpack_from("<3I", header, 5)
+        return self.bones, self.dummies, self.frames
+
     def read_amb(self):
         import struct
 
@@ -648,3 +677,181 @@ class AMBReader:
                 return self.animations, self.bones, self.dummies
         except Exception as e:
             raise Exception(f"读取AMB文件失败: {e}")
+
+    def read_arrays(self):
+        """一次性读取整个AMB文件为数组
+
+        返回 (rotations (帧数, 节点数, 4) w x y z, root_positions (帧数, 3))
+        """
+        rotations, root_positions, _ = self.read_frames()
+        return rotations, root_positions
+
+    def read_frames(self, start: int = 0, stop: int = None, step: int = 1):
+        """只解码 range(帧数)[start:stop:step] 中的帧
+
+        每帧记录定长，按偏移直接定位：连续范围一次读取，间隔采样逐帧seek，
+        耗时只与请求的帧数成正比。
+        返回 (rotations (n, 节点数, 4), root_positions (n, 3), 帧号 (n,))
+        """
+        import numpy as np
+
+        with open(self.filepath, "rb") as f:
+            self.read_header(f)
+            node_num = self.bones + self.dummies
+            # 每帧: 根节点位置(3f) + 每个节点的旋转(4f)
+            stride = 3 + node_num * 4
+            record_size = stride * 4
+            f.seek(0, os.SEEK_END)
+            available = (f.tell() - self.HEADER_SIZE) // record_size
+            if available < self.frames:
+                print(f"[LX] AMB文件不完整: 头部 {self.frames} 帧, 实际 {available} 帧")
+                self.frames = available
+
+            frames = range(self.frames)[start:stop:step]
+            records = np.empty((len(frames), stride), dtype="<f4")
+            if len(frames) and frames.step == 1:
+                f.seek(self.HEADER_SIZE + frames.start * record_size)
+                f.readinto(records)
+            else:
+                for row, frame in zip(records, frames):
+                    f.seek(self.HEADER_SIZE + frame * record_size)
+                    f.readinto(row)
+
+        rotations = records[:, 3:].reshape(-1, node_num, 4).astype(np.float64)
+        root_positions = records[:, :3].astype(np.float64)
+        return rotations, root_positions, np.asarray(frames, dtype=np.int64)
+
+
+class LXPlacement:
+    """DES场景文件中的一个对象摆放"""
+
+    def __init__(self):
+        self.name = ""
+        self.pos = [0.0, 0.0, 0.0]
+        self.rot = [1.0, 0.0, 0.0, 0.0]  # 四元数 (w, x, y, z)
+        self.texture_animation = ""
+        self.custom = []  # Custom 块中的原始行
+
+
+class DESReader:
+    """DES场景文件读取器"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.placements: List[LXPlacement] = []
+
+    def read_des(self) -> List[LXPlacement]:
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except UnicodeDecodeError:
+            with open(self.filepath, "r", encoding="gbk") as f:
+                lines = f.readlines()
+
+        current = None
+        in_custom = False
+        for line in lines:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+
+            if line.startswith("Object "):
+                current = LXPlacement()
+                current.name = line.split(None, 1)[1]
+                self.placements.append(current)
+                in_custom = False
+                continue
+            if current is None:
+                continue
+
+            if in_custom:
+                if line == "}":
+                    in_custom = False
+                elif line != "{":
+                    current.custom.append(line)
+                continue
+
+            parts = line.split()
+            if parts[0] == "Position:" and len(parts) >= 4:
+                current.pos = [float(v) for v in parts[1:4]]
+            elif parts[0] == "Quaternion:" and len(parts) >= 5:
+                current.rot = [float(v) for v in parts[1:5]]
+            elif parts[0] == "TextureAnimation:":
+                current.texture_animation = " ".join(parts[1:])
+            elif parts[0] == "Custom:":
+                in_custom = True
+            elif line == "}":
+                current = None
+
+        print(f"[LX] DES读取完成: {len(self.placements)} 个对象")
+        return self.placements
+
+
+class FMCReader:
+    """FMC道具动画读取器"""
+
+    def __init__(self, filepath: str):
+        self.filepath = filepath
+        self.object_num = 0
+        self.frames = 0
+        self.fps = 60.0
+
+    def read_fmc(self):
+        """读取全部帧，返回 (帧数, 对象数, 7) 数组: 位置 x y z + 四元数 w x y z
+
+        文件中的 "t x y z q w x y z" 行一次性交给 np.loadtxt 解析。
+        """
+        import numpy as np
+
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except UnicodeDecodeError:
+            with open(self.filepath, "r", encoding="gbk") as f:
+                lines = f.read().splitlines()
+
+        samples = []
+        for line in lines:
+            line = line.strip()
+            if line.startswith("t "):
+                samples.append(line)
+            elif line.startswith("SceneObjects"):
+                self.object_num = int(line.split()[1])
+            elif line.startswith("FPS"):
+                parts = line.split()
+                self.fps = float(parts[1])
+                if len(parts) >= 4 and parts[2] == "Frames":
+                    self.frames = int(parts[3])
+
+        if self.object_num <= 0:
+            raise ValueError("FMC文件缺少SceneObjects")
+
+        data = np.loadtxt(
+            samples, dtype=np.float32, usecols=(1, 2, 3, 5, 6, 7, 8), ndmin=2
+        )
+        frames = len(data) // self.object_num
+        if frames != self.frames:
+            print(f"[LX] FMC文件头 {self.frames} 帧, 实际读取 {frames} 帧")
+            self.frames = frames
+        return data[: frames * self.object_num].reshape(frames, self.object_num, 7)
+
+
+def amb_to_skin(rotations, root_positions, rest_local, parents):
+    """把AMB数据转换为逐帧蒙皮矩阵，是 export_utils.pose_to_amb 的逆运算
+
+    rotations: (帧数, 节点数, 4)，root_positions: (帧数, 3)
+    rest_local: (节点数, 4, 4) BNC静止姿态的局部矩阵，parents: BNC父节点索引
+    返回 (帧数, 节点数, 4, 4) 的 world @ inv(rest_world)
+    """
+    import numpy as np
+    from .. import math_utils
+
+    # 非根节点的位移使用BNC中的pivot，根节点使用AMB中的位移
+    positions = np.broadcast_to(
+        rest_local[:, :3, 3], rotations.shape[:-1] + (3,)
+    ).copy()
+    positions[:, 0] = root_positions
+    local = math_utils.compose_matrix(positions, rotations)
+    world = math_utils.accumulate_world(local, parents)
+    rest_world = math_utils.accumulate_world(rest_local, parents)
+    return world @ math_utils.invert_rigid(rest_world)
@@ -0,0 +1,220 @@
+"""资源目录索引
+
+把资源目录中每个文件的探测结果（见 probe.py）保存到本地SQLite数据库。
+再次扫描时只探测大小或修改时间变化的文件，并删除已不存在的文件记录。
+查询使用简单的过滤表达式，例如 "amb frames>300" 或 "gmb verts>=50000 path~scene"。
+"""
+
+import json
+import os
+import re
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Tuple
+
+from .probe import PROBES, probe
+
+# 可用于过滤和排序的数值列
+NUMERIC_FIELDS = (
+    "size",
+    "objects",
+    "verts",
+    "faces",
+    "textures",
+    "materials",
+    "bones",
+    "dummies",
+    "frames",
+)
+TEXT_FIELDS = ("format", "path", "error")
+
+_TERM = re.compile(r"^(\w+)(>=|<=|!=|=|>|<|~)(.+)$")
+
+
+def parse_filter(text: str) -> Tuple[str, List]:
+    """把过滤表达式转换为 (WHERE子句, 参数)
+
+    空格分隔的条件之间为“与”关系；单独的格式名（如 amb）等价于 format=amb；
+    ~ 表示包含（不区分大小写）。
+    """
+    clauses = []
+    params = []
+    for term in text.split():
+        if term.lower().lstrip(".") in {ext[1:] for ext in PROBES}:
+            clauses.append("format = ?")
+            params.append(term.lower().lstrip("."))
+            continue
+        match = _TERM.match(term)
+        if not match:
+            raise ValueError(f"无法解析过滤条件: {term}")
+        field, op, value = match.groups()
+        field = field.lower()
+        if field in NUMERIC_FIELDS:
+            if op == "~":
+                raise ValueError(f"数值字段不支持 ~: {term}")
+            clauses.append(f"{field} {op} ?")
+            params.append(float(value))
+        elif field in TEXT_FIELDS:
+            if op == "~":
+                clauses.append(f"instr(lower({field}), ?) > 0")
+                params.append(value.lower())
+            elif op in ("=", "!="):
+                clauses.append(f"{field} {op} ?")
+                params.append(value.lower() if field == "format" else value)
+            else:
+                raise ValueError(f"文本字段只支持 =、!=、~: {term}")
+        else:
+            raise ValueError(f"未知字段: {field}")
+    return " AND ".join(clauses) or "1", params
+
+
+def summarize(row: Dict) -> str:
+    """一行资源信息的简短描述"""
+    if row.get("error"):
+        return f"错误: {row['error']}"
+    parts = []
+    if row.get("bones") is not None:
+        parts.append(f"{row['bones']}+{row['dummies']} 节点")
+    if row.get("objects") is not None:
+        parts.append(f"{row['objects']} 对象")
+    if row.get("verts") is not None:
+        parts.append(f"{row['verts']} 顶点")
+    if row.get("faces") is not None:
+        parts.append(f"{row['faces']} 面")
+    if row.get("textures"):
+        parts.append(f"{row['textures']} 纹理")
+    if row.get("frames") is not None:
+        parts.append(f"{row['frames']} 帧")
+    return ", ".join(parts)
+
+
+class AssetCatalog:
+    VERSION = 1
+    FILENAME = ".lxcatalog"
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.conn.row_factory = sqlite3.Row
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] != self.VERSION:
+            self.conn.execute("DROP TABLE IF EXISTS assets")
+        columns = ", ".join(f"{name} INTEGER" for name in NUMERIC_FIELDS[1:])
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS assets ("
+                "path TEXT PRIMARY KEY, format TEXT, size INTEGER, mtime REAL, "
+                f"{columns}, info TEXT, error TEXT)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS assets_format ON assets(format)"
+            )
+            self.conn.execute(f"PRAGMA user_version = {self.VERSION}")
+
+    @classmethod
+    def for_root(cls, root: str, db_path: str = "") -> "AssetCatalog":
+        """打开资源目录的数据库，默认保存在目录下的 .lxcatalog"""
+        return cls(db_path or os.path.join(root, cls.FILENAME))
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    @staticmethod
+    def _probe_row(task) -> Tuple:
+        path, size, mtime = task
+        fmt = os.path.splitext(path)[1].lower()[1:]
+        try:
+            info = probe(path)
+            error = None
+        except Exception as e:
+            info = {}
+            error = str(e) or type(e).__name__
+        values = [info.pop(name, None) for name in NUMERIC_FIELDS[1:]]
+        return (
+            path,
+            fmt,
+            size,
+            mtime,
+            *values,
+            json.dumps(info, ensure_ascii=False),
+            error,
+        )
+
+    def scan(self, root: str, workers: int = 1) -> Dict[str, int]:
+        """扫描目录，只探测新增或变化的文件
+
+        返回 {"added", "updated", "unchanged", "removed"} 计数。
+        """
+        root = os.path.abspath(root)
+        prefix = os.path.join(root, "")
+        known = {
+            row["path"]: (row["size"], row["mtime"])
+            for row in self.conn.execute(
+                "SELECT path, size, mtime FROM assets WHERE substr(path, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+        }
+
+        seen = set()
+        tasks = []
+        for folder, _, names in os.walk(root):
+            for name in names:
+                if os.path.splitext(name)[1].lower() not in PROBES:
+                    continue
+                path = os.path.join(folder, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                seen.add(path)
+                if known.get(path) != (stat.st_size, stat.st_mtime):
+                    tasks.append((path, stat.st_size, stat.st_mtime))
+
+        if workers > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                rows = list(pool.map(self._probe_row, tasks))
+        else:
+            rows = [self._probe_row(task) for task in tasks]
+
+        removed = [path for path in known if path not in seen]
+        placeholders = ", ".join("?" * (len(NUMERIC_FIELDS) + 5))
+        with self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO assets VALUES ({placeholders})", rows
+            )
+            self.conn.executemany(
+                "DELETE FROM assets WHERE path = ?", [(path,) for path in removed]
+            )
+
+        added = sum(1 for task in tasks if task[0] not in known)
+        return {
+            "added": added,
+            "updated": len(tasks) - added,
+            "unchanged": len(seen) - len(tasks),
+            "removed": len(removed),
+        }
+
+    def query(
+        self, text: str = "", order: str = "path", limit: int = None
+    ) -> List[Dict]:
+        """按过滤表达式查询，order 为字段名，前缀 - 表示降序"""
+        where, params = parse_filter(text)
+        field = order.lstrip("-").lower()
+        if field not in NUMERIC_FIELDS + TEXT_FIELDS:
+            raise ValueError(f"未知排序字段: {order}")
+        sql = f"SELECT * FROM assets WHERE {where} ORDER BY {field}"
+        if order.startswith("-"):
+            sql += " DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = []
+        for row in self.conn.execute(sql, params):
+            row = dict(row)
+            row["info"] = json.loads(row["info"] or "{}")
+            rows.append(row)
+        return rows
@@ -0,0 +1,114 @@
+"""关键帧精简
+
+逐帧采样的动画曲线中，大部分关键帧都可以由相邻关键帧插值得到。
+reduce_keyframes 只保留插值误差超过容差所必需的关键帧。
+"""
+
+from typing import Callable, Tuple
+
+import numpy as np
+
+from .. import math_utils
+
+
+def _hermite_slopes(times, values):
+    """近似Blender自动钳制(AUTO_CLAMPED)控制柄的斜率
+
+    中间关键帧使用相邻两帧的中心差分，首尾帧和局部极值处斜率为0。
+    """
+    slopes = np.zeros_like(values)
+    if len(times) > 2:
+        dt = (times[2:] - times[:-2])[:, None]
+        slopes[1:-1] = (values[2:] - values[:-2]) / dt
+        prev_delta = values[1:-1] - values[:-2]
+        next_delta = values[2:] - values[1:-1]
+        extremum = prev_delta * next_delta <= 0.0
+        slopes[1:-1][extremum] = 0.0
+    return slopes
+
+
+def interpolate_keys(keys, key_values, frame_num: int, mode: str = "LINEAR"):
+    """由关键帧（帧索引 keys, 值 (k, c)）重建全部 frame_num 帧的曲线值"""
+    frames = np.arange(frame_num, dtype=np.float64)
+    keys = np.asarray(keys, dtype=np.float64)
+    key_values = np.asarray(key_values, dtype=np.float64)
+    if len(keys) == 1:
+        return np.repeat(key_values, frame_num, axis=0)
+
+    if mode == "LINEAR":
+        return np.stack(
+            [
+                np.interp(frames, keys, key_values[:, c])
+                for c in range(key_values.shape[1])
+            ],
+            axis=-1,
+        )
+
+    # BEZIER: 按三次Hermite曲线估算（控制柄长度取区间的1/3）
+    seg = np.clip(np.searchsorted(keys, frames, side="right") - 1, 0, len(keys) - 2)
+    t0 = keys[seg]
+    dt = keys[seg + 1] - t0
+    s = ((frames - t0) / dt)[:, None]
+    slopes = _hermite_slopes(keys, key_values)
+    p0 = key_values[seg]
+    p1 = key_values[seg + 1]
+    m0 = slopes[seg] * dt[:, None]
+    m1 = slopes[seg + 1] * dt[:, None]
+    s2 = s * s
+    s3 = s2 * s
+    return (
+        (2 * s3 - 3 * s2 + 1) * p0
+        + (s3 - 2 * s2 + s) * m0
+        + (-2 * s3 + 3 * s2) * p1
+        + (s3 - s2) * m1
+    )
+
+
+def vector_error(predicted, values):
+    """逐帧欧氏距离误差"""
+    return np.linalg.norm(predicted - values, axis=-1)
+
+
+def quaternion_angle_error(predicted, values):
+    """逐帧旋转角误差（度），预测值先归一化"""
+    return np.degrees(math_utils.quat_angle(predicted, values))
+
+
+def reduce_keyframes(
+    values,
+    tolerance: float,
+    mode: str = "LINEAR",
+    error_fn: Callable = vector_error,
+) -> Tuple[np.ndarray, float]:
+    """精简一组通道共用的关键帧
+
+    values: (帧数, 通道数) 逐帧采样值，同一组通道（如一个四元数）共用关键帧。
+    从首尾两帧开始，每轮在所有误差超过容差的区间中同时加入误差最大的那一帧，
+    直到插值曲线在每一帧的误差都不超过 tolerance。
+    返回 (保留的帧索引, 最大误差)。
+    """
+    values = np.asarray(values, dtype=np.float64)
+    frame_num = len(values)
+    if frame_num <= 2:
+        return np.arange(frame_num), 0.0
+
+    keep = np.zeros(frame_num, dtype=bool)
+    keep[[0, -1]] = True
+    frames = np.arange(frame_num)
+
+    while True:
+        keys = np.flatnonzero(keep)
+        predicted = interpolate_keys(keys, values[keys], frame_num, mode)
+        error = error_fn(predicted, values)
+        error[keep] = 0.0
+        bad = error > tolerance
+        if not bad.any():
+            return keys, float(error.max())
+
+        # 每个区间只加入误差最大的一帧
+        segment = np.searchsorted(keys, frames, side="right") - 1
+        candidates = np.flatnonzero(bad)
+        order = candidates[np.lexsort((-error[candidates], segment[candidates]))]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = segment[order][1:] != segment[order][:-1]
+        keep[order[first]] = True
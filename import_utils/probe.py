@@ -0,0 +1,181 @@
+"""只读取文件头的格式探测
+
+每个探测函数返回一个字典，只包含计数类信息（对象、顶点、面、骨骼、帧数等），
+不解码顶点、面或帧数据：二进制格式按记录大小直接跳过，文本格式只识别
+计数行并用 islice 跳过后面的数据行。
+"""
+
+import os
+from itertools import islice
+from typing import Callable, Dict, List
+
+from . import AMBReader, GMBReader
+
+
+def _skip_lines(f, count: int):
+    for _ in islice(f, count):
+        pass
+
+
+def _count(parts: List[bytes], index: int) -> int:
+    try:
+        return int(parts[index])
+    except (IndexError, ValueError):
+        return 0
+
+
+def _name(data: bytes) -> str:
+    for encoding in ("utf-8", "gbk"):
+        try:
+            return data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+    return data.decode("utf-8", errors="ignore")
+
+
+def probe_gmb(path: str) -> Dict:
+    """读取纹理/材质表后逐个跳过对象块，只读取每个对象的名称和顶点/面数"""
+    reader = GMBReader(path)
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        obj_num = reader.read_header(f)
+        names = []
+        verts = faces = 0
+        for _ in range(obj_num):
+            name, vert_num, face_num = reader.skip_object(f)
+            names.append(name)
+            verts += vert_num
+            faces += face_num
+        if f.tell() > size:
+            raise ValueError("GMB文件不完整")
+    return {
+        "textures": len(reader.textures),
+        "materials": len(reader.materials),
+        "objects": obj_num,
+        "verts": verts,
+        "faces": faces,
+        "names": names,
+    }
+
+
+def probe_amb(path: str) -> Dict:
+    """AMB文件头，帧数按文件大小校正"""
+    reader = AMBReader(path)
+    with open(path, "rb") as f:
+        bones, dummies, frames = reader.read_header(f)
+    stride = (3 + (bones + dummies) * 4) * 4
+    available = (os.path.getsize(path) - AMBReader.HEADER_SIZE) // stride
+    return {"bones": bones, "dummies": dummies, "frames": min(frames, available)}
+
+
+def probe_skc(path: str) -> Dict:
+    info = {"objects": 0, "verts": 0, "faces": 0, "names": []}
+    counted_faces = 0
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(b"Static Skin "):
+                parts = line.split()
+                info["objects"] += 1
+                info["names"].append(_name(parts[2]) if len(parts) > 2 else "")
+            elif line.startswith(b"Vertices:"):
+                num = _count(line.split(), 1)
+                info["verts"] += num
+                _skip_lines(f, num)
+            elif line.startswith(b"Faces:"):
+                num = _count(line.split(), 1)
+                info["faces"] += num
+                _skip_lines(f, num)
+            elif line.startswith(b"f "):
+                # 没有 Faces: 计数行的文件只能逐行计数
+                counted_faces += 1
+    info["faces"] += counted_faces
+    return info
+
+
+def probe_gmc(path: str) -> Dict:
+    info = {
+        "textures": 0,
+        "materials": 0,
+        "objects": 0,
+        "verts": 0,
+        "faces": 0,
+        "names": [],
+    }
+    with open(path, "rb") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == b"Textures":
+                info["textures"] = _count(parts, 1)
+                _skip_lines(f, info["textures"])
+            elif parts[0] == b"Shaders":
+                info["materials"] = _count(parts, 1)
+            elif parts[0] == b"SceneObjects":
+                info["objects"] = _count(parts, 1)
+            elif parts[0] == b"Object" and len(parts) > 1:
+                info["names"].append(_name(parts[1]))
+            elif parts[0].startswith(b"Vertices"):
+                vert_num = _count(parts, 1)
+                face_num = _count(parts, 3)
+                info["verts"] += vert_num
+                info["faces"] += face_num
+                _skip_lines(f, vert_num + face_num)
+    return info
+
+
+def probe_bnc(path: str) -> Dict:
+    with open(path, "rb") as f:
+        for line in f:
+            if line.startswith(b"Bones:"):
+                parts = line.split()
+                return {"bones": _count(parts, 1), "dummies": _count(parts, 3)}
+    raise ValueError("BNC文件缺少 Bones: 行")
+
+
+def probe_fmc(path: str) -> Dict:
+    info = {"objects": 0, "frames": 0}
+    with open(path, "rb") as f:
+        for line in f:
+            parts = line.split()
+            if not parts:
+                continue
+            if parts[0] == b"SceneObjects":
+                info["objects"] = _count(parts, 1)
+            elif parts[0] == b"FPS":
+                info["fps"] = float(parts[1]) if len(parts) > 1 else 60.0
+                if len(parts) >= 4 and parts[2] == b"Frames":
+                    info["frames"] = _count(parts, 3)
+            elif parts[0] == b"frame":
+                break
+    return info
+
+
+def probe_des(path: str) -> Dict:
+    names = []
+    with open(path, "rb") as f:
+        for line in f:
+            line = line.strip()
+            if line.startswith(b"Object "):
+                names.append(_name(line.split(None, 1)[1]))
+    return {"objects": len(names), "names": names}
+
+
+PROBES: Dict[str, Callable[[str], Dict]] = {
+    ".gmb": probe_gmb,
+    ".gmc": probe_gmc,
+    ".skc": probe_skc,
+    ".bnc": probe_bnc,
+    ".amb": probe_amb,
+    ".fmc": probe_fmc,
+    ".des": probe_des,
+}
+
+
+def probe(path: str) -> Dict:
+    """按扩展名选择探测函数"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in PROBES:
+        raise ValueError(f"不支持的格式: {ext}")
+    return PROBES[ext](path)
@@ -0,0 +1,156 @@
+"""不依赖Blender的姿态计算与CPU蒙皮
+
+由BNC骨骼层级、SKC权重和AMB逐帧数据批量计算骨骼世界矩阵和
+线性混合蒙皮（LBS）后的顶点位置，用于在命令行中大批量检查动作与角色的组合。
+"""
+
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from . import LXBone, LXObject, bone_arrays
+from .. import math_utils
+
+
+class SkinningEngine:
+    """一个角色（BNC骨骼 + SKC蒙皮）的姿态计算器
+
+    SKC顶点位于绑定姿态的世界坐标中，蒙皮矩阵为 world @ inv(rest_world)。
+    没有权重或权重之和不足1的部分保持绑定姿态（相当于绑定到单位矩阵）。
+    """
+
+    # 每批处理的 帧数 x 顶点数 上限，控制中间数组的内存占用
+    BATCH_SIZE = 1 << 17
+
+    def __init__(self, bones: List[LXBone], obj: LXObject = None):
+        pivots, quats, self.parents = bone_arrays(bones)
+        self.node_num = len(bones)
+        self.rest_local = math_utils.compose_matrix(pivots, quats)
+        self.rest_world = math_utils.accumulate_world(self.rest_local, self.parents)
+        self.inv_rest_world = math_utils.invert_rigid(self.rest_world)
+
+        self.verts = np.zeros((0, 3))
+        self.bone_ids = np.zeros((0, 0), dtype=np.int64)
+        self.bone_weights = np.zeros((0, 0))
+        if obj is not None:
+            self.set_mesh(obj)
+
+    def set_mesh(self, obj: LXObject):
+        self.verts = np.asarray(obj.verts, dtype=np.float64).reshape(-1, 3)
+        skin = obj.skin
+        if skin is None:
+            self.bone_ids = np.full((len(self.verts), 0), -1, dtype=np.int64)
+            self.bone_weights = np.zeros((len(self.verts), 0))
+            return
+        width = int(skin.counts.max()) if skin.vert_num else 0
+        ids, weights = skin.to_padded(width)
+        # 越界的骨骼ID按无影响处理
+        invalid = (ids < 0) | (ids >= self.node_num)
+        self.bone_ids = np.where(invalid, 0, ids)
+        self.bone_weights = np.where(invalid, 0.0, weights)
+
+    def world_matrices(self, rotations, root_positions) -> np.ndarray:
+        """由AMB旋转 (帧数, 节点数, 4) 和根位移 (帧数, 3) 计算世界矩阵 (帧数, 节点数, 4, 4)"""
+        rotations = np.asarray(rotations, dtype=np.float64)
+        positions = np.broadcast_to(
+            self.rest_local[:, :3, 3], rotations.shape[:-1] + (3,)
+        ).copy()
+        positions[:, 0] = root_positions
+        local = math_utils.compose_matrix(positions, rotations)
+        return math_utils.accumulate_world(local, self.parents)
+
+    def skin_matrices(self, rotations, root_positions) -> np.ndarray:
+        return self.world_matrices(rotations, root_positions) @ self.inv_rest_world
+
+    def skin(self, skin_matrices) -> np.ndarray:
+        """对 (帧数, 节点数, 4, 4) 蒙皮矩阵做线性混合蒙皮，返回 (帧数, 顶点数, 3)"""
+        frame_num = len(skin_matrices)
+        vert_num = len(self.verts)
+        result = np.empty((frame_num, vert_num, 3))
+        step = max(1, self.BATCH_SIZE // max(vert_num, 1))
+        rest_weight = 1.0 - self.bone_weights.sum(axis=1)
+
+        for start in range(0, frame_num, step):
+            mats = skin_matrices[start : start + step, :, :3, :]
+            blended = np.zeros((len(mats), vert_num, 3, 4))
+            for k in range(self.bone_ids.shape[1]):
+                blended += (
+                    self.bone_weights[None, :, k, None, None]
+                    * mats[:, self.bone_ids[:, k]]
+                )
+            blended[..., :3] += rest_weight[None, :, None, None] * np.eye(3)
+            result[start : start + step] = (
+                np.einsum("fvij,vj->fvi", blended[..., :3], self.verts)
+                + blended[..., 3]
+            )
+        return result
+
+    def iter_frames(
+        self, rotations, root_positions, chunk: int = 64
+    ) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """按帧分块计算，依次产生 (起始帧, 世界矩阵, 蒙皮后顶点)"""
+        for start in range(0, len(rotations), chunk):
+            world = self.world_matrices(
+                rotations[start : start + chunk], root_positions[start : start + chunk]
+            )
+            yield start, world, self.skin(world @ self.inv_rest_world)
+
+
+def check_motion(
+    engine: SkinningEngine,
+    rotations,
+    root_positions,
+    stretch_limit: float = 3.0,
+) -> Dict:
+    """检查一段动作在角色上的表现
+
+    以绑定姿态包围盒对角线为尺度：根位移之外的顶点偏移超过 stretch_limit 倍
+    对角线的视为“爆炸”顶点。返回包含包围盒、最大偏移和问题帧的字典。
+    """
+    rotations = np.asarray(rotations, dtype=np.float64)
+    root_positions = np.asarray(root_positions, dtype=np.float64)
+    frame_num = len(rotations)
+    bind = engine.verts
+    diagonal = (
+        float(np.linalg.norm(bind.max(axis=0) - bind.min(axis=0))) if len(bind) else 0.0
+    )
+    diagonal = max(diagonal, 1e-6)
+
+    bounds_min = np.full(3, np.inf)
+    bounds_max = np.full(3, -np.inf)
+    max_stretch = 0.0
+    bad_frames = []
+    nonfinite_frames = []
+    quat_length = np.linalg.norm(rotations, axis=-1)
+    # 归一化会把NaN四元数替换为单位四元数，因此直接检查输入
+    input_finite = np.isfinite(rotations).all(axis=(1, 2)) & np.isfinite(
+        root_positions
+    ).all(axis=1)
+    for start, world, verts in engine.iter_frames(rotations, root_positions):
+        finite = input_finite[start : start + len(world)] & np.isfinite(verts).all(
+            axis=(1, 2)
+        )
+        nonfinite_frames.extend((start + np.flatnonzero(~finite)).tolist())
+        if not len(bind) or not finite.any():
+            continue
+        verts = verts[finite]
+        bounds_min = np.minimum(bounds_min, verts.min(axis=(0, 1)))
+        bounds_max = np.maximum(bounds_max, verts.max(axis=(0, 1)))
+        # 去掉根节点位移后与绑定姿态的距离
+        root = world[finite, 0, :3, 3] - engine.rest_world[0, :3, 3]
+        offset = np.linalg.norm(verts - root[:, None, :] - bind[None], axis=-1)
+        stretch = offset.max(axis=1) / diagonal
+        max_stretch = max(max_stretch, float(stretch.max()))
+        frames = start + np.flatnonzero(finite)
+        bad_frames.extend(frames[stretch > stretch_limit].tolist())
+
+    return {
+        "frames": frame_num,
+        "bounds_min": bounds_min.tolist(),
+        "bounds_max": bounds_max.tolist(),
+        "max_stretch": max_stretch,
+        "exploding_frames": bad_frames,
+        "nonfinite_frames": nonfinite_frames,
+        "bad_quaternions": int((~(np.abs(quat_length - 1.0) <= 1e-2)).sum()),
+        "ok": not bad_frames and not nonfinite_frames,
+    }
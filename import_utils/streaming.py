@@ -0,0 +1,235 @@
+"""关卡流式加载索引
+
+把GMB中的对象按世界包围盒划分到XY平面的网格单元中，包围盒跨越的每个单元都登记
+该条目，地面这类大网格在其覆盖范围内任意位置都会被加载。DES中的每个摆放是一个
+索引条目（同一对象摆放多次时多个条目指向同一偏移），没有摆放的对象单独作为条目。
+索引（对象在GMB中的偏移、包围盒、覆盖的单元范围和DES摆放）保存在 <gmb>.lxstream，
+源文件未改动时再次打开关卡只需要读取索引，然后按需解码附近单元中的对象。
+"""
+
+import json
+import os
+from typing import Dict, Iterator, List, Set, Tuple
+
+import numpy as np
+
+from . import DESReader, GMBReader, LXObject
+from .. import math_utils
+
+Cell = Tuple[int, int]
+
+
+class LevelIndex:
+    VERSION = 3
+    SUFFIX = ".lxstream"
+
+    def __init__(self, gmb_path: str, cell_size: float):
+        self.gmb_path = gmb_path
+        self.des_path = os.path.splitext(gmb_path)[0] + ".des"
+        self.cell_size = float(cell_size)
+        # 每个条目: name, offset, verts, faces, min, max, cell_min, cell_max, pos, rot
+        self.entries: List[Dict] = []
+        # 单元 -> 包围盒与该单元相交的条目序号
+        self.cells: Dict[Cell, List[int]] = {}
+
+    @property
+    def index_path(self) -> str:
+        return self.gmb_path + self.SUFFIX
+
+    def _source_stamp(self) -> Dict:
+        stamp = {
+            "gmb_size": os.path.getsize(self.gmb_path),
+            "gmb_mtime": os.path.getmtime(self.gmb_path),
+            "des_mtime": None,
+        }
+        if os.path.exists(self.des_path):
+            stamp["des_mtime"] = os.path.getmtime(self.des_path)
+        return stamp
+
+    @classmethod
+    def open(cls, gmb_path: str, cell_size: float) -> "LevelIndex":
+        """读取已保存的索引，源文件或单元大小变化时重新建立"""
+        index = cls(gmb_path, cell_size)
+        if not index.load():
+            index.build()
+            index.save()
+        return index
+
+    def load(self) -> bool:
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[LX] 流式索引无法读取，重新建立: {e}")
+            return False
+        if (
+            data.get("version") != self.VERSION
+            or data.get("cell_size") != self.cell_size
+            or data.get("source") != self._source_stamp()
+        ):
+            return False
+        self.entries = data["objects"]
+        self._group_cells()
+        print(
+            f"[LX] 读取流式索引: {len(self.entries)} 个条目, {len(self.cells)} 个单元"
+        )
+        return True
+
+    def save(self):
+        from ..export_utils.base import LXWriter
+
+        data = {
+            "version": self.VERSION,
+            "cell_size": self.cell_size,
+            "source": self._source_stamp(),
+            "objects": self.entries,
+        }
+        LXWriter._replace(self.index_path, json.dumps(data).encode("utf-8"))
+
+    def build(self):
+        """扫描GMB中每个对象的偏移和局部包围盒，结合DES摆放计算覆盖的单元"""
+        from ..formats import GMB_FACE_DTYPE, GMB_VERTEX_DTYPE
+
+        reader = GMBReader(self.gmb_path)
+        objects = []
+        with open(self.gmb_path, "rb") as f:
+            obj_num = reader.read_header(f)
+            for obj_idx in range(obj_num):
+                offset = f.tell()
+                name = reader._read_string(f) or f"Object_{obj_idx}"
+                vert_num, face_num = np.frombuffer(f.read(8), dtype="<u4")
+                vdata = np.frombuffer(
+                    f.read(int(vert_num) * GMB_VERTEX_DTYPE.itemsize),
+                    dtype=GMB_VERTEX_DTYPE,
+                )
+                f.seek(int(face_num) * GMB_FACE_DTYPE.itemsize, 1)
+                if len(vdata):
+                    local = (vdata["pos"].min(axis=0), vdata["pos"].max(axis=0))
+                else:
+                    local = (np.zeros(3, dtype=np.float32),) * 2
+                objects.append(
+                    {
+                        "name": name,
+                        "offset": offset,
+                        "verts": int(vert_num),
+                        "faces": int(face_num),
+                        "local": local,
+                    }
+                )
+
+        # 每个DES摆放一个条目；同名对象只取GMB中的第一个
+        by_name = {}
+        for obj in objects:
+            by_name.setdefault(obj["name"], obj)
+        placements = []
+        if os.path.exists(self.des_path):
+            placements = [
+                p for p in DESReader(self.des_path).read_des() if p.name in by_name
+            ]
+        placed = {p.name for p in placements}
+        instances = [
+            (by_name[p.name], list(p.pos), list(p.rot)) for p in placements
+        ] + [
+            (obj, [0.0, 0.0, 0.0], [1.0, 0.0, 0.0, 0.0])
+            for obj in objects
+            if obj["name"] not in placed
+        ]
+
+        self.entries = []
+        local_min = []
+        local_max = []
+        for obj, pos, rot in instances:
+            local_min.append(obj["local"][0])
+            local_max.append(obj["local"][1])
+            self.entries.append(
+                {
+                    "name": obj["name"],
+                    "offset": obj["offset"],
+                    "verts": obj["verts"],
+                    "faces": obj["faces"],
+                    "pos": pos,
+                    "rot": rot,
+                }
+            )
+
+        if not self.entries:
+            self.cells = {}
+            return
+
+        # 局部包围盒的8个角变换到世界坐标后重新求包围盒
+        lo = np.array(local_min, dtype=np.float64)
+        hi = np.array(local_max, dtype=np.float64)
+        corners = np.stack(
+            [
+                np.where([(i >> axis) & 1 for axis in range(3)], hi, lo)
+                for i in range(8)
+            ],
+            axis=1,
+        )
+        rot = math_utils.quat_to_matrix([e["rot"] for e in self.entries])
+        pos = np.array([e["pos"] for e in self.entries], dtype=np.float64)
+        world = np.einsum("nij,nkj->nki", rot, corners) + pos[:, None, :]
+        world_min = world.min(axis=1)
+        world_max = world.max(axis=1)
+        cell_min = np.floor(world_min[:, :2] / self.cell_size).astype(np.int64)
+        cell_max = np.floor(world_max[:, :2] / self.cell_size).astype(np.int64)
+
+        for entry, lo_w, hi_w, c_lo, c_hi in zip(
+            self.entries, world_min, world_max, cell_min, cell_max
+        ):
+            entry["min"] = lo_w.tolist()
+            entry["max"] = hi_w.tolist()
+            entry["cell_min"] = c_lo.tolist()
+            entry["cell_max"] = c_hi.tolist()
+        self._group_cells()
+        print(
+            f"[LX] 建立流式索引: {len(objects)} 个对象, {len(self.entries)} 个条目, "
+            f"{len(self.cells)} 个单元"
+        )
+
+    def _group_cells(self):
+        self.cells = {}
+        for i, entry in enumerate(self.entries):
+            (x0, y0), (x1, y1) = entry["cell_min"], entry["cell_max"]
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self.cells.setdefault((x, y), []).append(i)
+
+    def cells_near(self, point, radius: float) -> Set[Cell]:
+        """XY平面上与以 point 为圆心、radius 为半径的圆相交的单元"""
+        if not self.cells:
+            return set()
+        keys = np.array(list(self.cells), dtype=np.float64)
+        low = keys * self.cell_size
+        nearest = np.clip(
+            np.asarray(point, dtype=np.float64)[:2], low, low + self.cell_size
+        )
+        dist = np.linalg.norm(nearest - np.asarray(point, dtype=np.float64)[:2], axis=1)
+        return {tuple(int(v) for v in key) for key in keys[dist <= radius]}
+
+    def entries_in(self, cells) -> Set[int]:
+        """登记在这些单元中的条目序号，跨越多个单元的条目只出现一次"""
+        result = set()
+        for cell in cells:
+            result.update(self.cells.get(cell, ()))
+        return result
+
+    def read_entries(self, indices) -> Iterator[Tuple[int, Dict, LXObject]]:
+        """按偏移顺序跳转读取条目对应的对象，返回 (条目序号, 条目, 对象)
+
+        同一对象有多个摆放时只解码一次，各条目得到同一个 LXObject。
+        """
+        reader = GMBReader(self.gmb_path)
+        indices = sorted(indices, key=lambda i: self.entries[i]["offset"])
+        obj_data = None
+        offset = None
+        with open(self.gmb_path, "rb") as f:
+            for i in indices:
+                entry = self.entries[i]
+                if entry["offset"] != offset:
+                    offset = entry["offset"]
+                    f.seek(offset)
+                    obj_data = reader.read_object(f, i)
+                yield i, entry, obj_data
@@ -0,0 +1,168 @@
+"""网格数据校验
+
+在创建Blender网格（from_pydata）之前，对解析出的 LXObject 做整体的向量化检查:
+面索引越界、退化三角形、重复三角形、NaN/inf 顶点、UV范围和骨骼权重之和。
+可选自动修复：删除无效的面、把非有限值置零、重新归一化权重。
+"""
+
+from typing import Dict
+
+import numpy as np
+
+from . import LXObject
+
+
+class MeshReport:
+    """一个对象的校验结果，issues 为 问题名 -> 数量，repaired 为其中已修复的问题"""
+
+    LABELS = {
+        "bad_index": "面索引越界",
+        "degenerate": "退化三角形",
+        "duplicate": "重复三角形",
+        "nonfinite_vert": "NaN/inf顶点",
+        "nonfinite_uv": "NaN/inf UV",
+        "uv_out_of_range": "UV超出范围",
+        "uv_count": "UV数量与顶点数不一致",
+        "skin_count": "权重顶点数与顶点数不一致",
+        "bad_bone_id": "骨骼ID为负",
+        "bad_weight_sum": "权重之和不为1",
+    }
+
+    # 自动修复能消除的问题；UV超出范围（允许平铺）和权重顶点数不一致不会被修改
+    REPAIRABLE = (
+        "bad_index",
+        "degenerate",
+        "duplicate",
+        "nonfinite_vert",
+        "nonfinite_uv",
+        "uv_count",
+        "bad_bone_id",
+        "bad_weight_sum",
+    )
+
+    def __init__(self, name: str, vert_num: int, face_num: int):
+        self.name = name
+        self.vert_num = vert_num
+        self.face_num = face_num
+        self.issues: Dict[str, int] = {}
+        self.repaired: Dict[str, int] = {}
+        self.removed_faces = 0
+
+    def add(self, issue: str, count: int):
+        if count:
+            self.issues[issue] = self.issues.get(issue, 0) + int(count)
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    @property
+    def remaining(self) -> Dict[str, int]:
+        """修复后仍然存在的问题"""
+        return {k: v for k, v in self.issues.items() if k not in self.repaired}
+
+    def _labels(self, issues: Dict[str, int]) -> str:
+        return ", ".join(f"{self.LABELS.get(k, k)} {v}" for k, v in issues.items())
+
+    def summary(self) -> str:
+        if self.ok:
+            return f"{self.name}: 校验通过 ({self.vert_num} 顶点, {self.face_num} 面)"
+        if not self.repaired:
+            return f"{self.name}: " + self._labels(self.issues)
+        text = f"{self.name}: 已修复 {self._labels(self.repaired)}"
+        text += f" (删除 {self.removed_faces} 个面)"
+        if self.remaining:
+            text += f"; 未修复 {self._labels(self.remaining)}"
+        return text
+
+
+def validate_mesh(
+    obj: LXObject,
+    repair: bool = False,
+    uv_limit: float = 64.0,
+    weight_tolerance: float = 1e-3,
+) -> MeshReport:
+    """校验（并可选修复）一个 LXObject，修复时直接修改 obj
+
+    UV允许平铺，只有绝对值超过 uv_limit 的坐标才视为异常。
+    """
+    verts = np.asarray(obj.verts, dtype=np.float64).reshape(-1, 3)
+    faces = np.asarray(obj.faces, dtype=np.int64).reshape(-1, 3)
+    vert_num = len(verts)
+    report = MeshReport(obj.skin_name, vert_num, len(faces))
+
+    # 顶点
+    bad_vert = ~np.isfinite(verts).all(axis=1)
+    report.add("nonfinite_vert", bad_vert.sum())
+
+    # 面：越界、退化、引用了无效顶点、重复
+    out_of_range = ((faces < 0) | (faces >= vert_num)).any(axis=1)
+    report.add("bad_index", out_of_range.sum())
+    degenerate = (
+        (faces[:, 0] == faces[:, 1])
+        | (faces[:, 1] == faces[:, 2])
+        | (faces[:, 2] == faces[:, 0])
+    ) & ~out_of_range
+    report.add("degenerate", degenerate.sum())
+    drop = out_of_range | degenerate
+    if bad_vert.any():
+        drop |= bad_vert[np.clip(faces, 0, max(vert_num - 1, 0))].any(axis=1)
+
+    duplicate = np.zeros(len(faces), dtype=bool)
+    if len(faces):
+        # 顶点集合相同即视为重复（不区分绕序），保留第一个
+        keys = np.sort(faces, axis=1)
+        order = np.lexsort((keys[:, 2], keys[:, 1], keys[:, 0]))
+        same = (keys[order][1:] == keys[order][:-1]).all(axis=1)
+        duplicate[order[1:][same]] = True
+        duplicate &= ~drop
+    report.add("duplicate", duplicate.sum())
+    drop |= duplicate
+
+    # UV
+    uvs = None
+    if len(obj.uvs):
+        uvs = np.asarray(obj.uvs, dtype=np.float64).reshape(len(obj.uvs), -1)
+        report.add("uv_count", len(uvs) != vert_num)
+        finite = np.isfinite(uvs[:, :2]).all(axis=1)
+        report.add("nonfinite_uv", (~finite).sum())
+        report.add(
+            "uv_out_of_range", (np.abs(uvs[finite, :2]) > uv_limit).any(axis=1).sum()
+        )
+
+    # 骨骼权重（CSR）: 按顶点求和
+    skin = obj.skin
+    if skin is not None:
+        report.add("skin_count", skin.vert_num != vert_num)
+        report.add("bad_bone_id", (skin.bone_ids < 0).sum())
+        report.add(
+            "bad_weight_sum",
+            ((skin.counts > 0) & (np.abs(skin.sums() - 1.0) > weight_tolerance)).sum(),
+        )
+
+    repairable = {k: v for k, v in report.issues.items() if k in MeshReport.REPAIRABLE}
+    if repair and repairable:
+        keep = ~drop
+        obj.faces = faces[keep].tolist()
+        if len(obj.face_mat) == len(faces):
+            obj.face_mat = np.asarray(obj.face_mat)[keep].tolist()
+        report.removed_faces = int(drop.sum())
+
+        if bad_vert.any():
+            verts[bad_vert] = 0.0
+            obj.verts = verts.tolist()
+
+        if uvs is not None:
+            fixed = np.zeros((vert_num, uvs.shape[1]))
+            n = min(len(uvs), vert_num)
+            fixed[:n] = np.nan_to_num(uvs[:n], nan=0.0, posinf=0.0, neginf=0.0)
+            obj.uvs = fixed.tolist()
+
+        if skin is not None:
+            # 去掉无效骨骼ID和负权重的条目，其余权重重新归一化
+            valid = (skin.bone_ids >= 0) & (skin.weights >= 0.0)
+            obj.skin = skin.select(valid).normalized()
+
+        report.repaired = repairable
+
+    return report
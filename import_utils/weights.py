@@ -0,0 +1,150 @@
+"""CSR形式的蒙皮权重
+
+顶点 i 的骨骼影响为 bone_ids[indptr[i]:indptr[i + 1]]，对应权重为
+weights[indptr[i]:indptr[i + 1]]。全部数据只占三个连续数组，归一化、裁剪、
+按骨骼分组等操作都按数组整体计算，不需要逐顶点循环。
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+
+class SkinWeights:
+    def __init__(self, indptr, bone_ids, weights):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.bone_ids = np.asarray(bone_ids, dtype=np.int64)
+        self.weights = np.asarray(weights, dtype=np.float64)
+
+    @classmethod
+    def from_counts(cls, counts, bone_ids, weights) -> "SkinWeights":
+        """由每个顶点的影响数和展平的骨骼ID/权重构建"""
+        indptr = np.zeros(len(counts) + 1, dtype=np.int64)
+        np.cumsum(counts, out=indptr[1:])
+        return cls(indptr, bone_ids, weights)
+
+    @classmethod
+    def from_coo(cls, rows, bone_ids, weights, vert_num: int) -> "SkinWeights":
+        """由任意顺序的 (顶点, 骨骼, 权重) 三元组构建"""
+        rows = np.asarray(rows, dtype=np.int64)
+        order = np.argsort(rows, kind="stable")
+        counts = np.bincount(rows, minlength=vert_num)
+        return cls.from_counts(
+            counts, np.asarray(bone_ids)[order], np.asarray(weights)[order]
+        )
+
+    @classmethod
+    def from_lists(
+        cls, bone_ids: Sequence[Sequence[int]], weights: Sequence[Sequence[float]]
+    ) -> "SkinWeights":
+        counts = np.fromiter((len(w) for w in weights), dtype=np.int64)
+        total = int(counts.sum())
+        return cls.from_counts(
+            counts,
+            np.fromiter((b for bs in bone_ids for b in bs), np.int64, total),
+            np.fromiter((w for ws in weights for w in ws), np.float64, total),
+        )
+
+    @classmethod
+    def empty(cls, vert_num: int) -> "SkinWeights":
+        return cls(np.zeros(vert_num + 1, dtype=np.int64), [], [])
+
+    @property
+    def vert_num(self) -> int:
+        return len(self.indptr) - 1
+
+    @property
+    def counts(self) -> np.ndarray:
+        """每个顶点的影响数"""
+        return np.diff(self.indptr)
+
+    def rows(self) -> np.ndarray:
+        """每条影响所属的顶点索引"""
+        return np.repeat(np.arange(self.vert_num), self.counts)
+
+    def sums(self) -> np.ndarray:
+        return np.bincount(self.rows(), weights=self.weights, minlength=self.vert_num)
+
+    def select(self, mask) -> "SkinWeights":
+        """只保留 mask 为真的影响条目"""
+        mask = np.asarray(mask, dtype=bool)
+        counts = np.bincount(self.rows()[mask], minlength=self.vert_num)
+        return SkinWeights.from_counts(counts, self.bone_ids[mask], self.weights[mask])
+
+    def normalized(self) -> "SkinWeights":
+        """每个顶点的权重之和归一化为1（没有影响或和为0的顶点保持不变）"""
+        sums = self.sums()
+        scale = np.where(sums > 0.0, sums, 1.0)[self.rows()]
+        return SkinWeights(
+            self.indptr.copy(), self.bone_ids.copy(), self.weights / scale
+        )
+
+    def pruned(self, max_bones: int, min_weight: float = 0.0) -> "SkinWeights":
+        """每个顶点只保留权重最大的 max_bones 个影响并重新归一化，结果按权重降序排列"""
+        rows = self.rows()
+        keep = self.weights > max(min_weight, 0.0)
+        order = np.flatnonzero(keep)
+        order = order[np.lexsort((-self.weights[order], rows[order]))]
+        rows = rows[order]
+        counts = np.bincount(rows, minlength=self.vert_num)
+        starts = np.cumsum(counts) - counts
+        rank = np.arange(len(order)) - starts[rows]
+        order = order[rank < max_bones]
+        counts = np.minimum(counts, max_bones)
+        return SkinWeights.from_counts(
+            counts, self.bone_ids[order], self.weights[order]
+        ).normalized()
+
+    def take(self, vertices) -> "SkinWeights":
+        """按顶点索引取子集（可重复），用于拆分或重排顶点"""
+        vertices = np.asarray(vertices, dtype=np.int64)
+        counts = self.counts[vertices]
+        starts = self.indptr[vertices]
+        offsets = np.arange(counts.sum()) - np.repeat(
+            np.cumsum(counts) - counts, counts
+        )
+        entries = np.repeat(starts, counts) + offsets
+        return SkinWeights.from_counts(
+            counts, self.bone_ids[entries], self.weights[entries]
+        )
+
+    def bone_vertices(
+        self, bone_num: int = None
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """每块骨骼影响的 (顶点索引, 权重)，即转置后的CSC结构"""
+        if bone_num is None:
+            bone_num = int(self.bone_ids.max()) + 1 if len(self.bone_ids) else 0
+        valid = (self.bone_ids >= 0) & (self.bone_ids < bone_num)
+        rows = self.rows()[valid]
+        bones = self.bone_ids[valid]
+        weights = self.weights[valid]
+        order = np.argsort(bones, kind="stable")
+        splits = np.cumsum(np.bincount(bones, minlength=bone_num))[:-1]
+        return list(
+            zip(np.split(rows[order], splits), np.split(weights[order], splits))
+        )
+
+    def to_dense(self, bone_num: int) -> np.ndarray:
+        """转换为稠密矩阵 (顶点数, bone_num)"""
+        dense = np.zeros((self.vert_num, bone_num), dtype=np.float64)
+        valid = (self.bone_ids >= 0) & (self.bone_ids < bone_num)
+        np.add.at(
+            dense, (self.rows()[valid], self.bone_ids[valid]), self.weights[valid]
+        )
+        return dense
+
+    def to_padded(self, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """转换为定宽数组 (顶点数, width)，不足处骨骼ID为-1、权重为0，超出部分截断"""
+        rows = self.rows()
+        rank = np.arange(len(rows)) - self.indptr[rows]
+        keep = rank < width
+        ids = np.full((self.vert_num, width), -1, dtype=np.int64)
+        packed = np.zeros((self.vert_num, width), dtype=np.float64)
+        ids[rows[keep], rank[keep]] = self.bone_ids[keep]
+        packed[rows[keep], rank[keep]] = self.weights[keep]
+        return ids, packed
+
+    def vertex(self, i: int) -> Tuple[List[int], List[float]]:
+        """单个顶点的 (骨骼ID列表, 权重列表)"""
+        span = slice(self.indptr[i], self.indptr[i + 1])
+        return self.bone_ids[span].tolist(), self.weights[span].tolist()
@@ -0,0 +1,239 @@
+"""批量四元数/变换矩阵运算
+
+所有函数都作用于numpy数组的最后一维（或最后两维），前面的维度可以是
+任意的批量维度，例如 (帧数, 节点数, 4)。
+四元数统一使用 (w, x, y, z) 顺序，与BNC文件和Blender的 Quaternion 一致。
+"""
+
+from typing import List
+
+import numpy as np
+
+
+def quat_multiply(a, b):
+    """四元数乘法 a * b"""
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+    aw, ax, ay, az = np.moveaxis(a, -1, 0)
+    bw, bx, by, bz = np.moveaxis(b, -1, 0)
+    return np.stack(
+        [
+            aw * bw - ax * bx - ay * by - az * bz,
+            aw * bx + ax * bw + ay * bz - az * by,
+            aw * by - ax * bz + ay * bw + az * bx,
+            aw * bz + ax * by - ay * bx + az * bw,
+        ],
+        axis=-1,
+    )
+
+
+def quat_conjugate(q):
+    """共轭四元数（单位四元数的逆）"""
+    q = np.array(q, dtype=np.float64)
+    q[..., 1:] *= -1.0
+    return q
+
+
+def quat_normalize(q):
+    """归一化，零长度的四元数返回单位四元数"""
+    q = np.asarray(q, dtype=np.float64)
+    length = np.linalg.norm(q, axis=-1, keepdims=True)
+    identity = np.zeros_like(q)
+    identity[..., 0] = 1.0
+    return np.where(length > 1e-12, q / np.maximum(length, 1e-12), identity)
+
+
+def quat_make_continuous(q, axis: int = 0):
+    """沿 axis（通常是帧轴）翻转符号，使相邻四元数的点积不为负
+
+    q 与 -q 表示同一旋转，逐帧保持同一半球可以避免插值时绕远路。
+    """
+    q = np.array(q, dtype=np.float64)
+    q = np.moveaxis(q, axis, 0)
+    if len(q) > 1:
+        dots = np.sum(q[1:] * q[:-1], axis=-1)
+        flips = np.cumsum(dots < 0.0, axis=0) % 2
+        sign = np.where(flips == 1, -1.0, 1.0)
+        q[1:] *= sign[..., None]
+    return np.moveaxis(q, 0, axis)
+
+
+def quat_slerp(a, b, t):
+    """球面线性插值，t 可以是标量或与批量维度广播的数组
+
+    自动取较短路径；两个四元数几乎相同时退化为归一化线性插值。
+    """
+    a = quat_normalize(a)
+    b = quat_normalize(b)
+    t = np.asarray(t, dtype=np.float64)[..., None]
+    dots = np.sum(a * b, axis=-1, keepdims=True)
+    b = np.where(dots < 0.0, -b, b)
+    dots = np.abs(dots)
+    theta = np.arccos(np.clip(dots, 0.0, 1.0))
+    sin_theta = np.sin(theta)
+    near = sin_theta < 1e-6
+    safe = np.where(near, 1.0, sin_theta)
+    wa = np.where(near, 1.0 - t, np.sin((1.0 - t) * theta) / safe)
+    wb = np.where(near, t, np.sin(t * theta) / safe)
+    return quat_normalize(wa * a + wb * b)
+
+
+def quat_angle(a, b):
+    """两个旋转之间的夹角（弧度），q 与 -q 视为同一旋转"""
+    dots = np.abs(np.sum(quat_normalize(a) * quat_normalize(b), axis=-1))
+    return 2.0 * np.arccos(np.clip(dots, 0.0, 1.0))
+
+
+def quat_rotate(q, v):
+    """用四元数 (..., 4) 旋转向量 (..., 3)"""
+    q = quat_normalize(q)
+    v = np.asarray(v, dtype=np.float64)
+    u = q[..., 1:]
+    t = 2.0 * np.cross(u, v)
+    return v + q[..., :1] * t + np.cross(u, t)
+
+
+def quat_to_matrix(q):
+    """四元数 (..., 4) 转旋转矩阵 (..., 3, 3)"""
+    q = quat_normalize(q)
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    xx, yy, zz = x * x, y * y, z * z
+    xy, xz, yz = x * y, x * z, y * z
+    wx, wy, wz = w * x, w * y, w * z
+    m = np.empty(q.shape[:-1] + (3, 3), dtype=np.float64)
+    m[..., 0, 0] = 1.0 - 2.0 * (yy + zz)
+    m[..., 0, 1] = 2.0 * (xy - wz)
+    m[..., 0, 2] = 2.0 * (xz + wy)
+    m[..., 1, 0] = 2.0 * (xy + wz)
+    m[..., 1, 1] = 1.0 - 2.0 * (xx + zz)
+    m[..., 1, 2] = 2.0 * (yz - wx)
+    m[..., 2, 0] = 2.0 * (xz - wy)
+    m[..., 2, 1] = 2.0 * (yz + wx)
+    m[..., 2, 2] = 1.0 - 2.0 * (xx + yy)
+    return m
+
+
+def matrix_to_quat(m):
+    """旋转矩阵 (..., 3, 3) 或 (..., 4, 4) 转四元数 (..., 4)"""
+    m = np.asarray(m, dtype=np.float64)[..., :3, :3]
+    m00, m01, m02 = m[..., 0, 0], m[..., 0, 1], m[..., 0, 2]
+    m10, m11, m12 = m[..., 1, 0], m[..., 1, 1], m[..., 1, 2]
+    m20, m21, m22 = m[..., 2, 0], m[..., 2, 1], m[..., 2, 2]
+    trace = m00 + m11 + m22
+
+    # 四种情况全部计算后按条件选择，避免逐元素分支
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s0 = np.sqrt(np.maximum(trace + 1.0, 1e-12)) * 2.0
+        q0 = np.stack(
+            [0.25 * s0, (m21 - m12) / s0, (m02 - m20) / s0, (m10 - m01) / s0], -1
+        )
+        s1 = np.sqrt(np.maximum(1.0 + m00 - m11 - m22, 1e-12)) * 2.0
+        q1 = np.stack(
+            [(m21 - m12) / s1, 0.25 * s1, (m01 + m10) / s1, (m02 + m20) / s1], -1
+        )
+        s2 = np.sqrt(np.maximum(1.0 + m11 - m00 - m22, 1e-12)) * 2.0
+        q2 = np.stack(
+            [(m02 - m20) / s2, (m01 + m10) / s2, 0.25 * s2, (m12 + m21) / s2], -1
+        )
+        s3 = np.sqrt(np.maximum(1.0 + m22 - m00 - m11, 1e-12)) * 2.0
+        q3 = np.stack(
+            [(m10 - m01) / s3, (m02 + m20) / s3, (m12 + m21) / s3, 0.25 * s3], -1
+        )
+
+    use0 = (trace > 0.0)[..., None]
+    use1 = ((m00 >= m11) & (m00 >= m22))[..., None]
+    use2 = (m11 >= m22)[..., None]
+    q = np.where(use0, q0, np.where(use1, q1, np.where(use2, q2, q3)))
+    return quat_normalize(q)
+
+
+def compose_matrix(pos, quat):
+    """由位置 (..., 3) 和四元数 (..., 4) 组成 4x4 变换矩阵"""
+    pos = np.asarray(pos, dtype=np.float64)
+    rot = quat_to_matrix(quat)
+    shape = np.broadcast_shapes(pos.shape[:-1], rot.shape[:-2])
+    m = np.zeros(shape + (4, 4), dtype=np.float64)
+    m[..., :3, :3] = rot
+    m[..., :3, 3] = pos
+    m[..., 3, 3] = 1.0
+    return m
+
+
+def invert_rigid(m):
+    """求刚体变换（旋转+平移）矩阵 (..., 4, 4) 的逆"""
+    m = np.asarray(m, dtype=np.float64)
+    rot_t = np.swapaxes(m[..., :3, :3], -1, -2)
+    inv = np.zeros_like(m)
+    inv[..., :3, :3] = rot_t
+    inv[..., :3, 3] = -np.einsum("...ij,...j->...i", rot_t, m[..., :3, 3])
+    inv[..., 3, 3] = 1.0
+    return inv
+
+
+def hierarchy_levels(parents) -> List[np.ndarray]:
+    """按层级深度把节点分组，返回 [根节点索引, 第1层索引, ...]
+
+    parents 为父节点索引数组，根节点为 -1。同一层的节点可以一起批量计算。
+    """
+    parents = np.asarray(parents, dtype=np.int64)
+    depth = np.zeros(len(parents), dtype=np.int64)
+    ancestor = parents.copy()
+    for _ in range(len(parents)):
+        has_parent = ancestor >= 0
+        if not has_parent.any():
+            break
+        depth += has_parent
+        ancestor = np.where(has_parent, parents[np.maximum(ancestor, 0)], -1)
+    else:
+        raise ValueError("骨骼层级中存在循环引用")
+    return [
+        np.flatnonzero(depth == d) for d in range(depth.max() + 1 if len(depth) else 0)
+    ]
+
+
+def accumulate_world(local, parents):
+    """沿父子层级累积局部矩阵 (..., n, 4, 4)，返回世界矩阵"""
+    parents = np.asarray(parents, dtype=np.int64)
+    world = np.array(local, dtype=np.float64)
+    for level in hierarchy_levels(parents)[1:]:
+        world[..., level, :, :] = (
+            world[..., parents[level], :, :] @ world[..., level, :, :]
+        )
+    return world
+
+
+def world_to_local(world, parents):
+    """由世界矩阵 (..., n, 4, 4) 求各节点相对父节点的局部矩阵"""
+    parents = np.asarray(parents, dtype=np.int64)
+    world = np.asarray(world, dtype=np.float64)
+    local = world.copy()
+    has_parent = np.flatnonzero(parents >= 0)
+    if len(has_parent):
+        parent_inv = invert_rigid(world[..., parents[has_parent], :, :])
+        local[..., has_parent, :, :] = parent_inv @ world[..., has_parent, :, :]
+    return local
+
+
+def quat_accumulate_world(local, parents):
+    """沿父子层级累积局部旋转四元数 (..., n, 4)，返回世界旋转"""
+    parents = np.asarray(parents, dtype=np.int64)
+    world = np.array(local, dtype=np.float64)
+    for level in hierarchy_levels(parents)[1:]:
+        world[..., level, :] = quat_multiply(
+            world[..., parents[level], :], world[..., level, :]
+        )
+    return world
+
+
+def quat_world_to_local(world, parents):
+    """由世界旋转四元数 (..., n, 4) 求各节点相对父节点的局部旋转"""
+    parents = np.asarray(parents, dtype=np.int64)
+    world = np.asarray(world, dtype=np.float64)
+    local = world.copy()
+    has_parent = np.flatnonzero(parents >= 0)
+    if len(has_parent):
+        local[..., has_parent, :] = quat_multiply(
+            quat_conjugate(world[..., parents[has_parent], :]),
+            world[..., has_parent, :],
+        )
+    return local
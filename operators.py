@@ -1,7 +1,5 @@
 import bpy
 import os
-from . import import_utils
-from . import export_utils
 
 
 class SKC_OT_import(bpy.types.Operator):
@@ -26,6 +24,11 @@ class SKC_OT_import(bpy.types.Operator):
         max=10.0,
         description="在视口中显示骨骼的大小",
     )
+    auto_repair: bpy.props.BoolProperty(
+        name="自动修复",
+        default=True,
+        description="删除越界、退化和重复的面，修正NaN顶点/UV并重新归一化权重",
+    )
 
     def draw(self, context):
         layout = self.layout
@@ -33,9 +36,12 @@ class SKC_OT_import(bpy.types.Operator):
         layout.prop(self, "import_armature")
         if self.import_armature:
             layout.prop(self, "bone_display_size")
+        layout.prop(self, "auto_repair")
 
     def execute(self, context):
         try:
+            from . import import_utils
+
             skc_path = self.filepath
 
             print(f"[LX] 开始导入: {os.path.basename(skc_path)}")
@@ -59,14 +65,9 @@ class SKC_OT_import(bpy.types.Operator):
                 self.report({"ERROR"}, "没有顶点数据")
                 return {"CANCELLED"}
 
-            # 检查顶点索引范围
-            max_idx = 0
-            for face in obj_data.faces:
-                for idx in face:
-                    if idx > max_idx:
-                        max_idx = idx
-            print(f"[LX] 最大顶点索引: {max_idx}")
-            print(f"[LX] 顶点总数: {len(obj_data.verts)}")
+            # 校验索引范围、退化/重复面、NaN、UV和权重
+            if not _validate_objects(self, objects, self.auto_repair):
+                return {"CANCELLED"}
 
             # 读取骨骼文件
             bones = []
@@ -160,7 +161,11 @@ class SKC_OT_import(bpy.types.Operator):
             if self.import_armature and bones and imported_objects:
                 print("[LX] 条件满足，调用 create_armature_and_skin")
                 self.create_armature_and_skin(
-                    context, bones, imported_objects, self.bone_display_size
+                    context,
+                    bones,
+                    imported_objects,
+                    self.bone_display_size,
+                    bnc_path,
                 )
             else:
                 print(
@@ -179,7 +184,7 @@ class SKC_OT_import(bpy.types.Operator):
             return {"CANCELLED"}
 
     def create_armature_and_skin(
-        self, context, bones, imported_objects, bone_display_size=0.5
+        self, context, bones, imported_objects, bone_display_size=0.5, bnc_path=""
     ):
         """创建骨骼和蒙皮绑定 - 按3dsmax方式重构
 
@@ -193,137 +198,70 @@ class SKC_OT_import(bpy.types.Operator):
         2. 创建EditBone（不使用parent，避免Blender自动调整）
         3. 骨骼层级通过名称关系在逻辑上保持
         """
-        import mathutils
+        import numpy as np
+        from . import import_utils
+        from . import math_utils
 
         print("[LX] ==================== 开始创建骨骼 ====================")
         print(f"[LX] 传入骨骼数量: {len(bones)}")
 
-        # 步骤1：按拓扑排序骨骼（父骨骼在前，子骨骼在后）
-        print("[LX] 步骤1: 拓扑排序骨骼...")
-        sorted_bones = []
-        processed = set()
-
-        def add_bone_and_children(bone_data):
-            if bone_data.bone_name in processed:
-                return
-            processed.add(bone_data.bone_name)
-            sorted_bones.append(bone_data)
-
-            # 找到所有子骨骼
-            for child in bones:
-                if child.parent_name == bone_data.bone_name:
-                    add_bone_and_children(child)
-
-        # 从根骨骼开始
-        for bone_data in bones:
-            if not bone_data.parent_name or bone_data.parent_name == "NULL":
-                add_bone_and_children(bone_data)
-
-        # 添加剩余的（可能有parent但未找到）
-        for bone_data in bones:
-            if bone_data.bone_name not in processed:
-                sorted_bones.append(bone_data)
-                processed.add(bone_data.bone_name)
-
-        print(f"[LX] 拓扑排序完成，共 {len(sorted_bones)} 块骨骼")
-
-        # 步骤2：计算每个骨骼的世界变换矩阵
-        print("[LX] 步骤2: 计算世界变换矩阵...")
-        bone_world_matrix = {}  # 骨骼名称 -> 世界矩阵
-
-        for bone_data in sorted_bones:
-            bone_name = bone_data.bone_name
-
-            # 局部变换
-            local_pos = mathutils.Vector(bone_data.vpos)
-            w, x, y, z = bone_data.vrot
-            local_rot = mathutils.Quaternion((w, x, y, z))
-            local_matrix = (
-                mathutils.Matrix.Translation(local_pos) @ local_rot.to_matrix().to_4x4()
-            )
-
-            if bone_data.parent_name and bone_data.parent_name in bone_world_matrix:
-                # 有父骨骼：世界矩阵 = 父矩阵 @ 局部矩阵
-                parent_matrix = bone_world_matrix[bone_data.parent_name]
-                world_matrix = parent_matrix @ local_matrix
-            else:
-                # 根骨骼：世界矩阵 = 局部矩阵
-                world_matrix = local_matrix
-
-            bone_world_matrix[bone_name] = world_matrix
-
-            # 调试输出
-            if bone_name in ["b", "d_wpnLP", "d_wpnL"]:
-                world_pos = world_matrix.translation
+        # 步骤1：按父节点索引逐层累积，批量计算全部骨骼的世界变换矩阵
+        print("[LX] 步骤1: 计算世界变换矩阵...")
+        pivots, quats, parents = import_utils.bone_arrays(bones)
+        world = math_utils.accumulate_world(
+            math_utils.compose_matrix(pivots, quats), parents
+        )
+        world_pos = world[:, :3, 3]
+        # 骨骼自身Z轴方向、长度为显示大小的向量
+        z_axis = world[:, :3, 2] * bone_display_size
+
+        for bone_data, pos in zip(bones, world_pos.tolist()):
+            if bone_data.bone_name in ["b", "d_wpnLP", "d_wpnL"]:
                 print(
-                    f"[LX] {bone_name}: 局部{tuple(bone_data.vpos)} -> 世界{tuple(world_pos)}"
+                    f"[LX] {bone_data.bone_name}: 局部{tuple(bone_data.vpos)} -> 世界{tuple(pos)}"
                 )
 
+        # 步骤2：计算head/tail
+        # 当前骨骼的pivot位置作为tail，head为父骨骼的pivot位置；
+        # 根骨骼head在当前位置，tail沿自身Z轴延伸
+        print("[LX] 步骤2: 计算骨骼head/tail...")
+        has_parent = (parents >= 0)[:, None]
+        heads = np.where(has_parent, world_pos[np.maximum(parents, 0)], world_pos)
+        tails = np.where(has_parent, world_pos, world_pos + z_axis)
+
+        # 没有子骨骼的末端骨骼：沿当前骨骼方向延伸一定长度作为tail，
+        # head和tail几乎重合时使用自身Z轴
+        is_leaf = np.bincount(parents[parents >= 0], minlength=len(bones)) == 0
+        direction = tails - heads
+        length = np.linalg.norm(direction, axis=1, keepdims=True)
+        direction = np.where(
+            length < 0.001,
+            z_axis,
+            direction / np.maximum(length, 1e-12) * bone_display_size,
+        )
+        tails = np.where(is_leaf[:, None], heads + direction, tails)
+
         # 步骤3：创建Armature
         print("[LX] 步骤3: 创建Armature...")
         armature = bpy.data.armatures.new("Armature")
         armature.display_type = "OCTAHEDRAL"  # 使用八面体显示
         armature_obj = bpy.data.objects.new("Armature", armature)
+        # 记录BNC路径，导入/导出AMB时用于还原节点顺序和静止姿态
+        armature_obj["lx_bnc_path"] = bnc_path
         bpy.context.collection.objects.link(armature_obj)
 
-        # 步骤4：进入编辑模式创建骨骼
+        # 步骤4：进入编辑模式创建骨骼（使用世界坐标）
         print("[LX] 步骤4: 创建EditBone...")
         bpy.context.view_layer.objects.active = armature_obj
         bpy.ops.object.mode_set(mode="EDIT")
 
         edit_bones = armature.edit_bones
-        bone_map = {}
-
-        # 创建所有骨骼（使用世界坐标）
-        for bone_data in sorted_bones:
-            bone_name = bone_data.bone_name
-            bone = edit_bones.new(bone_name)
-
-            # 从世界矩阵提取位置和旋转
-            world_matrix = bone_world_matrix[bone_name]
-            world_pos = world_matrix.translation
-            world_rot = world_matrix.to_quaternion()
-
-            # 关键点：当前骨骼的pivot位置应该作为tail
-            # head应该是父骨骼的pivot位置（如果是根骨骼则使用当前位置减去一定偏移）
-            if bone_data.parent_name and bone_data.parent_name in bone_world_matrix:
-                parent_matrix = bone_world_matrix[bone_data.parent_name]
-                parent_pos = parent_matrix.translation
-                bone.head = tuple(parent_pos)
-                bone.tail = tuple(world_pos)
-            else:
-                # 根骨骼：head在当前位置，tail沿Z轴延伸
-                bone.head = tuple(world_pos)
-                direction = mathutils.Vector((0, 0, bone_display_size))
-                direction.rotate(world_rot)
-                tail_pos = world_pos + direction
-                bone.tail = tuple(tail_pos)
-
-            bone_map[bone_name] = bone
-
-        # 步骤5：调整没有子骨骼的末端骨骼tail
-        print("[LX] 步骤5: 调整末端骨骼tail...")
-        for bone_data in sorted_bones:
-            bone_name = bone_data.bone_name
-            bone = bone_map[bone_name]
-
-            # 查找子骨骼
-            children = [b for b in sorted_bones if b.parent_name == bone_name]
-            if not children:
-                # 末端骨骼：沿当前骨骼方向延伸一定长度作为tail
-                direction = mathutils.Vector(bone.tail) - mathutils.Vector(bone.head)
-                if direction.length < 0.001:
-                    # 如果head和tail几乎重合，使用旋转方向的Z轴
-                    world_matrix = bone_world_matrix[bone_name]
-                    world_rot = world_matrix.to_quaternion()
-                    direction = mathutils.Vector((0, 0, bone_display_size))
-                    direction.rotate(world_rot)
-                else:
-                    direction.normalize()
-                    direction *= bone_display_size
-                bone.tail = tuple(mathutils.Vector(bone.head) + direction)
+        for bone_data, head, tail in zip(bones, heads.tolist(), tails.tolist()):
+            bone = edit_bones.new(bone_data.bone_name)
+            bone.head = head
+            bone.tail = tail
 
-        print("[LX] 步骤6: 完成，退出编辑模式...")
+        print("[LX] 步骤5: 完成，退出编辑模式...")
         bpy.ops.object.mode_set(mode="OBJECT")
         print(f"[LX] 骨骼创建完成: {len(bones)} 块骨骼")
 
@@ -332,11 +270,10 @@ class SKC_OT_import(bpy.types.Operator):
         print("[LX] 模型顶点位置范围:")
         for obj, obj_data in imported_objects:
             if obj_data.verts:
-                xs = [v[0] for v in obj_data.verts]
-                ys = [v[1] for v in obj_data.verts]
-                zs = [v[2] for v in obj_data.verts]
+                verts = np.asarray(obj_data.verts, dtype=np.float64)
+                (x0, y0, z0), (x1, y1, z1) = verts.min(axis=0), verts.max(axis=0)
                 print(
-                    f"[LX]   {obj.name}: X({min(xs):.2f}~{max(xs):.2f}), Y({min(ys):.2f}~{max(ys):.2f}), Z({min(zs):.2f}~{max(zs):.2f})"
+                    f"[LX]   {obj.name}: X({x0:.2f}~{x1:.2f}), Y({y0:.2f}~{y1:.2f}), Z({z0:.2f}~{z1:.2f})"
                 )
             print(f"[LX] 为 {obj.name} 添加蒙皮...")
 
@@ -352,56 +289,34 @@ class SKC_OT_import(bpy.types.Operator):
                     obj.vertex_groups.new(name=bone_data.bone_name)
             print(f"[LX] {obj.name} 顶点组创建完成，共 {len(obj.vertex_groups)} 个")
 
-            # 设置权重
-            print(
-                f"[LX] {obj.name} 检查权重数据: bone_ids长度={len(obj_data.bone_ids)}, 顶点数={len(obj_data.verts)}"
-            )
-            print(
-                f"[LX] 可用骨骼: {[b.bone_name for b in bones[:5]]}... (共{len(bones)}个)"
-            )
+            # 设置权重：按骨骼分组，同一骨骼上权重相同的顶点一次写入
+            skin = obj_data.skin
+            if skin is not None and len(skin.bone_ids) > 0:
+                out_of_range = int((skin.bone_ids >= len(bones)).sum())
+                if out_of_range:
+                    print(f"[LX] 骨骼ID越界: {out_of_range} 条, 骨骼总数={len(bones)}")
 
-            if obj_data.bone_ids and len(obj_data.bone_ids) > 0:
                 weight_count = 0
-                error_count = 0
-
-                # 打印前几个顶点的权重信息用于调试
-                for vert_idx in range(min(3, len(obj_data.verts))):
-                    if vert_idx < len(obj_data.bone_ids):
-                        bone_ids = obj_data.bone_ids[vert_idx]
-                        weights = obj_data.weight_array[vert_idx]
-                        print(
-                            f"[LX] 顶点{vert_idx}: 骨骼IDs={bone_ids}, 权重={weights}"
-                        )
-
-                for vert_idx in range(len(obj_data.verts)):
-                    if vert_idx < len(obj_data.bone_ids):
-                        bone_ids = obj_data.bone_ids[vert_idx]
-                        weights = obj_data.weight_array[vert_idx]
-
-                        for i, bone_id in enumerate(bone_ids):
-                            if bone_id < len(bones) and i < len(weights):
-                                bone_name = bones[bone_id].bone_name
-                                weight = weights[i]
-                                if weight > 0:
-                                    try:
-                                        vgroup = obj.vertex_groups[bone_name]
-                                        vgroup.add([vert_idx], weight, "REPLACE")
-                                        weight_count += 1
-                                    except Exception as e:
-                                        if error_count < 5:
-                                            print(
-                                                f"[LX] 权重设置错误: 顶点{vert_idx}, 骨骼'{bone_name}': {e}"
-                                            )
-                                        error_count += 1
-                            else:
-                                if error_count < 5:
-                                    print(
-                                        f"[LX] 骨骼ID越界: bone_id={bone_id}, 骨骼总数={len(bones)}"
-                                    )
-                                error_count += 1
+                call_count = 0
+                for bone_id, (verts, weights) in enumerate(
+                    skin.bone_vertices(len(bones))
+                ):
+                    positive = weights > 0
+                    if not positive.any():
+                        continue
+                    verts, weights = verts[positive], weights[positive]
+                    vgroup = obj.vertex_groups[bones[bone_id].bone_name]
+                    values, inverse = np.unique(weights, return_inverse=True)
+                    order = np.argsort(inverse, kind="stable")
+                    splits = np.cumsum(np.bincount(inverse))[:-1]
+                    for value, group in zip(values, np.split(verts[order], splits)):
+                        vgroup.add(group.tolist(), float(value), "REPLACE")
+                        call_count += 1
+                    weight_count += len(verts)
 
                 print(
-                    f"[LX] {obj.name} 权重设置完成，共设置 {weight_count} 个权重, 错误: {error_count}"
+                    f"[LX] {obj.name} 权重设置完成，共设置 {weight_count} 个权重 "
+                    f"({call_count} 次写入)"
                 )
             else:
                 print(f"[LX] {obj.name} 没有权重数据")
@@ -413,6 +328,30 @@ class SKC_OT_import(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
 
+def _validate_object(obj_data, repair) -> bool:
+    """校验单个解析结果，未开启修复且存在无效面索引时返回False"""
+    from .import_utils.validate import validate_mesh
+
+    report = validate_mesh(obj_data, repair=repair)
+    print(f"[LX] 校验 {report.summary()}")
+    return "bad_index" not in report.remaining
+
+
+def _validate_objects(operator, objects, repair):
+    """在创建网格前校验解析结果，未开启修复且存在无效索引时报告错误并返回False"""
+    fatal = [
+        obj_data.skin_name
+        for obj_data in objects
+        if not _validate_object(obj_data, repair)
+    ]
+    if fatal:
+        operator.report(
+            {"ERROR"}, f"面索引越界: {', '.join(fatal)}，请开启自动修复后重新导入"
+        )
+        return False
+    return True
+
+
 class GMC_OT_import(bpy.types.Operator):
     """导入流星GMB/GMC模型"""
 
@@ -422,60 +361,173 @@ class GMC_OT_import(bpy.types.Operator):
 
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
     filter_glob: bpy.props.StringProperty(default="*.gmb;*.gmc", options={"HIDDEN"})
+    auto_repair: bpy.props.BoolProperty(
+        name="自动修复",
+        default=True,
+        description="删除越界、退化和重复的面，修正NaN顶点/UV",
+    )
 
     def execute(self, context):
         print(f"[LX] 开始导入GMB/GMC: {self.filepath}")
         try:
+            from . import import_utils
+
             ext = os.path.splitext(self.filepath)[1].lower()
 
+            # 逐个解析、校验并创建网格，解析结果不会同时全部留在内存中
             if ext == ".gmb":
-                from . import import_utils
-
-                reader = import_utils.GMBReader(self.filepath)
-                result = reader.read_gmb()
-                print(f"[LX] GMB读取结果类型: {type(result)}")
-                if isinstance(result, tuple) and len(result) == 3:
-                    objects, materials, textures = result
-                else:
-                    objects = result
-                    materials = []
-                    textures = []
+                objects = import_utils.GMBReader(self.filepath).iter_gmb()
             else:
-                from . import import_utils
-
-                reader = import_utils.GMCReader(self.filepath)
-                objects, materials, textures = reader.read_gmc()
-
-            print(f"[LX] 对象数量: {len(objects)}")
+                objects = import_utils.GMCReader(self.filepath).iter_gmc()
 
             bpy.ops.object.select_all(action="DESELECT")
 
+            count = 0
+            fatal = []
             for idx, obj_data in enumerate(objects):
-                print(f"[LX] 处理对象 {idx}: {obj_data.skin_name}")
                 print(
-                    f"[LX]   verts: {len(obj_data.verts)}, faces: {len(obj_data.faces)}"
+                    f"[LX] 处理对象 {idx}: {obj_data.skin_name}, "
+                    f"verts: {len(obj_data.verts)}, faces: {len(obj_data.faces)}"
+                )
+                if not _validate_object(obj_data, self.auto_repair):
+                    fatal.append(obj_data.skin_name)
+                elif len(obj_data.verts) > 0:
+                    mesh = _build_mesh(obj_data)
+                    obj = bpy.data.objects.new(obj_data.skin_name, mesh)
+                    bpy.context.collection.objects.link(obj)
+                    count += 1
+                # 解析下一个对象前释放当前对象
+                del obj_data
+
+            if fatal:
+                self.report(
+                    {"WARNING"},
+                    f"成功导入 {count} 个模型对象，跳过面索引越界的对象: "
+                    f"{', '.join(fatal)}，请开启自动修复后重新导入",
                 )
-                print(f"[LX]   faces类型: {type(obj_data.faces)}")
-                if len(obj_data.faces) > 0:
-                    print(f"[LX]   第一个面: {obj_data.faces[0]}")
+            else:
+                self.report({"INFO"}, f"成功导入 {count} 个模型对象")
+            return {"FINISHED"}
 
-                if len(obj_data.verts) == 0:
-                    continue
+        except Exception as e:
+            import traceback
 
-                mesh = bpy.data.meshes.new(obj_data.skin_name)
-                mesh.from_pydata(obj_data.verts, [], obj_data.faces)
-                mesh.update()
+            traceback.print_exc()
+            self.report({"ERROR"}, f"导入失败: {str(e)}")
+            return {"CANCELLED"}
 
-                # 启用平滑着色
-                for poly in mesh.polygons:
-                    poly.use_smooth = True
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
 
-                mesh.update()
 
-                obj = bpy.data.objects.new(obj_data.skin_name, mesh)
-                bpy.context.collection.objects.link(obj)
+def _build_mesh(obj_data, name=None):
+    """由解析出的 LXObject 创建网格数据块（平滑着色，UV按面角写入）"""
+    import numpy as np
 
-            self.report({"INFO"}, f"成功导入 {len(objects)} 个模型对象")
+    mesh = bpy.data.meshes.new(name or obj_data.skin_name)
+    mesh.from_pydata(obj_data.verts, [], obj_data.faces)
+    mesh.polygons.foreach_set("use_smooth", np.ones(len(mesh.polygons), dtype=bool))
+
+    if len(obj_data.uvs) == len(obj_data.verts) and len(obj_data.faces) > 0:
+        # 三角面的面角顺序与 faces 中的顶点顺序一致
+        uvs = np.array([uv[:2] for uv in obj_data.uvs], dtype=np.float32)
+        loop_verts = np.asarray(obj_data.faces, dtype=np.int64).ravel()
+        if len(loop_verts) == len(mesh.loops):
+            uv_layer = mesh.uv_layers.new(name="UV")
+            uv_layer.data.foreach_set("uv", uvs[loop_verts].ravel())
+
+    mesh.update()
+    return mesh
+
+
+def _geometry_digest(obj_data) -> bytes:
+    """网格几何内容的摘要，相同几何共用一个网格数据块"""
+    import hashlib
+    import numpy as np
+
+    h = hashlib.blake2b(digest_size=16)
+    h.update(np.asarray(obj_data.verts, dtype=np.float32).tobytes())
+    h.update(np.asarray(obj_data.faces, dtype=np.int64).tobytes())
+    h.update(np.asarray([uv[:2] for uv in obj_data.uvs], dtype=np.float32).tobytes())
+    return h.digest()
+
+
+class DES_OT_import(bpy.types.Operator):
+    """导入DES场景（按DES摆放同名GMB/GMC中的对象）"""
+
+    bl_idname = "lx.import_des"
+    bl_label = "导入DES场景"
+    bl_options = {"PRESET"}
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.des", options={"HIDDEN"})
+    share_meshes: bpy.props.BoolProperty(
+        name="共享相同网格",
+        default=True,
+        description="几何相同的对象使用关联复制，共用同一个网格数据块",
+    )
+
+    def execute(self, context):
+        try:
+            from . import import_utils
+
+            placements = import_utils.DESReader(self.filepath).read_des()
+
+            base = os.path.splitext(self.filepath)[0]
+            model_path = next(
+                (base + ext for ext in (".gmb", ".gmc") if os.path.exists(base + ext)),
+                None,
+            )
+            if model_path is None:
+                self.report({"ERROR"}, "找不到与DES同名的GMB/GMC文件")
+                return {"CANCELLED"}
+
+            if model_path.endswith(".gmb"):
+                objects = import_utils.GMBReader(model_path).iter_gmb()
+            else:
+                objects = import_utils.GMCReader(model_path).iter_gmc()
+
+            # 逐个解析对象并立即创建网格，只保留摆放中用到的网格数据块
+            used = {placement.name for placement in placements}
+            meshes = {}  # 几何摘要 -> 网格数据块
+            mesh_of_name = {}  # 对象名 -> 网格数据块
+            for obj_data in objects:
+                name = obj_data.skin_name
+                if name not in used or name in mesh_of_name or not obj_data.verts:
+                    continue
+                key = _geometry_digest(obj_data) if self.share_meshes else name
+                mesh = meshes.get(key)
+                if mesh is None:
+                    mesh = _build_mesh(obj_data)
+                    meshes[key] = mesh
+                mesh_of_name[name] = mesh
+
+            collection = bpy.data.collections.new(os.path.basename(base))
+            context.scene.collection.children.link(collection)
+
+            empty_count = 0
+            for placement in placements:
+                mesh = mesh_of_name.get(placement.name)
+                if mesh is None:
+                    empty_count += 1
+
+                obj = bpy.data.objects.new(placement.name, mesh)
+                obj.location = placement.pos
+                obj.rotation_mode = "QUATERNION"
+                obj.rotation_quaternion = placement.rot
+                if placement.custom:
+                    obj["lx_custom"] = "\n".join(placement.custom)
+                collection.objects.link(obj)
+
+            print(
+                f"[LX] DES导入: {len(placements)} 个摆放, {len(meshes)} 个网格数据块, "
+                f"{empty_count} 个空对象"
+            )
+            self.report(
+                {"INFO"},
+                f"成功导入 {len(placements)} 个对象，共用 {len(meshes)} 个网格",
+            )
             return {"FINISHED"}
 
         except Exception as e:
@@ -490,6 +542,247 @@ class GMC_OT_import(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
 
+# 已打开的流式索引: (GMB路径, 单元大小) -> LevelIndex
+_stream_indexes = {}
+
+
+def _stream_index(scene):
+    from .import_utils.streaming import LevelIndex
+
+    key = (bpy.path.abspath(scene.lx_stream_path), scene.lx_stream_cell_size)
+    index = _stream_indexes.get(key)
+    if index is None:
+        index = LevelIndex.open(*key)
+        _stream_indexes[key] = index
+    return index
+
+
+def _stream_focus(context):
+    """流式加载的中心点：3D游标，或在勾选时使用视口中心"""
+    if context.scene.lx_stream_use_view:
+        for area in context.screen.areas if context.screen else []:
+            if area.type == "VIEW_3D":
+                return tuple(area.spaces.active.region_3d.view_location)
+    return tuple(context.scene.cursor.location)
+
+
+class STREAM_OT_open(bpy.types.Operator):
+    """为GMB/DES关卡建立（或读取已保存的）流式网格索引"""
+
+    bl_idname = "lx.stream_level"
+    bl_label = "打开流式关卡"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.gmb", options={"HIDDEN"})
+
+    def execute(self, context):
+        try:
+            context.scene.lx_stream_path = self.filepath
+            index = _stream_index(context.scene)
+            self.report(
+                {"INFO"},
+                f"流式索引: {len(index.entries)} 个条目, {len(index.cells)} 个单元",
+            )
+            return bpy.ops.lx.stream_update()
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"打开失败: {str(e)}")
+            return {"CANCELLED"}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+
+class STREAM_OT_update(bpy.types.Operator):
+    """加载包围盒与中心点附近单元相交的摆放，卸载离开范围的摆放"""
+
+    bl_idname = "lx.stream_update"
+    bl_label = "更新流式加载"
+
+    def execute(self, context):
+        try:
+            scene = context.scene
+            if not scene.lx_stream_path:
+                self.report({"ERROR"}, "请先打开流式关卡")
+                return {"CANCELLED"}
+            index = _stream_index(scene)
+
+            root_name = "LX_Stream_" + os.path.basename(scene.lx_stream_path)
+            root = bpy.data.collections.get(root_name)
+            if root is None:
+                root = bpy.data.collections.new(root_name)
+                scene.collection.children.link(root)
+
+            cells = index.cells_near(_stream_focus(context), scene.lx_stream_radius)
+            wanted = index.entries_in(cells)
+
+            # 旧版本按单元建立的子集合: 整体卸载，按条目重新加载
+            for collection in list(root.children):
+                if "lx_cell" in collection:
+                    for obj in list(collection.objects):
+                        bpy.data.objects.remove(obj, do_unlink=True)
+                    bpy.data.collections.remove(collection)
+
+            # 已加载的摆放: 条目序号 -> 对象；已在场景中的网格: GMB偏移 -> 网格数据块
+            # （偏移按字符串保存在网格上，ID属性的整数只有32位）
+            loaded = {}
+            meshes = {}
+            for obj in root.objects:
+                if "lx_entry" in obj:
+                    loaded[obj["lx_entry"]] = obj
+                if obj.data is not None and "lx_offset" in obj.data:
+                    meshes[int(obj.data["lx_offset"])] = obj.data
+
+            # 卸载：摆放覆盖的单元都不在范围内时删除对象和不再被使用的网格
+            unloaded = 0
+            for entry_idx, obj in loaded.items():
+                if entry_idx in wanted:
+                    continue
+                mesh = obj.data
+                bpy.data.objects.remove(obj, do_unlink=True)
+                if mesh is not None and mesh.users == 0:
+                    meshes.pop(int(mesh.get("lx_offset", -1)), None)
+                    bpy.data.meshes.remove(mesh)
+                unloaded += 1
+
+            # 加载：只解码新进入范围的摆放，同一GMB对象的所有摆放共用一个网格
+            new_entries = wanted - set(loaded)
+            for entry_idx, entry, obj_data in index.read_entries(new_entries):
+                mesh = meshes.get(entry["offset"])
+                if mesh is None and len(obj_data.verts) > 0:
+                    mesh = _build_mesh(obj_data)
+                    mesh["lx_offset"] = str(entry["offset"])
+                    meshes[entry["offset"]] = mesh
+                obj = bpy.data.objects.new(entry["name"], mesh)
+                obj["lx_entry"] = entry_idx
+                obj.location = entry["pos"]
+                obj.rotation_mode = "QUATERNION"
+                obj.rotation_quaternion = entry["rot"]
+                root.objects.link(obj)
+
+            print(
+                f"[LX] 流式更新: 范围内 {len(cells)} 个单元, 加载 {len(new_entries)} 个对象, "
+                f"卸载 {unloaded} 个对象, 共用 {len(meshes)} 个网格"
+            )
+            self.report(
+                {"INFO"},
+                f"加载 {len(new_entries)} 个对象, 卸载 {unloaded} 个对象",
+            )
+            return {"FINISHED"}
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"更新失败: {str(e)}")
+            return {"CANCELLED"}
+
+
+# 最近一次资源目录查询的结果，由 LX_PT_catalog 显示
+catalog_results = []
+
+# 资源格式对应的导入操作
+CATALOG_IMPORTERS = {
+    "skc": "lx.import_skc",
+    "gmb": "lx.import_gmc",
+    "gmc": "lx.import_gmc",
+    "des": "lx.import_des",
+    "amb": "lx.import_amb",
+    "fmc": "lx.import_fmc",
+}
+
+
+class CATALOG_OT_scan(bpy.types.Operator):
+    """扫描资源目录，只读取新增或修改文件的文件头"""
+
+    bl_idname = "lx.catalog_scan"
+    bl_label = "扫描资源目录"
+
+    def execute(self, context):
+        try:
+            from .import_utils.catalog import AssetCatalog
+
+            root = bpy.path.abspath(context.scene.lx_catalog_root)
+            if not os.path.isdir(root):
+                self.report({"ERROR"}, "请先选择资源目录")
+                return {"CANCELLED"}
+
+            with AssetCatalog.for_root(root) as catalog:
+                stats = catalog.scan(root, workers=os.cpu_count() or 1)
+            print(f"[LX] 资源目录扫描: {stats}")
+            self.report(
+                {"INFO"},
+                f"新增 {stats['added']}, 更新 {stats['updated']}, "
+                f"未变 {stats['unchanged']}, 删除 {stats['removed']}",
+            )
+            return bpy.ops.lx.catalog_query()
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"扫描失败: {str(e)}")
+            return {"CANCELLED"}
+
+
+class CATALOG_OT_query(bpy.types.Operator):
+    """按过滤条件查询资源目录"""
+
+    bl_idname = "lx.catalog_query"
+    bl_label = "查询资源"
+
+    def execute(self, context):
+        try:
+            from .import_utils.catalog import AssetCatalog
+
+            scene = context.scene
+            root = bpy.path.abspath(scene.lx_catalog_root)
+            if not os.path.exists(os.path.join(root, AssetCatalog.FILENAME)):
+                self.report({"ERROR"}, "资源目录尚未扫描")
+                return {"CANCELLED"}
+
+            with AssetCatalog.for_root(root) as catalog:
+                catalog_results[:] = catalog.query(
+                    scene.lx_catalog_filter, limit=scene.lx_catalog_limit
+                )
+            self.report({"INFO"}, f"找到 {len(catalog_results)} 个资源")
+            return {"FINISHED"}
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"查询失败: {str(e)}")
+            return {"CANCELLED"}
+
+
+# 关键帧插值方式的枚举值
+_INTERPOLATION = {"CONSTANT": 0, "LINEAR": 1, "BEZIER": 2}
+
+
+def _write_fcurve_keys(action, data_path, group, keys, values, interpolation="LINEAR"):
+    """用 foreach_set 一次性写入一组通道的全部关键帧
+
+    keys: (k,) 帧号，values: (k, 通道数)，每个通道对应 data_path 的一个分量。
+    """
+    import numpy as np
+
+    ipo = np.full(len(keys), _INTERPOLATION[interpolation], dtype=np.int32)
+    co = np.empty((len(keys), 2), dtype=np.float32)
+    co[:, 0] = keys
+    for k in range(values.shape[1]):
+        fcurve = action.fcurves.new(data_path, index=k, action_group=group)
+        fcurve.keyframe_points.add(len(keys))
+        co[:, 1] = values[:, k]
+        fcurve.keyframe_points.foreach_set("co", co.ravel())
+        fcurve.keyframe_points.foreach_set("interpolation", ipo)
+        fcurve.update()
+
+
 class AMB_OT_import(bpy.types.Operator):
     """导入流星AMB动作文件"""
 
@@ -499,29 +792,264 @@ class AMB_OT_import(bpy.types.Operator):
 
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
     filter_glob: bpy.props.StringProperty(default="*.amb", options={"HIDDEN"})
+    bnc_path: bpy.props.StringProperty(
+        name="BNC骨骼文件",
+        default="",
+        subtype="FILE_PATH",
+        description="留空时使用导入SKC时记录的BNC文件",
+    )
+    reduce_keys: bpy.props.BoolProperty(
+        name="精简关键帧",
+        default=False,
+        description="删除可由插值还原的关键帧",
+    )
+    reduce_mode: bpy.props.EnumProperty(
+        name="插值方式",
+        items=[
+            ("LINEAR", "线性", "按线性插值判断误差"),
+            ("BEZIER", "贝塞尔", "按自动钳制贝塞尔插值判断误差"),
+        ],
+        default="LINEAR",
+    )
+    rot_tolerance: bpy.props.FloatProperty(
+        name="旋转容差(度)", default=0.1, min=0.0, max=10.0
+    )
+    loc_tolerance: bpy.props.FloatProperty(
+        name="位移容差", default=0.01, min=0.0, max=10.0
+    )
+    frame_start: bpy.props.IntProperty(
+        name="起始帧", default=0, min=0, description="只解码从此帧开始的数据"
+    )
+    frame_end: bpy.props.IntProperty(
+        name="结束帧", default=-1, min=-1, description="包含此帧，-1表示到最后一帧"
+    )
+    frame_step: bpy.props.IntProperty(
+        name="帧间隔", default=1, min=1, description="每隔几帧取一帧，用于快速预览"
+    )
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "bnc_path")
+        col = layout.column(align=True)
+        col.prop(self, "frame_start")
+        col.prop(self, "frame_end")
+        col.prop(self, "frame_step")
+        layout.prop(self, "reduce_keys")
+        if self.reduce_keys:
+            layout.prop(self, "reduce_mode")
+            layout.prop(self, "rot_tolerance")
+            layout.prop(self, "loc_tolerance")
 
     def execute(self, context):
         try:
             from . import import_utils
 
             reader = import_utils.AMBReader(self.filepath)
-            animations, bones, dummies = reader.read_amb()
+            stop = self.frame_end + 1 if self.frame_end >= 0 else None
+            rotations, root_positions, frames = reader.read_frames(
+                self.frame_start, stop, self.frame_step
+            )
+            frame_num = len(rotations)
+            if frame_num == 0:
+                self.report({"ERROR"}, f"帧范围超出AMB文件的 {reader.frames} 帧")
+                return {"CANCELLED"}
+            # 关键帧从0开始，保持采样间隔
+            frame_numbers = frames - frames[0]
 
             bpy.context.scene.frame_start = 0
-            bpy.context.scene.frame_end = len(animations) - 1
+            bpy.context.scene.frame_end = int(frame_numbers[-1])
+
+            armature_obj = context.active_object
+            if armature_obj is None or armature_obj.type != "ARMATURE":
+                armature_obj = next(
+                    (o for o in context.selected_objects if o.type == "ARMATURE"), None
+                )
+            bnc_path = self.bnc_path
+            if armature_obj is not None and not bnc_path:
+                bnc_path = armature_obj.get("lx_bnc_path", "")
+
+            if armature_obj is None or not bnc_path or not os.path.exists(bnc_path):
+                self.report(
+                    {"WARNING"},
+                    f"已读取AMB动作，共 {frame_num} 帧；未选择骨骼或缺少BNC文件，未应用动作",
+                )
+                return {"FINISHED"}
+
+            bones, _, _ = import_utils.read_bnc(bnc_path)
+            if len(bones) != rotations.shape[1]:
+                self.report(
+                    {"ERROR"},
+                    f"AMB节点数 {rotations.shape[1]} 与BNC骨骼数 {len(bones)} 不一致",
+                )
+                return {"CANCELLED"}
+
+            ratio = self.apply_to_armature(
+                armature_obj, bones, rotations, root_positions, frame_numbers
+            )
 
-            self.report({"INFO"}, f"成功导入AMB动作，共 {len(animations)} 帧")
+            self.report(
+                {"INFO"},
+                f"成功导入AMB动作，共 {frame_num} 帧，关键帧保留比例 {ratio:.1%}",
+            )
             return {"FINISHED"}
 
         except Exception as e:
+            import traceback
+
+            traceback.print_exc()
             self.report({"ERROR"}, f"导入失败: {str(e)}")
             return {"CANCELLED"}
 
+    def apply_to_armature(
+        self, armature_obj, bones, rotations, root_positions, frame_numbers=None
+    ):
+        """把AMB数据转换为骨骼基础变换并写入新动作，返回关键帧保留比例
+
+        frame_numbers 为每个采样对应的关键帧帧号，默认为 0..n-1。
+        """
+        import numpy as np
+        from . import import_utils
+        from . import math_utils
+        from .import_utils import keyframes
+
+        pivots, quats, parents = import_utils.bone_arrays(bones)
+        rest_local = math_utils.compose_matrix(pivots, quats)
+        skin = import_utils.amb_to_skin(rotations, root_positions, rest_local, parents)
+        node_index = {b.bone_name: i for i, b in enumerate(bones)}
+
+        # Blender骨骼的静止矩阵和层级
+        data_bones = armature_obj.data.bones
+        rest = _foreach_get_matrices(data_bones, "matrix_local")
+        bone_index = {b.name: i for i, b in enumerate(data_bones)}
+        bone_parents = np.array(
+            [bone_index[b.parent.name] if b.parent else -1 for b in data_bones]
+        )
+
+        # 骨架空间姿态: pose = skin @ rest，没有对应节点的骨骼保持静止
+        frame_num = len(rotations)
+        pose = np.broadcast_to(rest, (frame_num,) + rest.shape).copy()
+        for i, bone in enumerate(data_bones):
+            node = node_index.get(bone.name)
+            if node is not None:
+                pose[:, i] = skin[:, node] @ rest[i]
+
+        # basis = inv(inv(父rest) @ rest) @ inv(父pose) @ pose
+        relative = rest.copy()
+        has_parent = np.flatnonzero(bone_parents >= 0)
+        relative[has_parent] = (
+            math_utils.invert_rigid(rest[bone_parents[has_parent]]) @ rest[has_parent]
+        )
+        basis = math_utils.invert_rigid(relative)[None] @ math_utils.world_to_local(
+            pose, bone_parents
+        )
+        locations = basis[..., :3, 3]
+        quaternions = math_utils.quat_make_continuous(
+            math_utils.matrix_to_quat(basis), axis=0
+        )
+
+        armature_obj.animation_data_create()
+        action = bpy.data.actions.new(
+            name=os.path.splitext(os.path.basename(self.filepath))[0]
+        )
+        armature_obj.animation_data.action = action
+
+        interpolation = self.reduce_mode if self.reduce_keys else "LINEAR"
+        all_frames = np.arange(frame_num)
+        if frame_numbers is None:
+            frame_numbers = all_frames
+        total_keys = 0
+        kept_keys = 0
+        if self.reduce_keys:
+            print(
+                "[LX] 关键帧精简: 骨骼 / 旋转保留 / 旋转误差(度) / 位移保留 / 位移误差"
+            )
+
+        for i, bone in enumerate(data_bones):
+            pose_bone = armature_obj.pose.bones[bone.name]
+            pose_bone.rotation_mode = "QUATERNION"
+
+            rot_keys = loc_keys = all_frames
+            rot_error = loc_error = 0.0
+            if self.reduce_keys:
+                rot_keys, rot_error = keyframes.reduce_keyframes(
+                    quaternions[:, i],
+                    self.rot_tolerance,
+                    self.reduce_mode,
+                    keyframes.quaternion_angle_error,
+                )
+                loc_keys, loc_error = keyframes.reduce_keyframes(
+                    locations[:, i], self.loc_tolerance, self.reduce_mode
+                )
+                print(
+                    f"[LX]   {bone.name}: {len(rot_keys)}/{frame_num} {rot_error:.4f} "
+                    f"{len(loc_keys)}/{frame_num} {loc_error:.4f} "
+                    f"压缩比 {2 * frame_num / (len(rot_keys) + len(loc_keys)):.1f}x"
+                )
+
+            base = f'pose.bones["{bpy.utils.escape_identifier(bone.name)}"]'
+            _write_fcurve_keys(
+                action,
+                base + ".rotation_quaternion",
+                bone.name,
+                frame_numbers[rot_keys],
+                quaternions[rot_keys, i],
+                interpolation,
+            )
+            _write_fcurve_keys(
+                action,
+                base + ".location",
+                bone.name,
+                frame_numbers[loc_keys],
+                locations[loc_keys, i],
+                interpolation,
+            )
+            total_keys += frame_num * 7
+            kept_keys += len(rot_keys) * 4 + len(loc_keys) * 3
+
+        return kept_keys / max(total_keys, 1)
+
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {"RUNNING_MODAL"}
 
 
+def _foreach_get_matrices(collection, attr: str):
+    """批量读取集合中每个元素的4x4矩阵属性，返回 (n, 4, 4) 行主序数组"""
+    import numpy as np
+
+    buf = np.empty(len(collection) * 16, dtype=np.float32)
+    collection.foreach_get(attr, buf)
+    # RNA中矩阵按列主序存储，转置为与 mathutils 一致的行主序
+    return buf.reshape(-1, 4, 4).transpose(0, 2, 1).astype(np.float64)
+
+
+def _sample_fcurve(fcurve, frames, default: float):
+    """在给定帧上采样F曲线
+
+    全部关键帧为线性插值且没有曲线修改器时直接用 np.interp 向量化计算，
+    否则逐帧调用 fcurve.evaluate（仍然不需要 frame_set 刷新场景）。
+    """
+    import numpy as np
+
+    if fcurve is None or len(fcurve.keyframe_points) == 0:
+        return np.full(len(frames), default, dtype=np.float64)
+
+    points = fcurve.keyframe_points
+    linear = (
+        not fcurve.modifiers
+        and fcurve.extrapolation == "CONSTANT"
+        and all(kp.interpolation == "LINEAR" for kp in points)
+    )
+    if linear:
+        co = np.empty(len(points) * 2, dtype=np.float64)
+        points.foreach_get("co", co)
+        return np.interp(frames, co[0::2], co[1::2])
+
+    return np.fromiter(
+        (fcurve.evaluate(float(f)) for f in frames), dtype=np.float64, count=len(frames)
+    )
+
+
 class AMB_OT_export(bpy.types.Operator):
     """导出流星AMB动作文件"""
 
@@ -530,6 +1058,12 @@ class AMB_OT_export(bpy.types.Operator):
 
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
     filter_glob: bpy.props.StringProperty(default="*.amb", options={"HIDDEN"})
+    bnc_path: bpy.props.StringProperty(
+        name="BNC骨骼文件",
+        default="",
+        subtype="FILE_PATH",
+        description="留空时使用导入SKC时记录的BNC文件",
+    )
 
     @classmethod
     def poll(cls, context):
@@ -537,16 +1071,221 @@ class AMB_OT_export(bpy.types.Operator):
 
     def execute(self, context):
         try:
+            import numpy as np
             from . import export_utils
+            from . import import_utils
+            from . import math_utils
+
+            armature_obj = context.active_object
+            if armature_obj is None or armature_obj.type != "ARMATURE":
+                armature_obj = next(
+                    (o for o in context.selected_objects if o.type == "ARMATURE"), None
+                )
+            if armature_obj is None:
+                self.report({"ERROR"}, "没有选择骨骼对象")
+                return {"CANCELLED"}
+
+            bnc_path = self.bnc_path or armature_obj.get("lx_bnc_path", "")
+            if not bnc_path or not os.path.exists(bnc_path):
+                self.report({"ERROR"}, "找不到BNC骨骼文件，请指定BNC路径")
+                return {"CANCELLED"}
+
+            bones, _, _ = import_utils.read_bnc(bnc_path)
+            bone_num = sum(1 for b in bones if b.bone_type == 1)
+            dummey_num = len(bones) - bone_num
+            pivots, quats, parents = import_utils.bone_arrays(bones)
+            rest_local = math_utils.compose_matrix(pivots, quats)
+
+            scene = context.scene
+            frames = np.arange(scene.frame_start, scene.frame_end + 1, dtype=np.float64)
+
+            skin, has_bone = self.bake_skin_matrices(
+                context, armature_obj, [b.bone_name for b in bones], frames
+            )
+            rotations, root_positions = export_utils.pose_to_amb(
+                skin, has_bone, rest_local, parents
+            )
 
-            writer = export_utils.AMBWriter(self.filepath)
-            self.report({"INFO"}, f"成功导出AMB动作文件")
+            writer = export_utils.AMBWriter(
+                self.filepath, checksum=context.scene.lx_export_checksum
+            )
+            writer.write(rotations, root_positions, bone_num, dummey_num)
+
+            self.report(
+                {"INFO"},
+                f"成功导出AMB动作文件，共 {len(frames)} 帧 ({writer.bytes_written} 字节, {writer.elapsed:.2f}s)",
+            )
             return {"FINISHED"}
 
         except Exception as e:
+            import traceback
+
+            traceback.print_exc()
             self.report({"ERROR"}, f"导出失败: {str(e)}")
             return {"CANCELLED"}
 
+    def bake_skin_matrices(self, context, armature_obj, node_names, frames):
+        """烘焙每帧每个节点的蒙皮矩阵 pose @ inv(rest)
+
+        返回 (skin (帧数, 节点数, 4, 4), has_bone (节点数,))
+        """
+        import numpy as np
+        from . import math_utils
+
+        data_bones = armature_obj.data.bones
+        bone_index = {b.name: i for i, b in enumerate(data_bones)}
+        rest = _foreach_get_matrices(data_bones, "matrix_local")
+
+        if self.can_sample_fcurves(armature_obj):
+            print("[LX] AMB导出: 直接采样F曲线")
+            pose = self.sample_pose_fcurves(armature_obj, frames, rest, bone_index)
+        else:
+            print("[LX] AMB导出: 逐帧刷新场景采样")
+            pose = self.sample_pose_frames(context, armature_obj, frames, bone_index)
+
+        skin = pose @ math_utils.invert_rigid(rest)
+
+        node_bone = np.array([bone_index.get(name, -1) for name in node_names])
+        has_bone = node_bone >= 0
+        node_skin = np.zeros((len(frames), len(node_names), 4, 4), dtype=np.float64)
+        node_skin[:, has_bone] = skin[:, node_bone[has_bone]]
+        missing = [name for name, ok in zip(node_names, has_bone) if not ok]
+        if missing:
+            print(f"[LX] 以下节点没有对应骨骼，保持静止姿态: {missing}")
+        return node_skin, has_bone
+
+    @staticmethod
+    def can_sample_fcurves(armature_obj) -> bool:
+        """动作只由F曲线驱动时可以绕过 frame_set 直接采样"""
+        anim = armature_obj.animation_data
+        if anim is None or anim.action is None:
+            return False
+        if anim.drivers or any(not track.mute for track in anim.nla_tracks):
+            return False
+        for pose_bone in armature_obj.pose.bones:
+            if pose_bone.constraints or pose_bone.rotation_mode != "QUATERNION":
+                return False
+        return True
+
+    @staticmethod
+    def sample_pose_fcurves(armature_obj, frames, rest, bone_index):
+        """从F曲线采样各骨骼的基础变换，按骨骼层级得到骨架空间姿态矩阵"""
+        import numpy as np
+        from . import math_utils
+
+        curves = {
+            (fc.data_path, fc.array_index): fc
+            for fc in armature_obj.animation_data.action.fcurves
+        }
+        bone_num = len(rest)
+        loc = np.zeros((len(frames), bone_num, 3), dtype=np.float64)
+        rot = np.zeros((len(frames), bone_num, 4), dtype=np.float64)
+        parents = np.full(bone_num, -1, dtype=np.int64)
+
+        for pose_bone in armature_obj.pose.bones:
+            i = bone_index[pose_bone.name]
+            if pose_bone.parent is not None:
+                parents[i] = bone_index[pose_bone.parent.name]
+            base = f'pose.bones["{bpy.utils.escape_identifier(pose_bone.name)}"]'
+            for k in range(3):
+                fc = curves.get((base + ".location", k))
+                loc[:, i, k] = _sample_fcurve(fc, frames, pose_bone.location[k])
+            for k in range(4):
+                fc = curves.get((base + ".rotation_quaternion", k))
+                rot[:, i, k] = _sample_fcurve(
+                    fc, frames, pose_bone.rotation_quaternion[k]
+                )
+
+        # pose = 父pose @ inv(父rest) @ rest @ basis
+        relative = rest.copy()
+        has_parent = np.flatnonzero(parents >= 0)
+        relative[has_parent] = (
+            math_utils.invert_rigid(rest[parents[has_parent]]) @ rest[has_parent]
+        )
+        basis = math_utils.compose_matrix(loc, rot)
+        return math_utils.accumulate_world(relative[None] @ basis, parents)
+
+    @staticmethod
+    def sample_pose_frames(context, armature_obj, frames, bone_index):
+        """逐帧刷新场景并批量读取骨架空间姿态矩阵（有约束/驱动器时使用）"""
+        import numpy as np
+
+        scene = context.scene
+        current = scene.frame_current
+        pose_bones = armature_obj.pose.bones
+        order = np.array([bone_index[pb.name] for pb in pose_bones])
+        pose = np.empty((len(frames), len(pose_bones), 4, 4), dtype=np.float64)
+        for i, frame in enumerate(frames):
+            scene.frame_set(int(frame))
+            pose[i, order] = _foreach_get_matrices(pose_bones, "matrix")
+        scene.frame_set(current)
+        return pose
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+
+class FMC_OT_import(bpy.types.Operator):
+    """导入FMC道具/武器动画"""
+
+    bl_idname = "lx.import_fmc"
+    bl_label = "导入FMC动画"
+    bl_options = {"PRESET"}
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.fmc", options={"HIDDEN"})
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.selected_objects) > 0
+
+    def execute(self, context):
+        try:
+            import numpy as np
+            from . import import_utils
+
+            reader = import_utils.FMCReader(self.filepath)
+            samples = reader.read_fmc()
+            frame_num, object_num = samples.shape[:2]
+
+            # FMC不记录对象名，与导出时一致按名称排序匹配选中的对象
+            selected = sorted(context.selected_objects, key=lambda o: o.name)
+            if len(selected) != object_num:
+                print(
+                    f"[LX] FMC对象数 {object_num} 与选中对象数 {len(selected)} 不一致，按顺序匹配"
+                )
+
+            scene = context.scene
+            frame_start = scene.frame_start
+            keys = np.arange(frame_num) + frame_start
+            for i, obj in enumerate(selected[:object_num]):
+                obj.rotation_mode = "QUATERNION"
+                obj.animation_data_create()
+                action = bpy.data.actions.new(name=f"{obj.name}_fmc")
+                obj.animation_data.action = action
+                _write_fcurve_keys(
+                    action, "location", obj.name, keys, samples[:, i, :3]
+                )
+                _write_fcurve_keys(
+                    action, "rotation_quaternion", obj.name, keys, samples[:, i, 3:]
+                )
+
+            scene.frame_end = frame_start + frame_num - 1
+
+            self.report(
+                {"INFO"},
+                f"成功导入FMC动画: {min(object_num, len(selected))} 个对象, {frame_num} 帧",
+            )
+            return {"FINISHED"}
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"导入失败: {str(e)}")
+            return {"CANCELLED"}
+
     def invoke(self, context, event):
         context.window_manager.fileselect_add(self)
         return {"RUNNING_MODAL"}
@@ -569,19 +1308,24 @@ class FMC_OT_export(bpy.types.Operator):
         try:
             from . import export_utils
 
-            selected = context.selected_objects
+            # FMC不记录对象名，按名称排序保证导入时能对应回来
+            selected = sorted(context.selected_objects, key=lambda o: o.name)
             frame_start = context.scene.frame_start
             frame_end = context.scene.frame_end
             frame_count = frame_end - frame_start + 1
 
-            writer = export_utils.FMCWriter(self.filepath)
-            writer.write(selected, frame_count)
+            checksum = context.scene.lx_export_checksum
+            writer = export_utils.FMCWriter(self.filepath, checksum=checksum)
+            writer.write(selected, frame_count, frame_start=frame_start)
 
             pos_path = os.path.splitext(self.filepath)[0] + ".pos"
-            pos_writer = export_utils.POSWriter(pos_path)
+            pos_writer = export_utils.POSWriter(pos_path, checksum=checksum)
             pos_writer.write(frame_count)
 
-            self.report({"INFO"}, f"成功导出FMC/POS动画文件")
+            self.report(
+                {"INFO"},
+                f"成功导出FMC/POS动画文件 ({writer.bytes_written} 字节, {writer.elapsed:.2f}s)",
+            )
             return {"FINISHED"}
 
         except Exception as e:
@@ -593,6 +1337,268 @@ class FMC_OT_export(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
 
+def _armature_nodes(armature_obj):
+    """骨架的BNC节点表 (名称, 类型, 父节点索引, 局部pivot, 局部四元数)
+
+    骨架记录的BNC文件与骨骼名称一致时直接沿用其静止姿态，保证导入导出往返不变；
+    否则由骨骼的 matrix_local 一次性批量计算，不参与形变的骨骼作为虚拟体。
+    """
+    import numpy as np
+    from . import import_utils
+    from . import math_utils
+
+    data_bones = armature_obj.data.bones
+    bnc_path = armature_obj.get("lx_bnc_path", "")
+    if bnc_path and os.path.exists(bnc_path):
+        bones, _, _ = import_utils.read_bnc(bnc_path)
+        names = [b.bone_name for b in bones]
+        if set(names) == set(data_bones.keys()):
+            pivots, quats, parents = import_utils.bone_arrays(bones)
+            types = np.array([b.bone_type for b in bones], dtype=np.int64)
+            return names, types, parents, pivots, quats
+
+    names = list(data_bones.keys())
+    index = {name: i for i, name in enumerate(names)}
+    parents = np.array(
+        [index[b.parent.name] if b.parent else -1 for b in data_bones], dtype=np.int64
+    )
+    deform = np.empty(len(data_bones), dtype=bool)
+    data_bones.foreach_get("use_deform", deform)
+    local = math_utils.world_to_local(
+        _foreach_get_matrices(data_bones, "matrix_local"), parents
+    )
+
+    # 先骨骼后虚拟体，重新映射父节点索引
+    order = np.argsort(~deform, kind="stable")
+    remap = np.empty(len(order), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    parents = np.where(parents[order] >= 0, remap[parents[order]], -1)
+    local = local[order]
+    types = np.where(deform[order], 1, 2)
+    return (
+        [names[i] for i in order],
+        types,
+        parents,
+        local[:, :3, 3],
+        math_utils.matrix_to_quat(local),
+    )
+
+
+def _extract_skin_mesh(obj, to_armature, node_index, max_bones, min_weight):
+    """批量提取一个网格对象的SKC数据，按 (顶点, UV) 拆分面角
+
+    返回 (顶点, UV, 三角面, 材质, 节点索引 (n, max_bones), 权重 (n, max_bones))。
+    """
+    import numpy as np
+    from . import export_utils
+
+    mesh = obj.data
+    mesh.calc_loop_triangles()
+    vert_num = len(mesh.vertices)
+    co = np.empty(vert_num * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    co = co.reshape(-1, 3).astype(np.float64)
+    matrix = to_armature @ np.array(obj.matrix_world, dtype=np.float64)
+    co = co @ matrix[:3, :3].T + matrix[:3, 3]
+
+    tri_loops = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get("loops", tri_loops)
+    face_mat = np.empty(len(mesh.loop_triangles), dtype=np.int32)
+    mesh.loop_triangles.foreach_get("material_index", face_mat)
+    loop_vert = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vert)
+    loop_uv = np.zeros(len(mesh.loops) * 2, dtype=np.float32)
+    if mesh.uv_layers.active is not None:
+        mesh.uv_layers.active.data.foreach_get("uv", loop_uv)
+    loop_uv = loop_uv.reshape(-1, 2)
+
+    # 顶点组权重没有 foreach_get 接口，只遍历一次收集为稀疏三元组，之后全部向量化
+    group_node = np.array(
+        [node_index.get(g.name, -1) for g in obj.vertex_groups] or [-1],
+        dtype=np.int64,
+    )
+    triples = np.array(
+        [(v.index, g.group, g.weight) for v in mesh.vertices for g in v.groups],
+        dtype=np.float64,
+    ).reshape(-1, 3)
+    rows = triples[:, 0].astype(np.int64)
+    cols = group_node[triples[:, 1].astype(np.int64)]
+    valid = cols >= 0
+    bone_ids, bone_weights = export_utils.prune_skin_weights(
+        rows[valid], cols[valid], triples[valid, 2], vert_num, max_bones, min_weight
+    )
+
+    # 同一顶点在不同面角上UV不同时拆分为多个SKC顶点
+    corner_vert = loop_vert[tri_loops].astype(np.int64)
+    corner_uv = loop_uv[tri_loops]
+    keys = np.column_stack([corner_vert, np.round(corner_uv * 1e6).astype(np.int64)])
+    _, first, inverse = np.unique(keys, axis=0, return_index=True, return_inverse=True)
+    source = corner_vert[first]
+    return (
+        co[source],
+        corner_uv[first],
+        inverse.reshape(-1, 3),
+        face_mat,
+        bone_ids[source],
+        bone_weights[source],
+    )
+
+
+class SKC_OT_export(bpy.types.Operator):
+    """导出SKC人物模型和BNC骨骼"""
+
+    bl_idname = "lx.export_skc"
+    bl_label = "导出SKC模型"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.skc", options={"HIDDEN"})
+    export_bnc: bpy.props.BoolProperty(
+        name="同时导出BNC骨骼",
+        default=True,
+        description="按导入时的命名规则写出同目录下的BNC文件（p0_300.skc -> p0.bnc）",
+    )
+    max_bones: bpy.props.IntProperty(
+        name="每顶点最大骨骼数",
+        default=4,
+        min=1,
+        max=8,
+        description="每个顶点保留权重最大的若干个骨骼影响，其余舍弃后重新归一化",
+    )
+    min_weight: bpy.props.FloatProperty(
+        name="最小权重",
+        default=0.01,
+        min=0.0,
+        max=0.5,
+        description="低于此值的权重直接舍弃",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == "MESH" for obj in context.selected_objects)
+
+    def find_armature(self, context, meshes):
+        if context.active_object and context.active_object.type == "ARMATURE":
+            return context.active_object
+        for obj in context.selected_objects:
+            if obj.type == "ARMATURE":
+                return obj
+        for obj in meshes:
+            for mod in obj.modifiers:
+                if mod.type == "ARMATURE" and mod.object:
+                    return mod.object
+        return None
+
+    def execute(self, context):
+        try:
+            import numpy as np
+            from . import export_utils
+
+            meshes = [obj for obj in context.selected_objects if obj.type == "MESH"]
+            armature_obj = self.find_armature(context, meshes)
+            if armature_obj is None:
+                self.report({"ERROR"}, "找不到骨架，请同时选择骨架或添加Armature修改器")
+                return {"CANCELLED"}
+
+            names, types, parents, pivots, quats = _armature_nodes(armature_obj)
+            node_index = {name: i for i, name in enumerate(names)}
+            to_armature = np.linalg.inv(
+                np.array(armature_obj.matrix_world, dtype=np.float64)
+            )
+
+            parts = [
+                _extract_skin_mesh(
+                    obj, to_armature, node_index, self.max_bones, self.min_weight
+                )
+                for obj in sorted(meshes, key=lambda o: o.name)
+            ]
+            offsets = np.cumsum([0] + [len(p[0]) for p in parts])[:-1]
+            verts, uvs, faces, face_mat, bone_ids, bone_weights = (
+                np.concatenate([p[k] for p in parts]) for k in range(6)
+            )
+            faces = np.concatenate([p[2] + off for p, off in zip(parts, offsets)])
+
+            active = context.active_object
+            skin_name = (active if active in meshes else meshes[0]).name
+            checksum = context.scene.lx_export_checksum
+            writer = export_utils.SKCWriter(self.filepath, checksum=checksum)
+            writer.write(
+                skin_name.replace(" ", "_"),
+                verts,
+                uvs,
+                faces,
+                face_mat,
+                bone_ids,
+                bone_weights,
+            )
+
+            if self.export_bnc:
+                skc_dir = os.path.dirname(self.filepath)
+                base = os.path.splitext(os.path.basename(self.filepath))[0]
+                bnc_path = os.path.join(skc_dir, base.split("_")[0] + ".bnc")
+                export_utils.BNCWriter(bnc_path, checksum=checksum).write(
+                    names, types, parents, pivots, quats
+                )
+
+            self.report(
+                {"INFO"},
+                f"成功导出SKC: {len(verts)} 个顶点, {len(faces)} 个面, "
+                f"{len(names)} 个骨骼节点 ({writer.elapsed:.2f}s)",
+            )
+            return {"FINISHED"}
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"导出失败: {str(e)}")
+            return {"CANCELLED"}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+
+def _world_triangles(context, objects):
+    """对象应用修改器后的网格，一次性三角化并变换到世界坐标
+
+    返回 (顶点 (n, 3) float32, 三角形 (m, 3) int32)。
+    """
+    import numpy as np
+
+    depsgraph = context.evaluated_depsgraph_get()
+    vert_chunks = [np.empty((0, 3), dtype=np.float32)]
+    tri_chunks = [np.empty((0, 3), dtype=np.int32)]
+    vert_offset = 0
+    for obj in objects:
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        try:
+            co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+            mesh.vertices.foreach_get("co", co)
+            mesh.calc_loop_triangles()
+            tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int32)
+            mesh.loop_triangles.foreach_get("vertices", tris)
+        finally:
+            eval_obj.to_mesh_clear()
+
+        matrix = np.array(obj.matrix_world, dtype=np.float64)
+        co = co.reshape(-1, 3) @ matrix[:3, :3].T + matrix[:3, 3]
+        vert_chunks.append(co.astype(np.float32))
+        tri_chunks.append(tris.reshape(-1, 3) + vert_offset)
+        vert_offset += len(co)
+
+    return np.concatenate(vert_chunks), np.concatenate(tri_chunks)
+
+
+def _level_bvh(verts, tris):
+    """由世界坐标下的三角形构造BVH树，没有三角形时返回None"""
+    from mathutils.bvhtree import BVHTree
+
+    if len(tris) == 0:
+        return None
+    return BVHTree.FromPolygons(verts.tolist(), tris.tolist(), all_triangles=True)
+
+
 class WP_OT_export(bpy.types.Operator):
     """导出WP路径点文件"""
 
@@ -602,40 +1608,125 @@ class WP_OT_export(bpy.types.Operator):
     filepath: bpy.props.StringProperty(subtype="FILE_PATH")
     filter_glob: bpy.props.StringProperty(default="*.wp", options={"HIDDEN"})
 
+    max_link_distance: bpy.props.FloatProperty(
+        name="最大连线距离",
+        default=0.0,
+        min=0.0,
+        description="只连接此距离内的路径点，0表示不限制",
+    )
+    check_visibility: bpy.props.BoolProperty(
+        name="检测视线",
+        default=False,
+        description="用关卡几何的BVH树检测每条连线，只导出未被遮挡的连线",
+    )
+    occluder_collection: bpy.props.StringProperty(
+        name="遮挡集合",
+        default="",
+        description="参与视线检测的网格所在集合，留空时使用场景中所有可见的非路径点网格",
+    )
+    eye_height: bpy.props.FloatProperty(
+        name="视线高度",
+        default=20.0,
+        min=0.0,
+        description="在路径点上方此高度处检测视线，避免射线贴地被地面挡住",
+    )
+    workers: bpy.props.IntProperty(
+        name="检测线程数",
+        default=0,
+        min=0,
+        max=64,
+        description="并行检测射线的线程数，0表示使用全部CPU核心",
+    )
+    export_paths: bpy.props.BoolProperty(
+        name="生成寻路表",
+        default=False,
+        description="预先计算所有路径点对的最短路径下一跳，写入同名 .wpn 文件",
+    )
+    path_workers: bpy.props.IntProperty(
+        name="寻路进程数",
+        default=0,
+        min=0,
+        max=64,
+        description="路径点较多时并行计算寻路表的进程数，0表示使用全部CPU核心",
+    )
+
     @classmethod
     def poll(cls, context):
         return len(context.selected_objects) > 0
 
+    def occluders(self, context, waypoint_objects):
+        exclude = set(waypoint_objects)
+        if self.occluder_collection:
+            collection = bpy.data.collections.get(self.occluder_collection)
+            if collection is None:
+                raise ValueError(f"找不到集合: {self.occluder_collection}")
+            objects = collection.all_objects
+        else:
+            objects = [obj for obj in context.scene.objects if obj.visible_get()]
+        return [obj for obj in objects if obj.type == "MESH" and obj not in exclude]
+
     def execute(self, context):
         try:
+            import time
             from . import export_utils
+            from .export_utils import waypoints as wp_utils
 
             selected = [
                 obj
                 for obj in context.selected_objects
                 if obj.type == "EMPTY" or obj.type == "MESH"
             ]
-
-            waypoints = []
-            for i, obj in enumerate(selected):
-                wp = {
-                    "pos": [obj.location.x, obj.location.y, obj.location.z],
-                    "size": 40,
-                    "links": [],
-                }
-
-                for j, other in enumerate(selected):
-                    if i != j:
-                        dist = obj.location.distance_to(other.location)
-                        flag = 0 if dist < 400 else 1
-                        wp["links"].append({"index": j, "flag": flag, "dist": dist})
-
-                waypoints.append(wp)
-
-            writer = export_utils.WPWriter(self.filepath)
+            # .wp 中保存对象自身的位置；视线检测的射线端点必须用世界坐标，
+            # 否则带父级的路径点会在错误的位置与世界空间的关卡网格求交
+            positions = [tuple(obj.location) for obj in selected]
+            pairs, dists = wp_utils.candidate_links(positions, self.max_link_distance)
+
+            if self.check_visibility and len(pairs) > 0:
+                bvh = _level_bvh(
+                    *_world_triangles(context, self.occluders(context, selected))
+                )
+                if bvh is not None:
+                    world_positions = [
+                        tuple(obj.matrix_world.translation) for obj in selected
+                    ]
+                    start = time.perf_counter()
+                    visible = wp_utils.visible_links(
+                        bvh, world_positions, pairs, self.eye_height, self.workers
+                    )
+                    elapsed = time.perf_counter() - start
+                    print(
+                        f"[LX] 视线检测: {len(pairs)} 条连线, 遮挡 "
+                        f"{len(pairs) - int(visible.sum())} 条, {elapsed:.2f}s "
+                        f"({len(pairs) / max(elapsed, 1e-9):.0f} 条/秒)"
+                    )
+                    pairs, dists = pairs[visible], dists[visible]
+
+            waypoints = wp_utils.build_waypoints(positions, pairs, dists)
+
+            writer = export_utils.WPWriter(
+                self.filepath, checksum=context.scene.lx_export_checksum
+            )
             writer.write(waypoints)
 
-            self.report({"INFO"}, f"成功导出 {len(waypoints)} 个路径点")
+            if self.export_paths:
+                start = time.perf_counter()
+                table = wp_utils.next_hop_table(
+                    len(positions), pairs, dists, workers=self.path_workers
+                )
+                print(
+                    f"[LX] 寻路表: {len(positions)} 个路径点, "
+                    f"{time.perf_counter() - start:.2f}s"
+                )
+                wp_utils.NextHopWriter(
+                    os.path.splitext(self.filepath)[0] + ".wpn",
+                    checksum=context.scene.lx_export_checksum,
+                ).write(table)
+
+            self.report(
+                {"INFO"},
+                f"成功导出 {len(waypoints)} 个路径点, {len(pairs)} 条连线 "
+                f"({writer.bytes_written} 字节, {writer.elapsed:.2f}s)",
+            )
             return {"FINISHED"}
 
         except Exception as e:
@@ -647,6 +1738,185 @@ class WP_OT_export(bpy.types.Operator):
         return {"RUNNING_MODAL"}
 
 
+class WP_OT_generate(bpy.types.Operator):
+    """在选中关卡网格的可行走表面上自动生成路径点"""
+
+    bl_idname = "lx.generate_waypoints"
+    bl_label = "自动生成路径点"
+    bl_options = {"REGISTER", "UNDO"}
+
+    grid_spacing: bpy.props.FloatProperty(
+        name="采样间距", default=50.0, min=1.0, description="向下发射射线的网格间距"
+    )
+    max_slope: bpy.props.FloatProperty(
+        name="最大坡度",
+        default=0.698132,
+        min=0.0,
+        max=1.570796,
+        subtype="ANGLE",
+        description="地面法线与竖直方向的最大夹角",
+    )
+    clearance: bpy.props.FloatProperty(
+        name="头顶空间",
+        default=80.0,
+        min=0.0,
+        description="采样点上方此高度内有遮挡时剔除（同时剔除楼板底面）",
+    )
+    max_layers: bpy.props.IntProperty(
+        name="最多层数",
+        default=8,
+        min=1,
+        max=64,
+        description="每列射线最多穿过的表面层数，用于多层地面",
+    )
+    cluster_size: bpy.props.FloatProperty(
+        name="路径点间距",
+        default=200.0,
+        min=1.0,
+        description="按此边长的体素聚类，每个体素保留一个路径点",
+    )
+    cluster_height: bpy.props.FloatProperty(
+        name="聚类高度",
+        default=100.0,
+        min=1.0,
+        description="体素的高度，小于楼层间距时不同楼层的路径点不会合并",
+    )
+    workers: bpy.props.IntProperty(
+        name="检测线程数",
+        default=0,
+        min=0,
+        max=64,
+        description="并行检测射线的线程数，0表示使用全部CPU核心",
+    )
+    collection_name: bpy.props.StringProperty(
+        name="集合", default="Waypoints", description="生成的路径点放入此集合"
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return any(obj.type == "MESH" for obj in context.selected_objects)
+
+    def execute(self, context):
+        try:
+            import time
+            from .export_utils import waypoints as wp_utils
+
+            meshes = [obj for obj in context.selected_objects if obj.type == "MESH"]
+            verts, tris = _world_triangles(context, meshes)
+            start = time.perf_counter()
+            bvh = _level_bvh(verts, tris)
+            bvh_elapsed = time.perf_counter() - start
+            if bvh is None:
+                self.report({"ERROR"}, "选中的网格没有三角形")
+                return {"CANCELLED"}
+
+            start = time.perf_counter()
+            samples = wp_utils.sample_walkable(
+                bvh,
+                (verts.min(axis=0), verts.max(axis=0)),
+                self.grid_spacing,
+                self.max_slope,
+                self.clearance,
+                self.max_layers,
+                self.workers,
+            )
+            points = wp_utils.cluster_points(
+                samples, self.cluster_size, self.cluster_height
+            )
+            elapsed = time.perf_counter() - start
+
+            collection = bpy.data.collections.get(self.collection_name)
+            if collection is None:
+                collection = bpy.data.collections.new(self.collection_name)
+                context.scene.collection.children.link(collection)
+
+            # 生成的路径点保持选中，可以直接导出WP
+            bpy.ops.object.select_all(action="DESELECT")
+            for idx, pos in enumerate(points.tolist()):
+                obj = bpy.data.objects.new(f"WP_{idx:04d}", None)
+                obj.empty_display_type = "SPHERE"
+                obj.empty_display_size = 20.0
+                obj.location = pos
+                collection.objects.link(obj)
+                obj.select_set(True)
+
+            print(
+                f"[LX] 生成路径点: {len(tris)} 个三角形, {len(samples)} 个采样点, "
+                f"{len(points)} 个路径点, BVH {bvh_elapsed:.2f}s, 采样和聚类 {elapsed:.2f}s"
+            )
+            self.report(
+                {"INFO"},
+                f"生成 {len(points)} 个路径点（{len(samples)} 个可行走采样点, {elapsed:.1f}s）",
+            )
+            return {"FINISHED"}
+
+        except Exception as e:
+            import traceback
+
+            traceback.print_exc()
+            self.report({"ERROR"}, f"生成失败: {str(e)}")
+            return {"CANCELLED"}
+
+
+# 几何变化记录: ("Object"/"Mesh", 名称) -> 最近一次几何变化的序号，由depsgraph更新回调维护
+_geometry_changes = {}
+_geometry_tick = 0
+# 打开文件、撤销或重做后整体递增，使之前记录的变化信号全部失效
+_geometry_epoch = 0
+
+
+@bpy.app.handlers.persistent
+def _track_geometry_changes(scene, depsgraph):
+    global _geometry_tick
+    for update in depsgraph.updates:
+        if not update.is_updated_geometry:
+            continue
+        original = update.id.original
+        if isinstance(original, (bpy.types.Object, bpy.types.Mesh)):
+            _geometry_tick += 1
+            key = (type(original).__name__, original.name)
+            _geometry_changes[key] = _geometry_tick
+
+
+@bpy.app.handlers.persistent
+def _reset_geometry_changes(*args):
+    global _geometry_epoch
+    _geometry_epoch += 1
+    _geometry_changes.clear()
+
+
+# (回调列表名, 回调函数)，由 register()/unregister() 挂载和移除
+handlers = [
+    ("depsgraph_update_post", _track_geometry_changes),
+    ("load_post", _reset_geometry_changes),
+    ("undo_post", _reset_geometry_changes),
+    ("redo_post", _reset_geometry_changes),
+]
+
+
+def _geometry_signal(obj):
+    """对象几何的廉价变化信号，不读取顶点数据
+
+    信号未变时GMB导出直接复用缓存的字节块，跳过提取和哈希。
+    没有挂载变化记录回调时返回None，此时总是提取并比较摘要。
+    """
+    if _track_geometry_changes not in bpy.app.handlers.depsgraph_update_post:
+        return None
+    mesh = obj.data
+    changed = max(
+        _geometry_changes.get(("Object", obj.name), 0),
+        _geometry_changes.get(("Mesh", mesh.name), 0),
+    )
+    return (
+        _geometry_epoch,
+        mesh.name,
+        mesh.session_uid,
+        len(mesh.vertices),
+        len(mesh.polygons),
+        changed,
+    )
+
+
 class GMC_OT_export(bpy.types.Operator):
     """导出GMB模型文件"""
 
@@ -657,11 +1927,85 @@ class GMC_OT_export(bpy.types.Operator):
     filter_glob: bpy.props.StringProperty(default="*.gmb", options={"HIDDEN"})
 
     export_des: bpy.props.BoolProperty(name="同时导出DES文件", default=True)
+    use_cache: bpy.props.BoolProperty(
+        name="增量导出",
+        default=True,
+        description="复用未改动对象的序列化数据，只重新编码改动过的对象",
+    )
+    workers: bpy.props.IntProperty(
+        name="编码线程数",
+        default=0,
+        min=0,
+        max=64,
+        description="并行编码对象的线程数，0表示使用全部CPU核心",
+    )
+    optimize_cache: bpy.props.BoolProperty(
+        name="顶点缓存优化",
+        default=False,
+        description="重排三角形和顶点顺序以提高GPU顶点缓存命中率，并报告优化前后的ACMR",
+    )
+    export_lods: bpy.props.BoolProperty(
+        name="生成LOD",
+        default=False,
+        description="按三角形比例简化每个对象，每级LOD写出为单独的GMB文件",
+    )
+    lod_ratios: bpy.props.StringProperty(
+        name="LOD比例(%)",
+        default="50,25,10",
+        description="各级LOD保留的三角形百分比，以逗号分隔，例如 50,25,10",
+    )
 
     @classmethod
     def poll(cls, context):
         return len(context.selected_objects) > 0
 
+    def export_lod_chain(self, selected, materials, textures, workers, checksum):
+        """为每个对象生成LOD链，第 i 级写入 <文件名>_lod<i>.gmb"""
+        import numpy as np
+        from . import export_utils
+        from . import import_utils
+        from .export_utils import lod
+
+        ratios = lod.parse_lod_ratios(self.lod_ratios)
+        levels = [[] for _ in ratios]
+        for obj in selected:
+            name, verts, faces = export_utils.extract_gmb_object(obj)
+            mesh = obj.data
+            face_mat = np.empty(len(faces), dtype=np.int32)
+            mesh.loop_triangles.foreach_get("material_index", face_mat)
+            corner_uv = None
+            if mesh.uv_layers.active is not None:
+                loops = np.empty(len(faces) * 3, dtype=np.int32)
+                mesh.loop_triangles.foreach_get("loops", loops)
+                uv = np.empty(len(mesh.loops) * 2, dtype=np.float32)
+                mesh.uv_layers.active.data.foreach_get("uv", uv)
+                corner_uv = uv.reshape(-1, 2)[loops].reshape(-1, 3, 2)
+            locked = lod.locked_vertices(faces, len(verts), face_mat, corner_uv)
+
+            for level, (lod_verts, lod_faces, _, _) in enumerate(
+                lod.build_lod_chain(verts, faces, ratios, locked)
+            ):
+                lod_obj = import_utils.LXObject()
+                lod_obj.skin_name = name
+                lod_obj.verts = lod_verts
+                lod_obj.faces = lod_faces
+                levels[level].append(lod_obj)
+            print(
+                f"[LX] LOD {name}: "
+                + " / ".join(str(len(lv[-1].faces)) for lv in levels)
+                + f" (原始 {len(faces)} 个三角形, 锁定 {int(locked.sum())} 个顶点)"
+            )
+
+        for level, objects in enumerate(levels, start=1):
+            writer = export_utils.GMBWriter(
+                lod.lod_path(self.filepath, level),
+                workers=workers,
+                checksum=checksum,
+                optimize=self.optimize_cache,
+            )
+            writer.write(objects, materials, textures)
+        return len(levels)
+
     def execute(self, context):
         try:
             from . import export_utils
@@ -683,18 +2027,107 @@ class GMC_OT_export(bpy.types.Operator):
             ]
             textures = ["NONE"]
 
-            writer = export_utils.GMBWriter(self.filepath)
+            cache = None
+            if self.use_cache:
+                cache = export_utils.GMBExportCache.for_path(self.filepath)
+
+            checksum = context.scene.lx_export_checksum
+            workers = self.workers or os.cpu_count() or 1
+            writer = export_utils.GMBWriter(
+                self.filepath,
+                cache=cache,
+                workers=workers,
+                checksum=checksum,
+                optimize=self.optimize_cache,
+                change_signal=_geometry_signal,
+            )
             writer.write(selected, materials, textures)
 
+            if cache is not None:
+                cache.save()
+
             if self.export_des:
                 des_path = os.path.splitext(self.filepath)[0] + ".des"
-                des_writer = export_utils.DESWriter(des_path)
+                des_writer = export_utils.DESWriter(des_path, checksum=checksum)
                 des_writer.write(selected)
 
-            self.report({"INFO"}, f"成功导出GMB/DES文件")
+            lod_count = 0
+            if self.export_lods:
+                lod_count = self.export_lod_chain(
+                    selected, materials, textures, workers, checksum
+                )
+
+            self.report(
+                {"INFO"},
+                f"成功导出GMB/DES文件 (复用 {writer.reused} 个, 重新编码 {writer.encoded} 个对象, "
+                f"{writer.bytes_written} 字节, {writer.elapsed:.2f}s"
+                + (f", {lod_count} 级LOD" if lod_count else "")
+                + (
+                    f", ACMR {writer.acmr[0]:.2f}->{writer.acmr[1]:.2f}"
+                    if writer.acmr
+                    else ""
+                )
+                + ")",
+            )
+            return {"FINISHED"}
+
+        except Exception as e:
+            self.report({"ERROR"}, f"导出失败: {str(e)}")
+            return {"CANCELLED"}
+
+    def invoke(self, context, event):
+        context.window_manager.fileselect_add(self)
+        return {"RUNNING_MODAL"}
+
+
+class COB_OT_export(bpy.types.Operator):
+    """导出COB碰撞文件"""
+
+    bl_idname = "lx.export_cob"
+    bl_label = "导出COB碰撞"
+
+    filepath: bpy.props.StringProperty(subtype="FILE_PATH")
+    filter_glob: bpy.props.StringProperty(default="*.cob", options={"HIDDEN"})
+
+    leaf_size: bpy.props.IntProperty(
+        name="叶子三角形数",
+        default=8,
+        min=1,
+        max=64,
+        description="AABB层级每个叶子节点最多包含的三角形数",
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return len(context.selected_objects) > 0
+
+    def execute(self, context):
+        try:
+            from . import export_utils
+
+            selected = [obj for obj in context.selected_objects if obj.type == "MESH"]
+            if not selected:
+                self.report({"ERROR"}, "没有选择碰撞网格对象")
+                return {"CANCELLED"}
+
+            verts, tris = _world_triangles(context, selected)
+
+            writer = export_utils.COBWriter(
+                self.filepath, checksum=context.scene.lx_export_checksum
+            )
+            writer.write(verts, tris, self.leaf_size)
+
+            self.report(
+                {"INFO"},
+                f"成功导出COB碰撞: {len(tris)} 个三角形, {writer.node_num} 个节点 "
+                f"({writer.bytes_written} 字节, {writer.elapsed:.2f}s)",
+            )
             return {"FINISHED"}
 
         except Exception as e:
+            import traceback
+
+            traceback.print_exc()
             self.report({"ERROR"}, f"导出失败: {str(e)}")
             return {"CANCELLED"}
 
@@ -706,9 +2139,18 @@ class GMC_OT_export(bpy.types.Operator):
 classes = [
     SKC_OT_import,
     GMC_OT_import,
+    DES_OT_import,
+    STREAM_OT_open,
+    STREAM_OT_update,
+    CATALOG_OT_scan,
+    CATALOG_OT_query,
     AMB_OT_import,
+    FMC_OT_import,
     AMB_OT_export,
     FMC_OT_export,
+    SKC_OT_export,
     WP_OT_export,
+    WP_OT_generate,
     GMC_OT_export,
+    COB_OT_export,
 ]
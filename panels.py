@@ -1,5 +1,10 @@
+import os
+
 import bpy
 
+from . import operators
+from . import profiling
+
 
 class LX_PT_main(bpy.types.Panel):
     """流星蝴蝶剑工具箱主面板"""
@@ -19,13 +24,16 @@ class LX_PT_main(bpy.types.Panel):
         col = layout.column(align=True)
         col.operator("lx.import_skc", icon="IMPORT")
         col.operator("lx.import_gmc", icon="IMPORT")
+        col.operator("lx.import_des", icon="IMPORT")
         col.operator("lx.import_amb", icon="IMPORT")
+        col.operator("lx.import_fmc", icon="IMPORT")
 
         layout.separator()
 
         col = layout.column(align=True)
         col.operator("lx.export_amb", icon="EXPORT")
         col.operator("lx.export_fmc", icon="EXPORT")
+        col.operator("lx.export_skc", icon="EXPORT")
         col.operator("lx.export_wp", icon="EXPORT")
         col.operator("lx.export_gmb", icon="EXPORT")
 
@@ -64,11 +72,31 @@ class LX_PT_import(bpy.types.Panel):
         row = box.row()
         row.operator("lx.import_gmc", text="选择GMB/GMC文件")
 
+        box = layout.box()
+        box.label(text="DES场景 (读取同名GMB/GMC):")
+        row = box.row()
+        row.operator("lx.import_des", text="选择DES文件")
+
+        box = layout.box()
+        box.label(text="流式关卡 (按网格单元加载GMB/DES):")
+        scene = context.scene
+        box.prop(scene, "lx_stream_cell_size")
+        box.prop(scene, "lx_stream_radius")
+        box.prop(scene, "lx_stream_use_view")
+        row = box.row()
+        row.operator("lx.stream_level", text="打开流式关卡")
+        row.operator("lx.stream_update", text="更新")
+
         box = layout.box()
         box.label(text="AMB动作:")
         row = box.row()
         row.operator("lx.import_amb", text="选择AMB文件")
 
+        box = layout.box()
+        box.label(text="FMC动画 (应用到选中对象):")
+        row = box.row()
+        row.operator("lx.import_fmc", text="选择FMC文件")
+
 
 class LX_PT_export(bpy.types.Panel):
     """导出面板"""
@@ -84,6 +112,13 @@ class LX_PT_export(bpy.types.Panel):
     def draw(self, context):
         layout = self.layout
 
+        layout.prop(context.scene, "lx_export_checksum")
+
+        box = layout.box()
+        box.label(text="SKC人物模型 (含BNC骨骼):")
+        row = box.row()
+        row.operator("lx.export_skc", text="导出SKC模型")
+
         box = layout.box()
         box.label(text="GMB模型导出:")
         row = box.row()
@@ -96,7 +131,7 @@ class LX_PT_export(bpy.types.Panel):
         box = layout.box()
         box.label(text="COB碰撞文件:")
         row = box.row()
-        row.operator("lx.export_gmb", text="导出COB碰撞")
+        row.operator("lx.export_cob", text="导出COB碰撞")
 
 
 class LX_PT_animation(bpy.types.Panel):
@@ -130,6 +165,7 @@ class LX_PT_animation(bpy.types.Panel):
         box = layout.box()
         box.label(text="WP路径点:")
         row = box.row()
+        row.operator("lx.generate_waypoints", text="由选中网格生成")
         row.operator("lx.export_wp", text="导出路径点")
 
 
@@ -161,10 +197,94 @@ class LX_PT_tools(bpy.types.Panel):
         box.label(text="• MC文件导出")
 
 
+class LX_PT_catalog(bpy.types.Panel):
+    """资源目录面板"""
+
+    bl_label = "资源目录"
+    bl_idname = "LX_PT_catalog"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "流星蝴蝶剑"
+    bl_parent_id = "LX_PT_main"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        from .import_utils.catalog import summarize
+
+        layout = self.layout
+        scene = context.scene
+
+        layout.prop(scene, "lx_catalog_root")
+        layout.operator("lx.catalog_scan", text="扫描 (只处理修改过的文件)")
+        row = layout.row(align=True)
+        row.prop(scene, "lx_catalog_filter", text="")
+        row.operator("lx.catalog_query", text="", icon="VIEWZOOM")
+        layout.prop(scene, "lx_catalog_limit")
+
+        box = layout.box()
+        if not operators.catalog_results:
+            box.label(text="没有结果")
+        for item in operators.catalog_results:
+            row = box.row()
+            row.label(text=f"{os.path.basename(item['path'])}  {summarize(item)}")
+            importer = operators.CATALOG_IMPORTERS.get(item["format"])
+            if importer and not item["error"]:
+                row.operator(importer, text="", icon="IMPORT").filepath = item["path"]
+
+
+class LX_PT_profile(bpy.types.Panel):
+    """性能分析面板"""
+
+    bl_label = "性能分析"
+    bl_idname = "LX_PT_profile"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "UI"
+    bl_category = "流星蝴蝶剑"
+    bl_parent_id = "LX_PT_main"
+    bl_options = {"DEFAULT_CLOSED"}
+
+    def draw(self, context):
+        layout = self.layout
+        prefs = profiling.preferences()
+        if prefs is None:
+            layout.label(text="未找到插件首选项")
+            return
+        layout.prop(prefs, "enable_profiling")
+        layout.prop(prefs, "trace_memory")
+
+        report = profiling.last_report
+        if not report:
+            layout.label(text="尚无分析结果")
+            return
+
+        box = layout.box()
+        box.label(text=f"{report['operator']}  {report['elapsed']:.3f}s")
+        if report["peak_memory"]:
+            box.label(text=f"峰值内存 {report['peak_memory'] / 1048576:.1f} MB")
+        for path, info in report["inputs"].items():
+            counts = ", ".join(f"{k} {v}" for k, v in info.items() if k != "size")
+            box.label(text=f"{os.path.basename(path)}: {info['size']} 字节 {counts}")
+
+        box = layout.box()
+        box.label(text="热点函数 (累计 / 自身 / 调用次数):")
+        for label, calls, total, cumulative in report["hot_functions"]:
+            box.label(text=f"{cumulative:.3f}s / {total:.3f}s / {calls}  {label}")
+
+        if report["allocations"]:
+            box = layout.box()
+            box.label(text="内存分配:")
+            for label, size in report["allocations"]:
+                box.label(text=f"{size / 1024:.0f} KB  {label}")
+
+        layout.label(text=f"结果: {report['files']}.*")
+
+
 classes = [
     LX_PT_main,
     LX_PT_import,
     LX_PT_export,
     LX_PT_animation,
     LX_PT_tools,
+    LX_PT_catalog,
+    LX_PT_profile,
 ]
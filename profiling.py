@@ -0,0 +1,201 @@
+"""插件首选项与操作性能分析
+
+在插件首选项中开启后，每次运行 lx.* 操作都会在 cProfile 和 tracemalloc 下执行，
+并在输出目录中保存:
+
+    <时间>_<操作>.prof         cProfile 统计（可用 pstats / snakeviz 查看）
+    <时间>_<操作>.tracemalloc  内存分配快照（tracemalloc.Snapshot.load 读取）
+    <时间>_<操作>.json         耗时、峰值内存、输入文件大小和元素数、热点函数摘要
+
+最近一次的摘要保存在 last_report 中，由 LX_PT_profile 面板显示。
+"""
+
+import functools
+import json
+import os
+import time
+
+import bpy
+
+# 最近一次分析的摘要
+last_report = {}
+
+# 嵌套调用的 lx.* 操作（如 lx.stream_level -> lx.stream_update）只分析最外层
+_depth = 0
+
+
+class LX_AddonPreferences(bpy.types.AddonPreferences):
+    bl_idname = __package__
+
+    enable_profiling: bpy.props.BoolProperty(
+        name="分析操作性能",
+        default=False,
+        description="运行 lx.* 操作时记录CPU耗时分布和内存峰值",
+    )
+    trace_memory: bpy.props.BoolProperty(
+        name="记录内存分配",
+        default=True,
+        description="使用tracemalloc记录峰值内存和分配位置（会明显变慢）",
+    )
+    profile_dir: bpy.props.StringProperty(
+        name="输出目录",
+        default="",
+        subtype="DIR_PATH",
+        description="留空时使用系统临时目录下的 lx_profiles",
+    )
+    top_n: bpy.props.IntProperty(name="热点函数数量", default=15, min=1, max=100)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "enable_profiling")
+        col = layout.column()
+        col.enabled = self.enable_profiling
+        col.prop(self, "trace_memory")
+        col.prop(self, "profile_dir")
+        col.prop(self, "top_n")
+
+
+def preferences():
+    addon = bpy.context.preferences.addons.get(__package__)
+    return addon.preferences if addon is not None else None
+
+
+def output_dir(prefs) -> str:
+    import tempfile
+
+    path = bpy.path.abspath(prefs.profile_dir) if prefs.profile_dir else ""
+    return path or os.path.join(tempfile.gettempdir(), "lx_profiles")
+
+
+def _input_files(operator):
+    """操作中所有文件路径属性对应的现有文件: 路径 -> 大小和文件头中的元素数"""
+    from .import_utils.probe import PROBES, probe
+
+    files = {}
+    for prop in operator.bl_rna.properties:
+        if prop.type != "STRING" or prop.subtype != "FILE_PATH":
+            continue
+        path = bpy.path.abspath(getattr(operator, prop.identifier, "") or "")
+        if not path or not os.path.isfile(path):
+            continue
+        info = {"size": os.path.getsize(path)}
+        if os.path.splitext(path)[1].lower() in PROBES:
+            try:
+                counts = probe(path)
+                counts.pop("names", None)
+                info.update(counts)
+            except Exception as e:
+                info["probe_error"] = str(e)
+        files[path] = info
+    return files
+
+
+def _hot_functions(profiler, top_n: int):
+    """按累计耗时排序的热点函数: (函数, 调用次数, 自身耗时, 累计耗时)"""
+    import pstats
+
+    stats = pstats.Stats(profiler)
+    rows = []
+    for (filename, line, func), (_, calls, total, cumulative, _) in stats.stats.items():
+        label = f"{os.path.basename(filename)}:{line}({func})"
+        rows.append((label, calls, total, cumulative))
+    rows.sort(key=lambda row: row[3], reverse=True)
+    return rows[:top_n]
+
+
+def _save_report(operator, prefs, profiler, snapshot, result, elapsed, peak):
+    """写出 .prof/.tracemalloc/.json 三个文件并更新 last_report"""
+    idname = operator.bl_idname
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    folder = output_dir(prefs)
+    os.makedirs(folder, exist_ok=True)
+    base = os.path.join(folder, f"{stamp}_{idname.replace('.', '_')}")
+
+    profiler.dump_stats(base + ".prof")
+    allocations = []
+    if snapshot is not None:
+        snapshot.dump(base + ".tracemalloc")
+        for stat in snapshot.statistics("lineno")[: prefs.top_n]:
+            frame = stat.traceback[0]
+            allocations.append(
+                (f"{os.path.basename(frame.filename)}:{frame.lineno}", stat.size)
+            )
+
+    report = {
+        "operator": idname,
+        "time": stamp,
+        "result": sorted(result) if isinstance(result, set) else str(result),
+        "elapsed": elapsed,
+        "peak_memory": peak,
+        "inputs": _input_files(operator),
+        "hot_functions": _hot_functions(profiler, prefs.top_n),
+        "allocations": allocations,
+        "files": base,
+    }
+    with open(base + ".json", "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=1)
+
+    last_report.clear()
+    last_report.update(report)
+    print(
+        f"[LX] 性能分析 {idname}: {elapsed:.3f}s, 峰值内存 {peak / 1048576:.1f} MB, "
+        f"结果保存在 {base}.*"
+    )
+
+
+def _run_profiled(execute, operator, context, prefs):
+    global _depth
+    # 分析相关模块只在开启分析后第一次运行操作时导入
+    import cProfile
+    import tracemalloc
+
+    tracing = prefs.trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    elif tracemalloc.is_tracing():
+        tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    _depth += 1
+    try:
+        result = profiler.runcall(execute, operator, context)
+    finally:
+        _depth -= 1
+        elapsed = time.perf_counter() - start
+        peak = 0
+        snapshot = None
+        if tracemalloc.is_tracing():
+            peak = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+        if tracing:
+            tracemalloc.stop()
+
+    try:
+        _save_report(operator, prefs, profiler, snapshot, result, elapsed, peak)
+    except Exception as e:
+        print(f"[LX] 保存性能分析结果失败: {e}")
+    return result
+
+
+def instrument(cls):
+    """包装操作类的 execute；未开启分析时直接调用原函数"""
+    execute = cls.execute
+    if getattr(execute, "_lx_profiled", False):
+        return cls
+
+    @functools.wraps(execute)
+    def wrapper(self, context):
+        prefs = preferences()
+        if _depth > 0 or prefs is None or not prefs.enable_profiling:
+            return execute(self, context)
+        return _run_profiled(execute, self, context, prefs)
+
+    wrapper._lx_profiled = True
+    cls.execute = wrapper
+    return cls
+
+
+classes = [
+    LX_AddonPreferences,
+]
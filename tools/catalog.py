@@ -0,0 +1,76 @@
+"""资源目录索引的命令行入口（不需要Blender）
+
+    python tools/catalog.py scan D:/lx/data --jobs 8
+    python tools/catalog.py query D:/lx/data "amb frames>300" --order frames --desc
+    python tools/catalog.py query D:/lx/data "gmb verts>=50000" --json
+
+过滤条件: 格式名（gmb/gmc/skc/bnc/amb/fmc/des）或 字段 运算符 值，
+字段为 size objects verts faces textures materials bones dummies frames
+（运算符 > >= < <= = !=）以及 format path error（运算符 = != ~）。
+"""
+
+import argparse
+import importlib
+import json
+import os
+import sys
+import time
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+catalog = importlib.import_module(os.path.basename(ROOT) + ".import_utils.catalog")
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--db", default="", help="数据库路径，默认为 <资源目录>/.lxcatalog"
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    scan = commands.add_parser("scan", help="扫描资源目录（只探测修改过的文件）")
+    scan.add_argument("root")
+    scan.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+
+    query = commands.add_parser("query", help="查询资源")
+    query.add_argument("root")
+    query.add_argument("filter", nargs="*", help="过滤条件")
+    query.add_argument("--order", default="path", help="排序字段")
+    query.add_argument("--desc", action="store_true", help="降序排列")
+    query.add_argument("--limit", type=int, default=0)
+    query.add_argument("--json", action="store_true", help="输出JSON")
+
+    args = parser.parse_args()
+    root = os.path.abspath(args.root)
+
+    with catalog.AssetCatalog.for_root(root, args.db) as db:
+        if args.command == "scan":
+            start = time.perf_counter()
+            stats = db.scan(root, workers=args.jobs)
+            print(
+                f"新增 {stats['added']}, 更新 {stats['updated']}, "
+                f"未变 {stats['unchanged']}, 删除 {stats['removed']}, "
+                f"耗时 {time.perf_counter() - start:.2f}s"
+            )
+            return 0
+
+        try:
+            order = ("-" if args.desc else "") + args.order
+            rows = db.query(" ".join(args.filter), order=order, limit=args.limit)
+        except ValueError as e:
+            parser.error(str(e))
+        if args.json:
+            json.dump(rows, sys.stdout, ensure_ascii=False, indent=1)
+            print()
+        else:
+            for row in rows:
+                print(f"{row['path']}: {catalog.summarize(row)}")
+            print(f"{len(rows)} 个资源", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""批量检查AMB动作在SKC/BNC角色上的蒙皮结果（不需要Blender）
+
+对每个AMB文件计算全部帧的骨骼世界矩阵和蒙皮后的顶点位置，报告包围盒、
+最大拉伸倍数、NaN帧和“爆炸”帧:
+
+    python tools/check_motion.py --skc p0_300.skc motions/ --jobs 8
+    python tools/check_motion.py --skc p0_300.skc --bnc p0.bnc a.amb b.amb --json
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+import_utils = importlib.import_module(os.path.basename(ROOT) + ".import_utils")
+skinning = importlib.import_module(os.path.basename(ROOT) + ".import_utils.skinning")
+
+_engine = None
+
+
+def _default_bnc(skc_path):
+    """与SKC导入相同的规则: p0_300.skc -> p0.bnc"""
+    name = os.path.splitext(os.path.basename(skc_path))[0].split("_")[0]
+    return os.path.join(os.path.dirname(skc_path), name + ".bnc")
+
+
+def _load_engine(skc_path, bnc_path):
+    global _engine
+    # 读取器的日志输出到stderr，避免混入 --json 的结果
+    with contextlib.redirect_stdout(sys.stderr):
+        bones, _, _ = import_utils.BNCReader(bnc_path).read_bnc()
+        objects = import_utils.SKCReader(skc_path).read_skc()
+    _engine = skinning.SkinningEngine(bones, objects[0] if objects else None)
+
+
+def _check(task):
+    path, frames, stretch_limit = task
+    try:
+        reader = import_utils.AMBReader(path)
+        rotations, root_positions, numbers = reader.read_frames(
+            frames.start, frames.stop, frames.step
+        )
+        if reader.bones + reader.dummies != _engine.node_num:
+            return path, {
+                "ok": False,
+                "error": f"节点数不一致: AMB {reader.bones + reader.dummies}, "
+                f"BNC {_engine.node_num}",
+            }
+        report = skinning.check_motion(
+            _engine, rotations, root_positions, stretch_limit
+        )
+        # 换算为文件中的帧号
+        for key in ("exploding_frames", "nonfinite_frames"):
+            report[key] = numbers[report[key]].tolist()
+        return path, report
+    except Exception as e:
+        return path, {"ok": False, "error": str(e)}
+
+
+def _collect(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(".amb"):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+def _parse_frames(text):
+    parts = [int(p) if p else None for p in text.split(":")] if text else []
+    return slice(*parts) if parts else slice(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("amb", nargs="+", help="AMB文件或目录")
+    parser.add_argument("--skc", required=True)
+    parser.add_argument("--bnc", default="", help="默认按SKC文件名查找")
+    parser.add_argument("--frames", default="", help="帧范围 start:stop:step")
+    parser.add_argument("--stretch-limit", type=float, default=3.0)
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--json", action="store_true", help="输出JSON")
+    args = parser.parse_args()
+
+    bnc_path = args.bnc or _default_bnc(args.skc)
+    frames = _parse_frames(args.frames)
+    tasks = [(path, frames, args.stretch_limit) for path in _collect(args.amb)]
+
+    start = time.perf_counter()
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs,
+            initializer=_load_engine,
+            initargs=(args.skc, bnc_path),
+        ) as pool:
+            results = list(pool.map(_check, tasks, chunksize=4))
+    else:
+        _load_engine(args.skc, bnc_path)
+        results = [_check(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        json.dump(dict(results), sys.stdout, ensure_ascii=False, indent=1)
+        print()
+    else:
+        for path, report in results:
+            if "error" in report:
+                print(f"ERROR {path}: {report['error']}")
+                continue
+            status = "OK   " if report["ok"] else "FAIL "
+            print(
+                f"{status}{path}: {report['frames']} 帧, "
+                f"最大拉伸 {report['max_stretch']:.2f}, "
+                f"爆炸帧 {len(report['exploding_frames'])}, "
+                f"NaN帧 {len(report['nonfinite_frames'])}"
+            )
+    failed = sum(1 for _, report in results if not report["ok"])
+    print(
+        f"{len(results)} 个动作, {failed} 个有问题, 耗时 {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""把一批AMB动作从源BNC骨骼重定向到目标BNC骨骼（不需要Blender）
+
+节点按名称对应（可用 --map 指定 目标名 -> 源名 的JSON文件），输出目录保持
+输入目录的相对结构:
+
+    python tools/retarget_amb.py --source p0.bnc --target p5.bnc motions/ --out p5_motions/
+    python tools/retarget_amb.py --source p0.bnc --target npc.bnc a.amb b.amb --out out/ --map map.json
+"""
+
+import argparse
+import contextlib
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# 插件目录作为包导入（包的 __init__ 只在 register() 中才需要bpy）
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(ROOT))
+import_utils = importlib.import_module(os.path.basename(ROOT) + ".import_utils")
+export_utils = importlib.import_module(os.path.basename(ROOT) + ".export_utils")
+retarget = importlib.import_module(os.path.basename(ROOT) + ".export_utils.retarget")
+
+_retargeter = None
+_target_counts = None
+
+
+def _load(source_bnc, target_bnc, bone_map, scale_root):
+    global _retargeter, _target_counts
+    # 读取器的日志输出到stderr
+    with contextlib.redirect_stdout(sys.stderr):
+        source, _, _ = import_utils.BNCReader(source_bnc).read_bnc()
+        target, bones, dummies = import_utils.BNCReader(target_bnc).read_bnc()
+    _retargeter = retarget.Retargeter(source, target, bone_map, scale_root)
+    _target_counts = (bones, dummies)
+    return _retargeter.unmapped
+
+
+def _process(task):
+    src, dst = task
+    try:
+        start = time.perf_counter()
+        rotations, root_positions = import_utils.AMBReader(src).read_arrays()
+        rotations, root_positions = _retargeter.retarget(rotations, root_positions)
+        os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+        with contextlib.redirect_stdout(sys.stderr):
+            export_utils.AMBWriter(dst).write(
+                rotations, root_positions, *_target_counts
+            )
+        return src, len(rotations), time.perf_counter() - start, None
+    except Exception as e:
+        return src, 0, 0.0, str(e)
+
+
+def _collect(paths, out_dir):
+    """(输入文件, 输出文件)，目录输入保持相对路径"""
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, names in os.walk(path):
+                for name in sorted(names):
+                    if name.lower().endswith(".amb"):
+                        src = os.path.join(folder, name)
+                        yield src, os.path.join(out_dir, os.path.relpath(src, path))
+        else:
+            yield path, os.path.join(out_dir, os.path.basename(path))
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("amb", nargs="+", help="AMB文件或目录")
+    parser.add_argument("--source", required=True, help="动作原本使用的BNC")
+    parser.add_argument("--target", required=True, help="目标角色的BNC")
+    parser.add_argument("--out", required=True, help="输出目录")
+    parser.add_argument("--map", default="", help="节点名对应表JSON: {目标名: 源名}")
+    parser.add_argument(
+        "--no-scale-root", action="store_true", help="不按根节点高度缩放根位移"
+    )
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    bone_map = {}
+    if args.map:
+        with open(args.map, "r", encoding="utf-8") as f:
+            bone_map = json.load(f)
+    tasks = list(_collect(args.amb, args.out))
+    initargs = (args.source, args.target, bone_map, not args.no_scale_root)
+
+    unmapped = _load(*initargs)
+    if unmapped:
+        print(f"目标骨骼中没有对应的节点（保持静止姿态）: {', '.join(unmapped)}")
+
+    start = time.perf_counter()
+    if args.jobs > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(
+            max_workers=args.jobs, initializer=_load, initargs=initargs
+        ) as pool:
+            results = list(pool.map(_process, tasks, chunksize=4))
+    else:
+        results = [_process(task) for task in tasks]
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    frames = 0
+    for src, frame_num, seconds, error in results:
+        if error:
+            failed += 1
+            print(f"ERROR {src}: {error}")
+        else:
+            frames += frame_num
+            print(f"OK    {src}: {frame_num} 帧, {seconds * 1000:.1f}ms")
+    print(
+        f"{len(results) - failed}/{len(results)} 个动作, 共 {frames} 帧, "
+        f"耗时 {elapsed:.2f}s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())